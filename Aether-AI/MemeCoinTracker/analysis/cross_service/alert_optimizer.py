@@ -12,7 +12,8 @@ from datetime import datetime, timedelta
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
-from analysis.sentiment.vader_custom import VaderSentimentAnalyzer
+from shared.resources import get_resource
+from ballistic_service.scripts.alert_store import AlertStore
 from ballistic_service.scripts.anti_scam import AntiScamAnalyzer
 from analysis.onchain.dex_metrics import DexMetricsAnalyzer
 from analysis.onchain.whale_tracker import WhaleTracker
@@ -25,7 +26,7 @@ class AlertOptimizer:
     
     def __init__(self):
         """Initialize the AlertOptimizer"""
-        self.sentiment_analyzer = VaderSentimentAnalyzer()
+        self.sentiment_analyzer = get_resource("sentiment_analyzer")
         self.anti_scam = AntiScamAnalyzer()
         self.dex_metrics = DexMetricsAnalyzer()
         self.whale_tracker = WhaleTracker()
@@ -92,8 +93,7 @@ class AlertOptimizer:
         
         # Check meme virality
         meme_virality = 0
-        from trendforger.scripts.meme_analytics import MemeAnalytics
-        meme_analytics = MemeAnalytics()
+        meme_analytics = get_resource("meme_analytics")
         if meme_text:
             meme_virality = meme_analytics.predict_virality(meme_text)
         
@@ -199,28 +199,21 @@ class AlertOptimizer:
         
         return optimization_results
     
-    def batch_optimize_alerts(self, alerts_dir=None):
-        """Optimize a batch of alerts from the alerts directory"""
-        # Default to the triggered alerts directory
-        if alerts_dir is None:
-            alerts_dir = Path("ballistic_service/data/alerts/triggered")
-        else:
-            alerts_dir = Path(alerts_dir)
-        
-        if not alerts_dir.exists():
-            logger.error(f"Alerts directory not found: {alerts_dir}")
-            return []
+    def batch_optimize_alerts(self, status="triggered", store=None):
+        """Optimize every alert with the given status in the alert store"""
+        # Default to the Ballistic service's alert store
+        own_store = store is None
+        if own_store:
+            store = AlertStore()
         
-        logger.info(f"Batch optimizing alerts in {alerts_dir}")
+        logger.info(f"Batch optimizing {status} alerts in {store.db_path}")
         
         results = []
+        optimizations = {}
         
         try:
-            for alert_file in alerts_dir.glob("*.json"):
+            for alert_data in store.query(status=status):
                 try:
-                    with open(alert_file, 'r') as f:
-                        alert_data = json.load(f)
-                    
                     # Optimize the alert
                     optimization_result = self.optimize_alert(alert_data)
                     
@@ -230,20 +223,50 @@ class AlertOptimizer:
                     # Add to results
                     results.append(optimization_result)
                     
-                    # Update the alert file with optimization results
-                    alert_data["optimization"] = optimization_result
+                    # Store the optimization results with the alert
+                    optimizations[alert_data["id"]] = {"optimization": optimization_result}
                     
-                    with open(alert_file, 'w') as f:
-                        json.dump(alert_data, f, indent=2)
-                    
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.error(f"Error processing alert {alert_file}: {str(e)}")
+                except Exception as e:
+                    logger.error(f"Error processing alert {alert_data.get('id')}: {str(e)}")
+            
+            # One transaction for the whole batch
+            store.update_fields(optimizations)
         
         except Exception as e:
             logger.error(f"Error in batch optimization: {str(e)}")
         
+        finally:
+            if own_store:
+                store.close()
+        
         return results
     
+    def attach(self, alert_engine):
+        """Optimize every alert the AlertEngine creates, before it is stored and published
+        
+        Each new alert carries its "optimization" from the start: in the
+        store, in its "created" event and in every page of /api/alerts.
+        Active alerts stored without one, e.g. created before the optimizer
+        was attached, are optimized once first. Returns the enricher, for
+        AlertEngine.remove_enricher.
+        """
+        optimizations = {}
+        for alert_data in alert_engine.find_alerts(status="triggered"):
+            if "optimization" in alert_data:
+                continue
+            try:
+                optimizations[alert_data["id"]] = {"optimization": self.optimize_alert(alert_data)}
+            except Exception as e:
+                logger.error(f"Error processing alert {alert_data.get('id')}: {str(e)}")
+        if optimizations:
+            alert_engine.update_alert_fields(optimizations)
+        
+        def optimization_fields(alert_data):
+            return {"optimization": self.optimize_alert(alert_data)}
+        
+        alert_engine.add_enricher(optimization_fields)
+        return optimization_fields
+    
     def update_optimization_rule(self, rule_name, rule_value):
         """Update a specific optimization rule"""
         if rule_name not in self.rules:
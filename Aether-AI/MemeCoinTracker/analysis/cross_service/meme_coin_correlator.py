@@ -7,34 +7,48 @@ import os
 import sys
 import json
 import logging
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
-from ballistic_service.scripts.meme_scanner import MemeScanner
-from trendforger.scripts.meme_analytics import MemeAnalytics
-from analysis.sentiment.vader_custom import VaderSentimentAnalyzer
+from config import MEME_STORE_DIR, CONTRACT_REGISTRY_DIR, ALERT_DB_PATH
+from ballistic_service.scripts.meme_store import iter_segment_memes
+from ballistic_service.scripts.contract_registry import ShardedContractRegistry
+from ballistic_service.scripts.match_index import ContractMatchIndex
+from ballistic_service.scripts.alert_store import AlertStore
+from shared.resources import get_resource
+from shared.event_bus import ALERT_TOPIC
 
 # Configure logging
 logger = logging.getLogger("meme_coin_correlator")
 
+# Partial keyword matches scoring below this are not worth a correlation
+MIN_MATCH_SCORE = 0.5
+
 class MemeCoinCorrelator:
     """Links data between meme detection and coin monitoring services"""
     
     def __init__(self):
         """Initialize the MemeCoinCorrelator"""
-        self.meme_scanner = MemeScanner()
-        self.meme_analytics = MemeAnalytics()
-        self.sentiment_analyzer = VaderSentimentAnalyzer()
+        self.meme_analytics = get_resource("meme_analytics")
+        self.sentiment_analyzer = get_resource("sentiment_analyzer")
         
         # Load stored correlation data if available
         self.correlation_data_path = Path("analysis/cross_service/data/correlations.json")
         self.correlation_data_path.parent.mkdir(parents=True, exist_ok=True)
         self.correlation_data = self._load_correlation_data()
+        # Alert events add correlations from the event bus's consumer thread
+        self._lock = threading.RLock()
         
         logger.info("MemeCoinCorrelator initialized")
     
+    @property
+    def meme_scanner(self):
+        """Shared MemeScanner, only loaded if the correlator actually needs it"""
+        return get_resource("meme_scanner")
+    
     def _load_correlation_data(self):
         """Load existing correlation data from JSON file"""
         if self.correlation_data_path.exists():
@@ -56,55 +70,57 @@ class MemeCoinCorrelator:
     
     def load_meme_data(self):
         """Load meme data from Ballistic service"""
+        return list(self.iter_meme_data())
+    
+    def iter_meme_data(self, since=None):
+        """Stream meme data from the Ballistic service meme store, optionally only memes scanned since a datetime"""
+        store_dir = Path(MEME_STORE_DIR)
+        if not store_dir.exists():
+            logger.warning(f"Meme store not found: {store_dir}")
+            return
+        
         try:
-            meme_data_path = Path("ballistic_service/data/raw_memes.json")
-            if not meme_data_path.exists():
-                logger.warning(f"Meme data file not found: {meme_data_path}")
-                return []
-            
-            with open(meme_data_path, 'r') as f:
-                data = json.load(f)
-                return data.get("memes", [])
-        except (json.JSONDecodeError, OSError) as e:
+            yield from iter_segment_memes(store_dir, since=since)
+        except OSError as e:
             logger.error(f"Error loading meme data: {str(e)}")
-            return []
     
-    def load_coin_data(self):
-        """Load coin data from Ballistic service"""
+    def load_coin_data(self, since=None):
+        """Load coin data from the Ballistic service contract registry, optionally only coins created since a datetime"""
+        registry_dir = Path(CONTRACT_REGISTRY_DIR)
+        if not registry_dir.exists():
+            logger.warning(f"Contract registry not found: {registry_dir}")
+            return []
+        
         try:
-            coin_data_path = Path("ballistic_service/data/eth_contracts.json")
-            if not coin_data_path.exists():
-                logger.warning(f"Coin data file not found: {coin_data_path}")
-                return []
-            
-            with open(coin_data_path, 'r') as f:
-                data = json.load(f)
-                return data.get("contracts", [])
-        except (json.JSONDecodeError, OSError) as e:
+            registry = ShardedContractRegistry(registry_dir, readonly=True)
+        except (ValueError, OSError) as e:
             logger.error(f"Error loading coin data: {str(e)}")
             return []
+        
+        try:
+            return list(registry.iter_contracts(since=since))
+        finally:
+            registry.close()
     
     def load_alert_data(self):
-        """Load alert data from Ballistic service"""
-        alerts = []
-        alerts_dir = Path("ballistic_service/data/alerts/triggered")
-        
-        if not alerts_dir.exists():
-            logger.warning(f"Alerts directory not found: {alerts_dir}")
+        """Load triggered alerts from the Ballistic service alert store"""
+        if not Path(ALERT_DB_PATH).exists():
+            logger.warning(f"Alert store not found: {ALERT_DB_PATH}")
             return []
         
         try:
-            for alert_file in alerts_dir.glob("*.json"):
-                try:
-                    with open(alert_file, 'r') as f:
-                        alert_data = json.load(f)
-                        alerts.append(alert_data)
-                except (json.JSONDecodeError, OSError) as e:
-                    logger.error(f"Error loading alert {alert_file}: {str(e)}")
+            store = AlertStore(ALERT_DB_PATH)
         except Exception as e:
-            logger.error(f"Error scanning alerts directory: {str(e)}")
+            logger.error(f"Error opening alert store: {str(e)}")
+            return []
         
-        return alerts
+        try:
+            return store.query(status="triggered")
+        except Exception as e:
+            logger.error(f"Error loading alert data: {str(e)}")
+            return []
+        finally:
+            store.close()
     
     def load_tweet_data(self):
         """Load tweet data from TrendForger service"""
@@ -125,237 +141,231 @@ class MemeCoinCorrelator:
             logger.error(f"Error loading tweet data: {str(e)}")
             return []
     
+    def _match_coins(self, keyword_sets, coins):
+        """Match many keyword sets against coins in one batch
+        
+        Returns one list of matching coins per keyword set. Each coin is
+        credited to the first keyword scoring at least MIN_MATCH_SCORE.
+        Near-miss names and tickers count too, since correlations found
+        here are only potential until confirmed.
+        """
+        index = ContractMatchIndex(
+            {**coin, "name": coin.get("name", ""), "symbol": coin.get("symbol", "")} for coin in coins
+        )
+        return index.find_matches_many(keyword_sets, min_score=MIN_MATCH_SCORE, fuzzy=True)
+    
+    def _correlation_from_alert(self, alert):
+        """A confirmed correlation for an alert"""
+        correlation = {
+            "id": f"alert-{alert['id']}",
+            "source": "alert",
+            "timestamp": datetime.now().isoformat(),
+            "meme": alert.get("meme", {}),
+            "coin": alert.get("coin", {}),
+            "keywords": alert.get("keywords", []),
+            "match_score": alert.get("match", {}).get("score", 0),
+            "sentiment_score": 0,  # Will calculate below
+            "viral_score": 0,      # Will calculate below
+            "confirmation_status": "confirmed"  # Alerts are pre-confirmed
+        }
+        
+        # Calculate sentiment and viral scores
+        if "text" in correlation["meme"]:
+            correlation["sentiment_score"] = self.sentiment_analyzer.analyze(correlation["meme"]["text"])
+            correlation["viral_score"] = self.meme_analytics.predict_virality(correlation["meme"]["text"])
+        
+        return correlation
+    
+    def _add_correlations(self, new_correlations):
+        """Append correlations not already stored and save; returns those added"""
+        with self._lock:
+            existing_correlations = {c["id"] for c in self.correlation_data["correlations"]}
+            new_correlations = [c for c in new_correlations if c["id"] not in existing_correlations]
+            if new_correlations:
+                self.correlation_data["correlations"].extend(new_correlations)
+                self.correlation_data["last_updated"] = datetime.now().isoformat()
+                self._save_correlation_data()
+        return new_correlations
+    
+    def subscribe_alerts(self, event_bus=None):
+        """Record a correlation for each new alert as the AlertEngine publishes it
+        
+        Runs on the event bus's consumer thread; returns the subscription.
+        """
+        event_bus = event_bus or get_resource("alert_bus")
+        
+        def correlate_new_alerts(events):
+            correlations = [self._correlation_from_alert(event["alert"]) for event in events if event["type"] == "created"]
+            added = self._add_correlations(correlations)
+            if added:
+                logger.info(f"Correlated {len(added)} new alerts")
+        
+        return event_bus.consume(ALERT_TOPIC, correlate_new_alerts, name="meme_coin_correlator")
+    
     def correlate_memes_with_coins(self):
         """Find correlations between memes and coins"""
-        memes = self.load_meme_data()
-        coins = self.load_coin_data()
+        # Look at recent memes and coins (last 7 days)
+        recent_cutoff = datetime.now() - timedelta(days=7)
+        
+        # Memes are streamed from the store's recent partitions rather than loaded all at once
+        memes = self.iter_meme_data(since=recent_cutoff)
+        # Only recent coins are read out of the registry
+        recent_coins = self.load_coin_data(since=recent_cutoff)
         alerts = self.load_alert_data()
         
-        logger.info(f"Correlating {len(memes)} memes with {len(coins)} coins")
+        logger.info(f"Correlating memes with {len(recent_coins)} recent coins")
         
         # Extract existing correlations to avoid duplicates
         existing_correlations = {c["id"] for c in self.correlation_data["correlations"]}
         
-        # Look at recent coins (last 7 days)
-        recent_date = (datetime.now() - timedelta(days=7)).isoformat()
-        recent_coins = [c for c in coins if c.get("created_at", "") >= recent_date]
-        
         new_correlations = []
         
         # First, process existing alerts as they're already correlated
         for alert in alerts:
-            correlation_id = f"alert-{alert['id']}"
-            
             # Skip if already processed
-            if correlation_id in existing_correlations:
+            if f"alert-{alert['id']}" in existing_correlations:
                 continue
-            
-            # Create correlation from alert
-            correlation = {
-                "id": correlation_id,
-                "source": "alert",
-                "timestamp": datetime.now().isoformat(),
-                "meme": alert.get("meme", {}),
-                "coin": alert.get("coin", {}),
-                "keywords": alert.get("keywords", []),
-                "match_score": alert.get("match", {}).get("score", 0),
-                "sentiment_score": 0,  # Will calculate below
-                "viral_score": 0,      # Will calculate below
-                "confirmation_status": "confirmed"  # Alerts are pre-confirmed
-            }
-            
-            # Calculate sentiment and viral scores
-            if "text" in correlation["meme"]:
-                correlation["sentiment_score"] = self.sentiment_analyzer.analyze(correlation["meme"]["text"])
-                correlation["viral_score"] = self.meme_analytics.predict_virality(correlation["meme"]["text"])
-            
-            new_correlations.append(correlation)
+            new_correlations.append(self._correlation_from_alert(alert))
         
         # Now look for new correlations beyond existing alerts
-        for meme in memes:
-            if not meme.get("processed", False) or "keywords" not in meme:
-                continue
-            
-            meme_keywords = meme.get("keywords", [])
-            if not meme_keywords:
-                continue
-            
-            for coin in recent_coins:
+        memes = [meme for meme in memes if meme.get("processed", False) and meme.get("keywords")]
+        alerted_addresses = {a.get("coin", {}).get("address", "") for a in alerts}
+        
+        # All memes are matched against the recent coins in one batch
+        match_lists = self._match_coins([meme["keywords"] for meme in memes], recent_coins)
+        
+        for meme, matches in zip(memes, match_lists):
+            for coin in matches:
                 # Skip coins that are already in alerts to avoid duplicates
                 coin_address = coin.get("address", "")
-                if any(a.get("coin", {}).get("address", "") == coin_address for a in alerts):
+                if coin_address in alerted_addresses:
                     continue
                 
-                # Check if any keywords match the coin name or symbol
-                coin_name = coin.get("name", "").lower()
-                coin_symbol = coin.get("symbol", "").lower()
+                # Create a unique ID for this correlation
+                correlation_id = f"manual-{meme['id']}-{coin_address}"
                 
-                for keyword in meme_keywords:
-                    keyword_lower = keyword.lower()
-                    
-                    if keyword_lower in coin_name or keyword_lower in coin_symbol:
-                        # Calculate match score
-                        if keyword_lower == coin_name or keyword_lower == coin_symbol:
-                            match_score = 1.0  # Perfect match
-                        else:
-                            # Calculate partial match score
-                            name_ratio = len(keyword_lower) / len(coin_name) if coin_name else 0
-                            symbol_ratio = len(keyword_lower) / len(coin_symbol) if coin_symbol else 0
-                            match_score = max(name_ratio, symbol_ratio) * 0.8
-                        
-                        # Only consider if match score is significant
-                        if match_score < 0.5:
-                            continue
-                        
-                        # Create a unique ID for this correlation
-                        correlation_id = f"manual-{meme['id']}-{coin_address}"
-                        
-                        # Skip if already processed
-                        if correlation_id in existing_correlations:
-                            continue
-                        
-                        # Create correlation
-                        correlation = {
-                            "id": correlation_id,
-                            "source": "manual",
-                            "timestamp": datetime.now().isoformat(),
-                            "meme": {
-                                "id": meme.get("id", ""),
-                                "platform": meme.get("platform", ""),
-                                "title": meme.get("title", ""),
-                                "text": meme.get("text", ""),
-                                "url": meme.get("url", ""),
-                                "created_at": meme.get("created_utc", "")
-                            },
-                            "coin": {
-                                "name": coin.get("name", ""),
-                                "symbol": coin.get("symbol", ""),
-                                "address": coin_address,
-                                "blockchain": coin.get("blockchain", "ethereum"),
-                                "created_at": coin.get("created_at", "")
-                            },
-                            "keywords": [keyword],
-                            "match_score": match_score,
-                            "sentiment_score": 0,  # Will calculate below
-                            "viral_score": 0,      # Will calculate below
-                            "confirmation_status": "potential"  # Not confirmed yet
-                        }
-                        
-                        # Calculate sentiment score
-                        meme_text = meme.get("title", "") + " " + meme.get("text", "")
-                        correlation["sentiment_score"] = self.sentiment_analyzer.analyze(meme_text)
-                        
-                        # Calculate viral score
-                        correlation["viral_score"] = self.meme_analytics.predict_virality(meme_text)
-                        
-                        new_correlations.append(correlation)
-                        break  # Only create one correlation per meme-coin pair
+                # Skip if already processed
+                if correlation_id in existing_correlations:
+                    continue
+                
+                # Create correlation
+                correlation = {
+                    "id": correlation_id,
+                    "source": "manual",
+                    "timestamp": datetime.now().isoformat(),
+                    "meme": {
+                        "id": meme.get("id", ""),
+                        "platform": meme.get("platform", ""),
+                        "title": meme.get("title", ""),
+                        "text": meme.get("text", ""),
+                        "url": meme.get("url", ""),
+                        "created_at": meme.get("created_utc", "")
+                    },
+                    "coin": {
+                        "name": coin.get("name", ""),
+                        "symbol": coin.get("symbol", ""),
+                        "address": coin_address,
+                        "blockchain": coin.get("blockchain", "ethereum"),
+                        "created_at": coin.get("created_at", "")
+                    },
+                    "keywords": [coin["match_keyword"]],
+                    "match_score": coin["match_score"],
+                    "sentiment_score": 0,  # Will calculate below
+                    "viral_score": 0,      # Will calculate below
+                    "confirmation_status": "potential"  # Not confirmed yet
+                }
+                
+                # Calculate sentiment score
+                meme_text = meme.get("title", "") + " " + meme.get("text", "")
+                correlation["sentiment_score"] = self.sentiment_analyzer.analyze(meme_text)
+                
+                # Calculate viral score
+                correlation["viral_score"] = self.meme_analytics.predict_virality(meme_text)
+                
+                new_correlations.append(correlation)
         
         # Add new correlations to the data
+        new_correlations = self._add_correlations(new_correlations)
         if new_correlations:
             logger.info(f"Found {len(new_correlations)} new correlations")
-            self.correlation_data["correlations"].extend(new_correlations)
-            self.correlation_data["last_updated"] = datetime.now().isoformat()
-            self._save_correlation_data()
         
         return new_correlations
     
     def correlate_tweets_with_coins(self):
         """Find correlations between influencer tweets and coins"""
         tweets = self.load_tweet_data()
-        coins = self.load_coin_data()
+        # Look at recent coins (last 7 days)
+        recent_coins = self.load_coin_data(since=datetime.now() - timedelta(days=7))
         
-        logger.info(f"Correlating {len(tweets)} tweets with {len(coins)} coins")
+        logger.info(f"Correlating {len(tweets)} tweets with {len(recent_coins)} recent coins")
         
         # Extract existing correlations to avoid duplicates
         existing_correlations = {c["id"] for c in self.correlation_data["correlations"]}
         
-        # Look at recent coins (last 7 days)
-        recent_date = (datetime.now() - timedelta(days=7)).isoformat()
-        recent_coins = [c for c in coins if c.get("created_at", "") >= recent_date]
-        
         new_correlations = []
         
+        keyword_sets = []
         for tweet in tweets:
             tweet_keywords = tweet.get("keywords", [])
             if not tweet_keywords:
                 # Extract keywords if not already present
                 tweet_text = tweet.get("content", "")
                 tweet_keywords = self.meme_analytics.extract_keywords(tweet_text)
-            
-            for coin in recent_coins:
-                # Check if any keywords match the coin name or symbol
-                coin_name = coin.get("name", "").lower()
-                coin_symbol = coin.get("symbol", "").lower()
+            keyword_sets.append(tweet_keywords)
+        
+        # All tweets are matched against the recent coins in one batch
+        match_lists = self._match_coins(keyword_sets, recent_coins)
+        
+        for tweet, matches in zip(tweets, match_lists):
+            for coin in matches:
+                # Create a unique ID for this correlation
+                correlation_id = f"tweet-{tweet.get('tweet_id', '')}-{coin.get('address', '')}"
+                
+                # Skip if already processed
+                if correlation_id in existing_correlations:
+                    continue
+                
+                # Create correlation
+                correlation = {
+                    "id": correlation_id,
+                    "source": "tweet",
+                    "timestamp": datetime.now().isoformat(),
+                    "tweet": {
+                        "id": tweet.get("tweet_id", ""),
+                        "author": tweet.get("author", ""),
+                        "content": tweet.get("content", ""),
+                        "created_at": tweet.get("created_at", "")
+                    },
+                    "coin": {
+                        "name": coin.get("name", ""),
+                        "symbol": coin.get("symbol", ""),
+                        "address": coin.get("address", ""),
+                        "blockchain": coin.get("blockchain", "ethereum"),
+                        "created_at": coin.get("created_at", "")
+                    },
+                    "keywords": [coin["match_keyword"]],
+                    "match_score": coin["match_score"],
+                    "sentiment_score": tweet.get("sentiment_score", 0),
+                    "viral_score": tweet.get("viral_score", 0),
+                    "confirmation_status": "potential"  # Not confirmed yet
+                }
+                
+                # Calculate sentiment and viral scores if not already present
+                if correlation["sentiment_score"] == 0:
+                    correlation["sentiment_score"] = self.sentiment_analyzer.analyze(tweet.get("content", ""))
+                
+                if correlation["viral_score"] == 0:
+                    correlation["viral_score"] = self.meme_analytics.predict_virality(
+                        tweet.get("content", ""), 
+                        tweet.get("author", "")
+                    )
                 
-                for keyword in tweet_keywords:
-                    keyword_lower = keyword.lower()
-                    
-                    if keyword_lower in coin_name or keyword_lower in coin_symbol:
-                        # Calculate match score
-                        if keyword_lower == coin_name or keyword_lower == coin_symbol:
-                            match_score = 1.0  # Perfect match
-                        else:
-                            # Calculate partial match score
-                            name_ratio = len(keyword_lower) / len(coin_name) if coin_name else 0
-                            symbol_ratio = len(keyword_lower) / len(coin_symbol) if coin_symbol else 0
-                            match_score = max(name_ratio, symbol_ratio) * 0.8
-                        
-                        # Only consider if match score is significant
-                        if match_score < 0.5:
-                            continue
-                        
-                        # Create a unique ID for this correlation
-                        correlation_id = f"tweet-{tweet.get('tweet_id', '')}-{coin.get('address', '')}"
-                        
-                        # Skip if already processed
-                        if correlation_id in existing_correlations:
-                            continue
-                        
-                        # Create correlation
-                        correlation = {
-                            "id": correlation_id,
-                            "source": "tweet",
-                            "timestamp": datetime.now().isoformat(),
-                            "tweet": {
-                                "id": tweet.get("tweet_id", ""),
-                                "author": tweet.get("author", ""),
-                                "content": tweet.get("content", ""),
-                                "created_at": tweet.get("created_at", "")
-                            },
-                            "coin": {
-                                "name": coin.get("name", ""),
-                                "symbol": coin.get("symbol", ""),
-                                "address": coin.get("address", ""),
-                                "blockchain": coin.get("blockchain", "ethereum"),
-                                "created_at": coin.get("created_at", "")
-                            },
-                            "keywords": [keyword],
-                            "match_score": match_score,
-                            "sentiment_score": tweet.get("sentiment_score", 0),
-                            "viral_score": tweet.get("viral_score", 0),
-                            "confirmation_status": "potential"  # Not confirmed yet
-                        }
-                        
-                        # Calculate sentiment and viral scores if not already present
-                        if correlation["sentiment_score"] == 0:
-                            correlation["sentiment_score"] = self.sentiment_analyzer.analyze(tweet.get("content", ""))
-                        
-                        if correlation["viral_score"] == 0:
-                            correlation["viral_score"] = self.meme_analytics.predict_virality(
-                                tweet.get("content", ""), 
-                                tweet.get("author", "")
-                            )
-                        
-                        new_correlations.append(correlation)
-                        break  # Only create one correlation per tweet-coin pair
+                new_correlations.append(correlation)
         
         # Add new correlations to the data
+        new_correlations = self._add_correlations(new_correlations)
         if new_correlations:
             logger.info(f"Found {len(new_correlations)} new tweet-coin correlations")
-            self.correlation_data["correlations"].extend(new_correlations)
-            self.correlation_data["last_updated"] = datetime.now().isoformat()
-            self._save_correlation_data()
         
         return new_correlations
     
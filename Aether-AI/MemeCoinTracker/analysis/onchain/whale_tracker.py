@@ -7,13 +7,13 @@ import os
 import sys
 import json
 import logging
-import requests
 from pathlib import Path
 from datetime import datetime, timedelta
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 from config import ETHERSCAN_API_KEY, ETHERSCAN_API_ENDPOINT
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("whale_tracker")
@@ -23,6 +23,8 @@ class WhaleTracker:
     
     def __init__(self):
         """Initialize the WhaleTracker"""
+        # Pooled, retrying client shared with the other API callers
+        self.http = get_resource("http_client")
         logger.info("WhaleTracker initialized")
     
     def get_top_holders(self, token_address, blockchain="ethereum", limit=10):
@@ -40,15 +42,11 @@ class WhaleTracker:
     def _get_ethereum_holders(self, token_address, limit=10):
         """Get top token holders on Ethereum"""
         try:
-            # In a real implementation, this would call Etherscan API
-            # or use a service like Ethplorer to get holder information
-            
             if not ETHERSCAN_API_KEY:
                 logger.warning("Etherscan API key not configured")
                 return self._simulate_holders(token_address, "ethereum", limit)
             
             # Make API request to get token holder information
-            # This is a placeholder for the actual API call
             params = {
                 'module': 'token',
                 'action': 'tokenholderlist',
@@ -57,34 +55,44 @@ class WhaleTracker:
                 'offset': limit,
                 'apikey': ETHERSCAN_API_KEY
             }
+            data = self.http.get_json(ETHERSCAN_API_ENDPOINT, params=params)
             
-            # Uncomment for actual implementation
-            # response = requests.get(ETHERSCAN_API_ENDPOINT, params=params)
-            # data = response.json()
-            # 
-            # if data['status'] != '1':
-            #     logger.error(f"Etherscan API error: {data['message']}")
-            #     return None
-            # 
-            # # Process holder data
-            # holder_data = []
-            # for holder in data['result']:
-            #     holder_data.append({
-            #         'address': holder['address'],
-            #         'balance': float(holder['value']) / (10 ** 18),  # Convert from wei to tokens
-            #         'percentage': float(holder['share']) * 100
-            #     })
-            # 
-            # return {
-            #     'token_address': token_address,
-            #     'blockchain': 'ethereum',
-            #     'timestamp': datetime.now().isoformat(),
-            #     'total_holders': data.get('total_holder_count', len(holder_data)),
-            #     'holders': holder_data
-            # }
+            if data['status'] != '1':
+                logger.error(f"Etherscan API error: {data['message']}")
+                return None
             
-            # For this demo, simulate holder data
-            return self._simulate_holders(token_address, "ethereum", limit)
+            # Balances are in the token's base units: tokeninfo gives its decimals ("divisor") and total supply
+            token = self.http.get_json(ETHERSCAN_API_ENDPOINT, params={
+                'module': 'token',
+                'action': 'tokeninfo',
+                'contractaddress': token_address,
+                'apikey': ETHERSCAN_API_KEY
+            })
+            if token['status'] != '1' or not token['result']:
+                logger.error(f"Etherscan API error: {token['message']}")
+                return None
+            
+            token_info = token['result'][0]
+            scale = 10 ** int(token_info['divisor'])
+            total_supply = float(token_info['totalSupply'])
+            
+            # Process holder data
+            holder_data = []
+            for holder in data['result']:
+                quantity = float(holder['TokenHolderQuantity'])
+                holder_data.append({
+                    'address': holder['TokenHolderAddress'],
+                    'balance': quantity / scale,
+                    'percentage': quantity / total_supply * 100 if total_supply else 0
+                })
+            
+            return {
+                'token_address': token_address,
+                'blockchain': 'ethereum',
+                'timestamp': datetime.now().isoformat(),
+                'total_holders': data.get('total_holder_count', len(holder_data)),
+                'holders': holder_data
+            }
             
         except Exception as e:
             logger.error(f"Error getting Ethereum holders for {token_address}: {str(e)}")
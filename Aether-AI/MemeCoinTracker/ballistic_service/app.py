@@ -15,11 +15,14 @@ from pathlib import Path
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
 
-from ballistic_service.scripts.meme_scanner import MemeScanner
 from ballistic_service.scripts.contract_monitor import ContractMonitor
 from ballistic_service.scripts.alert_engine import AlertEngine
 from ballistic_service.scripts.anti_scam import AntiScamAnalyzer
-from config import ALERT_CHECK_INTERVAL, HOST, BACKEND_PORT
+from ballistic_service.scripts.poll_scheduler import PollScheduler
+from ballistic_service.scripts.source_cursors import source_key
+from analysis.cross_service.alert_optimizer import AlertOptimizer
+from shared.resources import get_resource
+from config import HOST, BACKEND_PORT, ALERT_WRITE_BEHIND
 
 # Configure logging
 logging.basicConfig(
@@ -37,10 +40,16 @@ class BallisticService:
         self._ensure_directories()
         
         # Initialize components
-        self.meme_scanner = MemeScanner()
+        self.meme_scanner = get_resource("meme_scanner")
         self.contract_monitor = ContractMonitor()
-        self.alert_engine = AlertEngine()
+        self.alert_engine = AlertEngine(write_behind=ALERT_WRITE_BEHIND)
         self.anti_scam = AntiScamAnalyzer()
+        # Scores each alert once, when it is created, and stores the result with it
+        self.alert_optimizer = AlertOptimizer()
+        self.optimizer_enricher = None
+        
+        # Decides which sources to poll on each pass, within API quotas
+        self.poll_scheduler = PollScheduler(self.meme_scanner.active_sources())
         
         self.running = False
         self.service_thread = None
@@ -49,8 +58,7 @@ class BallisticService:
     
     def _ensure_directories(self):
         """Ensure required data directories exist"""
-        Path("ballistic_service/data/alerts/triggered").mkdir(parents=True, exist_ok=True)
-        Path("ballistic_service/data/alerts/pending").mkdir(parents=True, exist_ok=True)
+        Path("ballistic_service/data/alerts").mkdir(parents=True, exist_ok=True)
     
     def start(self):
         """Start the Ballistic service"""
@@ -59,6 +67,9 @@ class BallisticService:
             return
         
         self.running = True
+        self.contract_monitor.start_refresher()
+        self.contract_monitor.start_solana_follower()
+        self.optimizer_enricher = self.alert_optimizer.attach(self.alert_engine)
         self.service_thread = threading.Thread(target=self._service_loop)
         self.service_thread.daemon = True
         self.service_thread.start()
@@ -74,6 +85,13 @@ class BallisticService:
         self.running = False
         if self.service_thread:
             self.service_thread.join(timeout=5.0)
+        self.contract_monitor.stop_refresher()
+        self.contract_monitor.stop_solana_follower()
+        self.alert_engine.remove_enricher(self.optimizer_enricher)
+        # Commit alerts still queued for the next group commit, then stop the writer and close the store
+        if not self.alert_engine.flush():
+            logger.error("Queued alerts could not be committed on shutdown")
+        self.alert_engine.close()
         
         logger.info("Ballistic Service stopped")
     
@@ -81,40 +99,82 @@ class BallisticService:
         """Main service loop for meme-to-coin detection"""
         while self.running:
             try:
-                # 1. Scan for trending memes
-                memes = self.meme_scanner.scan_trending_memes()
-                logger.debug(f"Found {len(memes)} trending memes")
-                
-                # 2. Extract keywords from memes
-                for meme in memes:
-                    keywords = self.meme_scanner.extract_keywords(meme)
-                    logger.debug(f"Extracted keywords: {keywords}")
-                    
-                    # 3. Monitor contracts for matches
-                    matches = self.contract_monitor.find_matches(keywords)
-                    if matches:
-                        logger.info(f"Found {len(matches)} potential meme coin matches")
-                        
-                        # 4. Generate alerts for matches
-                        for match in matches:
-                            # Perform safety analysis
-                            safety_score = self.anti_scam.analyze(match['contract_address'])
-                            match['safety_score'] = safety_score
-                            
-                            # Create alert
-                            self.alert_engine.create_alert(
-                                meme_data=meme,
-                                coin_data=match,
-                                keywords=keywords
-                            )
+                self.run_once()
                 
-                # Sleep for the configured interval
-                time.sleep(ALERT_CHECK_INTERVAL)
+                # Sleep until the next source is due
+                time.sleep(max(1.0, self.poll_scheduler.next_wakeup()))
                 
             except Exception as e:
                 logger.error(f"Error in service loop: {str(e)}")
                 time.sleep(10)  # Sleep before retrying
     
+    def run_once(self, poll_all=False):
+        """Run one scan-match-alert pass and return (memes scanned, alerts created)
+        
+        Only sources the poll scheduler reports as due are scanned, unless
+        poll_all is set.
+        """
+        alerts_created = 0
+        
+        # 1. Scan the due sources for new memes
+        memes = self._scan_due_sources(poll_all)
+        logger.debug(f"Found {len(memes)} trending memes")
+        
+        # 2. Extract keywords from memes in a single batched NLP pass
+        keyword_lists = self.meme_scanner.extract_keywords_batch(memes)
+        
+        # 3. Match every meme's keywords against the contracts in one batch
+        match_lists = self.contract_monitor.find_matches_many(keyword_lists)
+        for meme, keywords, matches in zip(memes, keyword_lists, match_lists):
+            logger.debug(f"Extracted keywords: {keywords}")
+            
+            if matches:
+                logger.info(f"Found {len(matches)} potential meme coin matches")
+                
+                # 4. Generate alerts for matches
+                for match in matches:
+                    # A pair alerted recently only counts as another hit; skip the safety APIs
+                    if self.alert_engine.record_duplicate(meme, match) is not None:
+                        continue
+                    
+                    # Perform safety analysis
+                    safety_score = self.anti_scam.analyze(match['address'], match.get('blockchain', 'ethereum'))
+                    match['safety_score'] = safety_score
+                    
+                    # Create alert
+                    alert = self.alert_engine.create_alert(
+                        meme_data=meme,
+                        coin_data=match,
+                        keywords=keywords
+                    )
+                    if alert:
+                        alerts_created += 1
+        
+        return len(memes), alerts_created
+    
+    def _scan_due_sources(self, poll_all=False):
+        """Scan due sources and feed the results back into the poll scheduler"""
+        if poll_all:
+            sources = self.meme_scanner.active_sources()
+        else:
+            sources = self.poll_scheduler.due_sources()
+        if not sources:
+            return []
+        
+        memes, polls = self.meme_scanner.scan_sources(sources)
+        for source in sources:
+            poll = polls.get(source_key(source))
+            if poll:
+                self.poll_scheduler.record_poll(source, poll["new"], poll["requests"])
+            else:
+                # Errored or timed out: back off instead of polling it again on the next pass
+                self.poll_scheduler.record_failure(source)
+        
+        self.poll_scheduler.observe_rate_limits("reddit", self.meme_scanner.reddit)
+        self.poll_scheduler.observe_rate_limits("twitter", self.meme_scanner.twitter)
+        
+        return memes
+    
     def analyze_meme_coin(self, coin_address, blockchain="ethereum"):
         """Analyze a specific meme coin for safety"""
         return self.anti_scam.analyze(coin_address, blockchain)
@@ -122,6 +182,18 @@ class BallisticService:
     def get_active_alerts(self):
         """Get currently active alerts"""
         return self.alert_engine.get_active_alerts()
+    
+    def get_contract_snapshot(self):
+        """Get the size and age of the contract snapshot used for matching"""
+        return self.contract_monitor.stats()
+    
+    def get_poll_schedule(self):
+        """Get the current per-source poll intervals and platform quotas"""
+        return self.poll_scheduler.stats()
+    
+    def get_http_stats(self):
+        """Get outbound request counts and latency histograms per API host"""
+        return self.contract_monitor.http.stats()
 
 
 # Run the service if executed directly
@@ -140,6 +212,18 @@ if __name__ == "__main__":
             alerts = service.get_active_alerts()
             return jsonify({'alerts': alerts})
         
+        @app.route('/api/poll/schedule', methods=['GET'])
+        def poll_schedule():
+            return jsonify(service.get_poll_schedule())
+        
+        @app.route('/api/http/stats', methods=['GET'])
+        def http_stats():
+            return jsonify(service.get_http_stats())
+        
+        @app.route('/api/contracts/snapshot', methods=['GET'])
+        def contract_snapshot():
+            return jsonify(service.get_contract_snapshot())
+        
         @app.route('/api/analyze/<blockchain>/<address>', methods=['GET'])
         def analyze_coin(blockchain, address):
             result = service.analyze_meme_coin(address, blockchain)
@@ -1,71 +1,472 @@
 #!/usr/bin/env python3
 """
 Alert Engine - Generates and manages alerts for potential meme coins
+
+Alerts live in the AlertStore. Active alerts (status "triggered") are also
+kept in an in-memory index, updated directly when this engine creates or
+changes an alert. Changes committed by other processes are picked up by
+checking PRAGMA data_version, one cheap query, and only when it moved are
+the rows changed since the last check read back. The store returns the
+change seq of every write, so the engine's own writes are skipped there
+rather than published a second time.
+
+Each meme/coin pair has an idempotency key. Within ALERT_SUPPRESSION_WINDOW
+of its alert being created, the same pair only bumps that alert's hit
+counter instead of creating another one. Keys seen recently are checked in
+memory first; the store checks again inside the insert's transaction (see
+create_op), which catches a pair the other process alerted since the last
+sync. In write-behind mode that is only known at commit: the queued alert
+is then dropped with a "removed" event and the earlier alert updated.
+
+With write_behind, creating an alert, bumping its hits or changing its
+status updates the index at once and queues the write for the next group
+commit (see AlertWriteBehind). Until a queued write is committed the
+engine's own copy of that alert wins over what the store returns.
+
+Every change to the active set, whoever made it, is published on the
+process's alert event bus as a "created", "updated" or "removed" event.
+Enrichers (see add_enricher) add fields to a new alert before it is
+stored, so its "created" event already carries them.
+
+page_alerts pages through alerts newest first with opaque cursors. Active
+alerts are paged from sorted (created_at, id) key lists, one for all chains
+and one per chain, kept in order as alerts come and go; any other status is
+a keyset query on the store's indexes.
 """
 
-import os
 import sys
 import json
+import time
+import base64
+import bisect
 import logging
+import hashlib
+import threading
 import uuid
 from pathlib import Path
+from collections import OrderedDict
 from datetime import datetime
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
-from config import ALERT_THRESHOLD_SCORE
+from config import ALERT_THRESHOLD_SCORE, ALERT_DB_PATH, ALERT_DB_SYNCHRONOUS, ALERT_SUPPRESSION_WINDOW
+from ballistic_service.scripts.alert_store import (
+    AlertStore, AlertWriteBehind, migrate_alert_dirs, apply_op, create_op, status_op, hit_op
+)
+from shared.event_bus import ALERT_TOPIC
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("alert_engine")
 
+
+def alert_key(meme_id, coin_address, chain):
+    """Deterministic idempotency key for a meme/coin pair"""
+    return hashlib.blake2b(f"{meme_id}\0{coin_address}\0{chain}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def encode_cursor(alert_data):
+    """Opaque cursor for the position just after an alert, newest first"""
+    raw = json.dumps([alert_data.get("created_at", ""), alert_data["id"]]).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor):
+    """The (created_at, id) position in a cursor; raises ValueError if it is malformed"""
+    try:
+        created_at, alert_id = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+    if not isinstance(created_at, str) or not isinstance(alert_id, str):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return created_at, alert_id
+
+
+def _sort_key(alert_data):
+    return alert_data.get("created_at", ""), alert_data["id"]
+
+
+def _created_timestamp(alert_data):
+    try:
+        return datetime.fromisoformat(alert_data.get("created_at", "")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+class ExpiringIndex:
+    """Key -> value map whose entries expire ttl seconds after they were added
+    
+    Entries are kept in the order they were added, so expiring old ones
+    only ever pops from the front.
+    """
+    
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = OrderedDict()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def add(self, key, value, added_at):
+        now = time.time()
+        expires_at = added_at + self.ttl
+        if expires_at <= now:
+            return
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            # A live key keeps the expiry it was first added with
+            return
+        self._entries.pop(key, None)
+        self._entries[key] = (expires_at, value)
+    
+    def replace(self, key, value):
+        """Point a live key at another value, keeping its expiry"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries[key] = (entry[0], value)
+    
+    def get(self, key, now=None):
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= (time.time() if now is None else now):
+            return None
+        return entry[1]
+    
+    def expire(self, now=None):
+        """Drop entries whose time is up"""
+        now = time.time() if now is None else now
+        while self._entries:
+            key, (expires_at, _) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            del self._entries[key]
+
+
 class AlertEngine:
     """Engine for generating and managing meme coin alerts"""
     
-    def __init__(self):
+    def __init__(self, db_path=ALERT_DB_PATH, suppression_window=ALERT_SUPPRESSION_WINDOW, write_behind=False,
+                 synchronous=ALERT_DB_SYNCHRONOUS, event_bus=None):
         """Initialize the AlertEngine"""
-        # Ensure alerts directories exist
         self.alerts_dir = Path("ballistic_service/data/alerts")
-        self.triggered_dir = self.alerts_dir / "triggered"
-        self.pending_dir = self.alerts_dir / "pending"
+        self.store = AlertStore(db_path, synchronous=synchronous)
         
-        self.triggered_dir.mkdir(parents=True, exist_ok=True)
-        self.pending_dir.mkdir(parents=True, exist_ok=True)
+        # Import alerts from the old triggered/ and pending/ directories on first run
+        try:
+            migrate_alert_dirs(self.store, self.alerts_dir)
+        except Exception as e:
+            logger.error(f"Error migrating alert directories: {str(e)}")
+        
+        # Active alerts by id, plus how far the store's change log has been read
+        self._index = {}
+        self._seq = 0
+        # Change seqs past _seq that this engine wrote itself, so _sync does not replay them
+        self._own_seqs = set()
+        self._data_version = None
+        self._active_list = None
+        # Chain (None for all) -> sort keys of its active alerts, ascending
+        self._keys = {None: []}
+        self._lock = threading.RLock()
+        # Bumped whenever an active alert is added, changed or removed
+        self.generation = 0
+        self.events = event_bus or get_resource("alert_bus")
+        
+        # Idempotency key -> alert id, for alerts created within the suppression window
+        self._recent_keys = ExpiringIndex(suppression_window)
+        self.suppressed = 0
         
-        # Cache for active alerts
-        self.active_alerts = self._load_active_alerts()
+        # Callables run on each new alert before it is stored; each returns fields to merge into it
+        self._enrichers = []
+        
+        # Queued writes, and alert id -> (write sequence, alert) for alerts changed by writes not yet committed
+        self.writer = AlertWriteBehind(self.store) if write_behind else None
+        self._unflushed = OrderedDict()
+        # Ids of unflushed alerts another process changed meanwhile; re-read once committed
+        self._stale = set()
+        
+        self._load()
+        logger.info(f"Loaded {len(self._index)} active alerts")
         
         logger.info("AlertEngine initialized")
     
-    def _load_active_alerts(self):
-        """Load all active alerts from the triggered directory"""
-        active_alerts = []
+    @property
+    def active_alerts(self):
+        """Active alerts as last indexed, newest first, without checking the store"""
+        with self._lock:
+            if self._active_list is None:
+                self._active_list = [self._index[alert_id] for _, alert_id in reversed(self._keys[None])]
+            return self._active_list
+    
+    def _changed(self):
+        self.generation += 1
+        self._active_list = None
+    
+    def _key_lists(self, alert_data):
+        chain = alert_data.get("coin", {}).get("blockchain", "")
+        return self._keys[None], self._keys.setdefault(chain, [])
+    
+    def _index_add(self, alert_data):
+        self._index[alert_data["id"]] = alert_data
+        key = _sort_key(alert_data)
+        for keys in self._key_lists(alert_data):
+            bisect.insort(keys, key)
+    
+    def _index_remove(self, alert_data):
+        del self._index[alert_data["id"]]
+        key = _sort_key(alert_data)
+        for keys in self._key_lists(alert_data):
+            del keys[bisect.bisect_left(keys, key)]
+    
+    def _remember_key(self, alert_data):
+        if alert_data.get("dedup_key"):
+            self._recent_keys.add(alert_data["dedup_key"], alert_data["id"], _created_timestamp(alert_data))
+    
+    def _apply(self, alert_data):
+        """Reflect one stored alert in the active index and publish the change"""
+        self._remember_key(alert_data)
+        previous = self._index.get(alert_data["id"])
+        if previous is not None and previous == alert_data:
+            return
+        self._publish_change(previous, alert_data)
+    
+    def _publish_change(self, previous, alert_data):
+        """Replace previous with alert_data in the active index and publish what that did"""
+        if previous is not None:
+            self._index_remove(previous)
+        if alert_data.get("status") == "triggered":
+            event = "updated" if previous is not None else "created"
+            self._index_add(alert_data)
+        elif previous is None:
+            return
+        else:
+            event = "removed"
+        self._changed()
+        self.events.publish(ALERT_TOPIC, {"type": event, "alert": alert_data, "generation": self.generation})
+    
+    def _note_written(self, seqs):
+        """Record change seqs this engine committed; the log is read past them once it catches up"""
+        for seq in seqs:
+            if seq == self._seq + 1:
+                self._seq = seq
+            elif seq > self._seq:
+                self._own_seqs.add(seq)
+        while self._seq + 1 in self._own_seqs:
+            self._seq += 1
+            self._own_seqs.discard(self._seq)
+    
+    def _prune_unflushed(self):
+        """Forget local copies of alerts whose queued writes are committed, indexing the stored results"""
+        committed, written = self.writer.take_commits()
+        self._note_written(seq for _, _, seq in written)
+        while self._unflushed:
+            alert_id, (seq, _) = next(iter(self._unflushed.items()))
+            if seq > committed:
+                break
+            del self._unflushed[alert_id]
+        
+        # Hits and status changes re-read the alert when committed, so what
+        # was stored can hold changes other processes made in the meantime
+        for op, alert_data, _ in written:
+            if op[0] == "create" and alert_data["id"] != op[1][0]["id"]:
+                self._drop_duplicate(op[1][0], alert_data)
+            if alert_data["id"] not in self._unflushed and alert_data["id"] not in self._stale:
+                self._apply(alert_data)
+        for alert_id in [alert_id for alert_id in self._stale if alert_id not in self._unflushed]:
+            self._stale.discard(alert_id)
+            alert_data = self.store.get(alert_id)
+            if alert_data is not None:
+                self._apply(alert_data)
+    
+    def _drop_duplicate(self, queued, existing):
+        """Retract a queued alert the store found a duplicate of when committing it"""
+        self._unflushed.pop(queued["id"], None)
+        self._recent_keys.replace(queued["dedup_key"], existing["id"])
+        self.suppressed += 1
+        if queued["id"] in self._index:
+            self._publish_change(self._index[queued["id"]], {**queued, "status": "duplicate"})
+        logger.debug(f"Dropped alert {queued['id']}, a duplicate of {existing['id']}")
+    
+    def _write(self, op, alert_data):
+        """Store one change to an alert, or queue it in write-behind mode, and index the result
+        
+        In write-behind mode alert_data is the alert as it will be once the
+        write is committed. Otherwise the stored alert is re-read inside the
+        write and returned, None if it no longer exists.
+        """
+        with self._lock:
+            if self.writer is None:
+                alert_data, seq = self.store.apply_one(op)
+                if alert_data is None:
+                    return None
+                self._note_written([seq])
+            else:
+                seq = self.writer.submit(op)
+                self._prune_unflushed()
+                self._unflushed.pop(alert_data["id"], None)
+                self._unflushed[alert_data["id"]] = (seq, alert_data)
+            self._apply(alert_data)
+            return alert_data
+    
+    def _current(self, alert_id):
+        """Latest copy of an alert, including queued changes"""
+        with self._lock:
+            alert = self._index.get(alert_id)
+            if alert is None and self.writer is not None:
+                self._prune_unflushed()
+                alert = self._unflushed.get(alert_id, (None, None))[1]
+        if alert is not None:
+            return alert
+        return self.store.get(alert_id)
+    
+    def _load(self):
+        """Fill the index with every triggered alert"""
+        with self._lock:
+            try:
+                # Read the version and sequence first: anything committed after is replayed by _sync
+                self._data_version = self.store.data_version()
+                self._seq = self.store.last_seq()
+                alerts = self.store.query(status="triggered")
+                # Any status counts for suppression: a dismissed alert is not raised again
+                recent = self.store.query(since=datetime.fromtimestamp(time.time() - self._recent_keys.ttl))
+            except Exception as e:
+                logger.error(f"Error loading alerts: {str(e)}")
+                return
+            self._index = {alert["id"]: alert for alert in alerts}
+            self._keys = {None: []}
+            for alert in alerts:
+                for keys in self._key_lists(alert):
+                    keys.append(_sort_key(alert))
+            for keys in self._keys.values():
+                keys.sort()
+            for alert_data in reversed(recent):
+                self._remember_key(alert_data)
+            self._changed()
+    
+    def _sync(self):
+        """Bring the index up to date with changes other processes committed
+        
+        Costs one PRAGMA when nothing changed. Returns True if any active
+        alert was added, changed or removed.
+        """
+        with self._lock:
+            try:
+                data_version = self.store.data_version()
+                if data_version == self._data_version:
+                    return False
+                changes, latest = self.store.changes_since(self._seq)
+            except Exception as e:
+                logger.error(f"Error reading alert changes: {str(e)}")
+                return False
+            self._data_version = data_version
+            
+            generation = self.generation
+            if self.writer is not None:
+                self._prune_unflushed()
+            for seq, alert_data in changes:
+                # Writes of this engine (up to _seq, which only moves past
+                # its own writes, or in _own_seqs) are already indexed, and
+                # a change still queued here is newer than what the store has
+                if seq <= self._seq or seq in self._own_seqs:
+                    continue
+                if alert_data["id"] in self._unflushed:
+                    self._stale.add(alert_data["id"])
+                else:
+                    self._apply(alert_data)
+            self._seq = max(self._seq, latest)
+            self._own_seqs = {seq for seq in self._own_seqs if seq > self._seq}
+            return self.generation != generation
+    
+    def record_duplicate(self, meme_data, coin_data):
+        """Count a repeat of an already alerted meme/coin pair
         
-        for alert_file in self.triggered_dir.glob("*.json"):
+        If the pair was alerted within the suppression window, that alert's
+        hit counter is bumped and the updated alert returned; otherwise
+        returns None. Matches below the alert threshold are never counted.
+        """
+        if coin_data.get('match_score', 0) < ALERT_THRESHOLD_SCORE:
+            return None
+        
+        key = alert_key(meme_data.get("id", ""), coin_data.get("address", ""), coin_data.get("blockchain", ""))
+        with self._lock:
+            # Pick up alerts the other process created since the last check
+            self._sync()
+            self._recent_keys.expire()
+            alert_id = self._recent_keys.get(key)
+            if alert_id is None:
+                return None
+            
             try:
-                with open(alert_file, 'r') as f:
-                    alert_data = json.load(f)
-                    active_alerts.append(alert_data)
-            except (json.JSONDecodeError, OSError) as e:
-                logger.error(f"Error loading alert {alert_file}: {str(e)}")
+                op = hit_op(alert_id)
+                alert_data = None
+                if self.writer is None:
+                    alert_data = self._write(op, None)
+                else:
+                    current = self._current(alert_id)
+                    if current is not None:
+                        alert_data = self._write(op, apply_op(dict(current), op))
+            except Exception as e:
+                logger.error(f"Error recording hit on alert {alert_id}: {str(e)}")
+                return None
+            if alert_data is None:
+                return None
+            self.suppressed += 1
         
-        logger.info(f"Loaded {len(active_alerts)} active alerts")
-        return active_alerts
+        logger.debug(f"Suppressed duplicate alert for {coin_data.get('name', '')} (alert {alert_id}, {alert_data['hits']} hits)")
+        return alert_data
+    
+    def add_enricher(self, enricher):
+        """Run enricher(alert) on every new alert before it is stored and published
+        
+        The returned dict is merged into the alert, so the fields are part of
+        the stored alert and of its "created" event. Enrichers run outside
+        the engine's lock and a failing one is logged and skipped.
+        """
+        with self._lock:
+            if enricher not in self._enrichers:
+                self._enrichers.append(enricher)
+    
+    def remove_enricher(self, enricher):
+        """Stop running an enricher added with add_enricher"""
+        with self._lock:
+            if enricher in self._enrichers:
+                self._enrichers.remove(enricher)
     
     def create_alert(self, meme_data, coin_data, keywords):
-        """Create a new alert for a potential meme coin match"""
+        """Create a new alert for a potential meme coin match
+        
+        Returns the new alert, or None if the match is below threshold or
+        the same meme/coin pair was already alerted within the suppression
+        window (in which case that alert's hit counter is bumped).
+        """
         # Skip if match score is below threshold
         if coin_data.get('match_score', 0) < ALERT_THRESHOLD_SCORE:
             logger.debug(f"Match score {coin_data.get('match_score', 0)} below threshold, skipping alert")
             return None
         
+        # A repeat only bumps the earlier alert, so it is never built or enriched
+        if self.record_duplicate(meme_data, coin_data) is not None:
+            return None
+        alert_data = self._new_alert(meme_data, coin_data, keywords)
+        self._enrich(alert_data)
+        
+        with self._lock:
+            # The pair may have been alerted while the enrichers ran
+            if self.record_duplicate(meme_data, coin_data) is not None:
+                return None
+            return self._create_alert(alert_data)
+    
+    def _new_alert(self, meme_data, coin_data, keywords):
         # Generate alert ID
         alert_id = str(uuid.uuid4())
+        now = datetime.now().isoformat()
         
         # Create alert data
-        alert_data = {
+        return {
             "id": alert_id,
-            "created_at": datetime.now().isoformat(),
+            "created_at": now,
             "status": "triggered",
+            "dedup_key": alert_key(meme_data.get("id", ""), coin_data.get("address", ""), coin_data.get("blockchain", "")),
+            "hits": 1,
+            "last_seen_at": now,
             "meme": {
                 "id": meme_data.get("id", ""),
                 "platform": meme_data.get("platform", ""),
@@ -92,29 +493,92 @@ class AlertEngine:
                 "risk_factors": coin_data.get("safety_score", {}).get("risk_factors", [])
             }
         }
-        
-        # Save the alert to triggered directory
-        alert_path = self.triggered_dir / f"{alert_id}.json"
+    
+    def _enrich(self, alert_data):
+        with self._lock:
+            enrichers = list(self._enrichers)
+        for enricher in enrichers:
+            try:
+                alert_data.update(enricher(alert_data))
+            except Exception as e:
+                logger.error(f"Error enriching alert {alert_data['id']}: {str(e)}")
+    
+    def _create_alert(self, alert_data):
+        alert_id = alert_data["id"]
+        coin_name = alert_data["coin"]["name"]
         try:
-            with open(alert_path, 'w') as f:
-                json.dump(alert_data, f, indent=2)
-            
-            # Add to active alerts cache
-            self.active_alerts.append(alert_data)
+            # The store re-checks the suppression window inside the insert
+            since = datetime.fromtimestamp(time.time() - self._recent_keys.ttl)
+            stored = self._write(create_op(alert_data, since), alert_data)
+            if stored["id"] != alert_id:
+                self.suppressed += 1
+                logger.debug(f"Suppressed duplicate alert for {coin_name} (alert {stored['id']}, "
+                             f"{stored['hits']} hits, created by another process)")
+                return None
             
-            logger.info(f"Created new alert {alert_id} for {coin_data['name']}")
+            logger.info(f"Created new alert {alert_id} for {coin_name}")
             return alert_data
             
-        except OSError as e:
+        except Exception as e:
             logger.error(f"Error saving alert {alert_id}: {str(e)}")
             return None
     
     def get_active_alerts(self):
-        """Get all currently active alerts"""
-        # Refresh the cache first
-        self.active_alerts = self._load_active_alerts()
+        """Get all currently active alerts, picking up changes made by other processes"""
+        self._sync()
         return self.active_alerts
     
+    def get_alert(self, alert_id):
+        """Get any alert by id, whatever its status"""
+        try:
+            return self._current(alert_id)
+        except Exception as e:
+            logger.error(f"Error loading alert {alert_id}: {str(e)}")
+            return None
+    
+    def find_alerts(self, status=None, coin_address=None, meme_id=None, since=None, until=None, limit=None):
+        """Query stored alerts by status, coin, meme and creation time, newest first"""
+        # Queries run against the store, so commit queued writes first
+        self.flush()
+        try:
+            return self.store.query(status=status, coin_address=coin_address, meme_id=meme_id,
+                                    since=since, until=until, limit=limit)
+        except Exception as e:
+            logger.error(f"Error querying alerts: {str(e)}")
+            return []
+    
+    def page_alerts(self, status="triggered", chain=None, after=None, limit=10):
+        """One page of alerts, newest first, optionally of one status and chain
+        
+        after is the cursor returned with the previous page. Returns
+        (alerts, cursor for the next page or None on the last, total
+        matching alerts). Raises ValueError for a malformed cursor.
+        """
+        position = decode_cursor(after) if after else None
+        
+        if status == "triggered":
+            self._sync()
+            with self._lock:
+                keys = self._keys.get(chain, [])
+                # Keys are ascending: the page is the limit keys just below the cursor, newest first
+                end = len(keys) if position is None else bisect.bisect_left(keys, position)
+                page = [self._index[alert_id] for _, alert_id in reversed(keys[max(0, end - limit):end])]
+                more = end > limit
+                total = len(keys)
+        else:
+            # Pages run against the store, so commit queued writes first
+            self.flush()
+            try:
+                page = self.store.query(status=status, chain=chain, before=position, limit=limit + 1)
+                total = self.store.count(status=status, chain=chain)
+            except Exception as e:
+                logger.error(f"Error paging alerts: {str(e)}")
+                return [], None, 0
+            more = len(page) > limit
+            page = page[:limit]
+        
+        return page, (encode_cursor(page[-1]) if more and page else None), total
+    
     def update_alert_status(self, alert_id, new_status):
         """Update the status of an alert"""
         # Valid statuses: "triggered", "pending", "dismissed", "resolved"
@@ -123,53 +587,17 @@ class AlertEngine:
             logger.error(f"Invalid alert status: {new_status}")
             return False
         
-        # Look for the alert in triggered directory
-        alert_path = self.triggered_dir / f"{alert_id}.json"
-        if not alert_path.exists():
-            # Try the pending directory
-            alert_path = self.pending_dir / f"{alert_id}.json"
-            if not alert_path.exists():
-                logger.error(f"Alert {alert_id} not found")
-                return False
-        
         try:
-            # Load the alert
-            with open(alert_path, 'r') as f:
-                alert_data = json.load(f)
-            
-            # Update the status
-            alert_data["status"] = new_status
-            alert_data["updated_at"] = datetime.now().isoformat()
-            
-            # Determine the new directory based on status
-            if new_status == "triggered":
-                new_dir = self.triggered_dir
-            elif new_status == "pending":
-                new_dir = self.pending_dir
-            else:
-                # For dismissed and resolved, we'll keep in pending
-                new_dir = self.pending_dir
-            
-            # Save to the new location
-            new_path = new_dir / f"{alert_id}.json"
-            with open(new_path, 'w') as f:
-                json.dump(alert_data, f, indent=2)
-            
-            # Remove from the old location if different
-            if alert_path != new_path and alert_path.exists():
-                alert_path.unlink()
-            
-            # Update the active alerts cache if needed
-            if new_status in {"dismissed", "resolved"}:
-                self.active_alerts = [a for a in self.active_alerts if a["id"] != alert_id]
-            elif new_status in {"triggered", "pending"}:
-                for i, alert in enumerate(self.active_alerts):
-                    if alert["id"] == alert_id:
-                        self.active_alerts[i] = alert_data
-                        break
+            op = status_op(alert_id, new_status)
+            with self._lock:
+                if self.writer is None:
+                    alert_data = self._write(op, None)
                 else:
-                    # Not found in cache, add it
-                    self.active_alerts.append(alert_data)
+                    current = self._current(alert_id)
+                    alert_data = current and self._write(op, apply_op(dict(current), op))
+                if alert_data is None:
+                    logger.error(f"Alert {alert_id} not found")
+                    return False
             
             logger.info(f"Updated alert {alert_id} status to {new_status}")
             return True
@@ -177,6 +605,37 @@ class AlertEngine:
         except Exception as e:
             logger.error(f"Error updating alert {alert_id}: {str(e)}")
             return False
+    
+    def update_alert_fields(self, updates):
+        """Merge fields into alerts, given as {alert_id: {field: value}}, and index the results
+        
+        Written straight to the store, not queued, so it must not touch
+        status or hits.
+        """
+        try:
+            with self._lock:
+                self.flush()
+                self._note_written(self.store.update_fields(updates))
+                for alert_id in updates:
+                    alert_data = self.store.get(alert_id)
+                    if alert_data is not None:
+                        self._apply(alert_data)
+            return True
+        except Exception as e:
+            logger.error(f"Error updating {len(updates)} alerts: {str(e)}")
+            return False
+    
+    def flush(self):
+        """Commit queued alert writes now; returns False if the commit failed"""
+        if self.writer is None:
+            return True
+        return self.writer.flush()
+    
+    def close(self):
+        """Commit queued alert writes and close the store"""
+        if self.writer is not None:
+            self.writer.close()
+        self.store.close()
 
 
 # For testing
@@ -0,0 +1,496 @@
+#!/usr/bin/env python3
+"""
+Alert Store - SQLite-backed alert storage, queryable by status, time, coin and meme
+
+Each alert is one row: the full alert as JSON plus the columns it is looked
+up by, each indexed. The database runs in WAL mode, so the web app and the
+Ballistic service can read while the other writes. Every write stamps the
+row with the next change sequence number; together with PRAGMA
+data_version, readers can tell cheaply whether anything changed and fetch
+only the rows that did.
+
+A "create" operation (create_op) deduplicates inside its transaction: if
+an alert with the same dedup_key was created within the suppression
+window, by this or any other process, that alert's hits are bumped instead
+of inserting the new one.
+
+AlertWriteBehind queues alert mutations and applies them in group commits,
+one transaction per batch, from a background thread. How hard each commit
+is pushed to disk is set by ALERT_DB_SYNCHRONOUS (PRAGMA synchronous).
+"""
+
+import sys
+import json
+import time
+import logging
+import sqlite3
+import threading
+from collections import deque
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from config import (
+    ALERT_DB_PATH, ALERT_DB_SYNCHRONOUS, ALERT_FLUSH_INTERVAL_MS, ALERT_FLUSH_MAX_RECORDS, ALERT_WRITE_QUEUE_MAX
+)
+
+# Configure logging
+logger = logging.getLogger("alert_store")
+
+SCHEMA = [
+    '''
+    CREATE TABLE IF NOT EXISTS alerts (
+        id TEXT PRIMARY KEY,
+        status TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        updated_at TEXT,
+        coin_address TEXT NOT NULL DEFAULT '',
+        chain TEXT NOT NULL DEFAULT '',
+        meme_id TEXT NOT NULL DEFAULT '',
+        seq INTEGER NOT NULL,
+        data TEXT NOT NULL,
+        dedup_key TEXT NOT NULL DEFAULT ''
+    )
+    ''',
+    # Pages of alerts by status, optionally on one chain, in (created_at, id) order
+    "DROP INDEX IF EXISTS idx_alerts_status",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_status_page ON alerts (status, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_status_chain_page ON alerts (status, chain, created_at, id)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_created_at ON alerts (created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_coin_address ON alerts (coin_address)",
+    "CREATE INDEX IF NOT EXISTS idx_alerts_meme_id ON alerts (meme_id)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_alerts_seq ON alerts (seq)",
+    # Earlier alerts for the same meme/coin pair, for create_op
+    "CREATE INDEX IF NOT EXISTS idx_alerts_dedup ON alerts (dedup_key, created_at)",
+]
+
+
+def _iso(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def _row_values(alert):
+    """Column values for an alert, in insert order after seq"""
+    coin = alert.get("coin", {})
+    return (
+        alert["id"],
+        alert.get("status", "triggered"),
+        alert.get("created_at", ""),
+        alert.get("updated_at"),
+        coin.get("address", ""),
+        coin.get("blockchain", ""),
+        alert.get("meme", {}).get("id", ""),
+        json.dumps(alert),
+        alert.get("dedup_key", ""),
+    )
+
+
+class AlertStore:
+    """Alerts in a WAL-mode SQLite database with status, time, coin and meme indexes"""
+
+    def __init__(self, db_path=ALERT_DB_PATH, synchronous=ALERT_DB_SYNCHRONOUS):
+        """Open (creating if needed) the alert database
+
+        synchronous is the PRAGMA synchronous level: FULL syncs the WAL on
+        every commit; NORMAL syncs only at checkpoints, so a power loss can
+        drop the last commits but never corrupts the database; OFF leaves
+        syncing to the OS.
+        """
+        if synchronous.upper() not in ("OFF", "NORMAL", "FULL", "EXTRA"):
+            raise ValueError(f"Invalid synchronous level: {synchronous}")
+        self.db_path = db_path
+        if db_path != ":memory:":
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        # Transactions are managed explicitly, so writers take the lock up front
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA busy_timeout=5000")
+        self._conn.execute(f"PRAGMA synchronous={synchronous.upper()}")
+        self._lock = threading.Lock()
+        self._conn.execute(SCHEMA[0])
+        self._migrate_columns()
+        for statement in SCHEMA[1:]:
+            self._conn.execute(statement)
+
+    def _migrate_columns(self):
+        """Add columns introduced since the database was created, filled in from each alert's JSON"""
+        with self._write() as conn:
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(alerts)")}
+            if "dedup_key" not in columns:
+                conn.execute("ALTER TABLE alerts ADD COLUMN dedup_key TEXT NOT NULL DEFAULT ''")
+                conn.execute("UPDATE alerts SET dedup_key = COALESCE(json_extract(data, '$.dedup_key'), '')")
+
+    @contextmanager
+    def _write(self):
+        """Serialize a write transaction across threads and processes"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+
+    def _put(self, conn, alert):
+        seq = conn.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM alerts").fetchone()[0]
+        values = _row_values(alert)
+        conn.execute(
+            "INSERT OR REPLACE INTO alerts "
+            "(id, status, created_at, updated_at, coin_address, chain, meme_id, seq, data, dedup_key) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            values[:7] + (seq,) + values[7:]
+        )
+        return seq
+
+    def put(self, alert):
+        """Insert or replace an alert; returns the change seq of the write"""
+        with self._write() as conn:
+            return self._put(conn, alert)
+
+    def put_many(self, alerts):
+        """Insert or replace many alerts in one transaction; returns their change seqs"""
+        with self._write() as conn:
+            return [self._put(conn, alert) for alert in alerts]
+
+    def get(self, alert_id):
+        """The alert with this id, or None"""
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _apply_op(self, conn, op):
+        if op[0] == "put":
+            return op[1], self._put(conn, op[1])
+        if op[0] == "create":
+            alert, since = op[1]
+            row = conn.execute(
+                "SELECT data FROM alerts WHERE dedup_key = ? AND created_at >= ? ORDER BY created_at DESC LIMIT 1",
+                (alert["dedup_key"], since)
+            ).fetchone()
+            if row is not None:
+                # Alerted within the window, possibly by another process: count a hit instead
+                alert = apply_op(json.loads(row[0]), hit_op(None, at=op[2]))
+            return alert, self._put(conn, alert)
+        alert_id = op[1][0] if op[0] == "status" else op[1]
+        row = conn.execute("SELECT data FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+        if row is None:
+            return None, None
+        alert = apply_op(json.loads(row[0]), op)
+        return alert, self._put(conn, alert)
+
+    def apply_one(self, op):
+        """Apply one operation; returns (the alert as written, its change seq), or (None, None) if it does not exist"""
+        with self._write() as conn:
+            return self._apply_op(conn, op)
+
+    def update_status(self, alert_id, status):
+        """Set an alert's status; returns the updated alert, or None if it does not exist"""
+        return self.apply_one(status_op(alert_id, status))[0]
+
+    def record_hit(self, alert_id):
+        """Count another sighting of an alert; returns the updated alert, or None if it does not exist"""
+        return self.apply_one(hit_op(alert_id))[0]
+
+    def apply(self, ops):
+        """Apply queued operations (see put_op, create_op, status_op, hit_op) in order, in one transaction
+
+        Status changes and hits re-read the alert inside the transaction, so
+        changes other processes committed in the meantime are kept. Returns
+        (alert as written, change seq) per operation, like apply_one.
+        """
+        with self._write() as conn:
+            return [self._apply_op(conn, op) for op in ops]
+
+    def update_fields(self, updates):
+        """Merge fields into stored alerts, given as {alert_id: {field: value}}, in one transaction
+
+        Each alert is re-read inside the transaction, so concurrent status
+        changes are kept. Alerts that no longer exist are skipped. Returns
+        the change seqs of the alerts written.
+        """
+        seqs = []
+        with self._write() as conn:
+            for alert_id, fields in updates.items():
+                row = conn.execute("SELECT data FROM alerts WHERE id = ?", (alert_id,)).fetchone()
+                if row is not None:
+                    seqs.append(self._put(conn, {**json.loads(row[0]), **fields}))
+        return seqs
+
+    def _where(self, status=None, coin_address=None, meme_id=None, chain=None, since=None, until=None):
+        clauses, params = [], []
+        for column, value in (("status", status), ("coin_address", coin_address), ("meme_id", meme_id),
+                              ("chain", chain)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(_iso(since))
+        if until is not None:
+            clauses.append("created_at < ?")
+            params.append(_iso(until))
+        return clauses, params
+
+    def query(self, status=None, coin_address=None, meme_id=None, since=None, until=None, limit=None,
+              chain=None, before=None):
+        """Alerts matching every given filter, newest first (ties broken by id, descending)
+
+        since and until bound created_at and may be datetimes or ISO strings.
+        before is a (created_at, id) position: only alerts after it in this
+        order are returned, for keyset pagination.
+        """
+        clauses, params = self._where(status, coin_address, meme_id, chain, since, until)
+        if before is not None:
+            # A row-value comparison lets SQLite seek straight to the position in the index
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(before)
+
+        sql = "SELECT data FROM alerts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC, id DESC"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def count(self, status=None, chain=None):
+        clauses, params = self._where(status=status, chain=chain)
+        sql = "SELECT COUNT(*) FROM alerts"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()[0]
+
+    def last_seq(self):
+        """Change sequence number of the latest write"""
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM alerts").fetchone()[0]
+
+    def changes_since(self, seq):
+        """([(change seq, alert)] written after change seq, in order, and the latest seq)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT seq, data FROM alerts WHERE seq > ? ORDER BY seq", (seq,)
+            ).fetchall()
+        if not rows:
+            return [], seq
+        return [(row_seq, json.loads(data)) for row_seq, data in rows], rows[-1][0]
+
+    def data_version(self):
+        """Changes whenever another connection commits to the database"""
+        with self._lock:
+            return self._conn.execute("PRAGMA data_version").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def put_op(alert):
+    """Operation inserting or replacing an alert"""
+    return ("put", alert, None)
+
+
+def create_op(alert, since):
+    """Operation inserting a new alert unless one with its dedup_key was created since (an ISO timestamp)"""
+    return ("create", (alert, _iso(since)), alert.get("created_at") or datetime.now().isoformat())
+
+
+def apply_op(alert, op):
+    """Apply a status or hit operation to an alert dict in place; returns the alert"""
+    kind, payload, at = op
+    if kind == "status":
+        alert["status"] = payload[1]
+        alert["updated_at"] = at
+    elif kind == "hit":
+        alert["hits"] = alert.get("hits", 1) + 1
+        alert["last_seen_at"] = at
+    else:
+        raise ValueError(f"Unknown alert operation: {kind}")
+    return alert
+
+
+def status_op(alert_id, status, at=None):
+    """Operation setting an alert's status, stamped with the time of the change"""
+    return ("status", (alert_id, status), at or datetime.now().isoformat())
+
+
+def hit_op(alert_id, at=None):
+    """Operation counting another sighting of an alert"""
+    return ("hit", alert_id, at or datetime.now().isoformat())
+
+
+class AlertWriteBehind:
+    """Queues alert operations and applies them to an AlertStore in group commits
+
+    A background thread commits whatever is queued once the oldest queued
+    operation is flush_interval_ms old or max_records are waiting, whichever
+    comes first. submit only blocks when max_queued operations are already
+    waiting. A failed commit is logged and retried on the next flush, with
+    the operations kept in order. committed is the sequence number (as
+    returned by submit) of the last operation committed; take_commits also
+    hands over each operation committed since the last call, with the alert
+    as written and its change seq.
+    """
+
+    def __init__(self, store, flush_interval_ms=ALERT_FLUSH_INTERVAL_MS, max_records=ALERT_FLUSH_MAX_RECORDS,
+                 max_queued=ALERT_WRITE_QUEUE_MAX):
+        self.store = store
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.max_records = max_records
+        self.max_queued = max(max_queued, max_records)
+
+        self._queue = deque()
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._oldest = None
+        self._submitted = 0
+        self.committed = 0
+        self._written = []
+        self.commits = 0
+        self.largest_commit = 0
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="alert-write-behind", daemon=True)
+        self._thread.start()
+
+    @property
+    def pending(self):
+        """Operations queued but not yet committed"""
+        with self._cond:
+            return self._submitted - self.committed
+
+    def submit(self, op):
+        """Queue an operation; returns its sequence number"""
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Alert write-behind queue is closed")
+            while len(self._queue) >= self.max_queued:
+                self._cond.notify_all()
+                self._cond.wait()
+            self._submitted += 1
+            self._queue.append((self._submitted, op))
+            if self._oldest is None:
+                # Start the flush timer of an idle writer
+                self._oldest = time.monotonic()
+                self._cond.notify_all()
+            elif len(self._queue) >= self.max_records:
+                self._cond.notify_all()
+            return self._submitted
+
+    def flush(self):
+        """Commit everything queued so far; returns False if the commit failed"""
+        with self._flush_lock:
+            with self._cond:
+                batch = list(self._queue)
+            if not batch:
+                return True
+            try:
+                results = self.store.apply([op for _, op in batch])
+            except Exception as e:
+                logger.error(f"Error committing {len(batch)} queued alert writes: {str(e)}")
+                return False
+
+            with self._cond:
+                for _ in batch:
+                    self._queue.popleft()
+                self._oldest = time.monotonic() if self._queue else None
+                self.committed = batch[-1][0]
+                self._written.extend((op, alert, seq) for (_, op), (alert, seq) in zip(batch, results)
+                                     if seq is not None)
+                self.commits += 1
+                self.largest_commit = max(self.largest_commit, len(batch))
+                self._cond.notify_all()
+            return True
+
+    def take_commits(self):
+        """(sequence number of the last committed operation, [(op, alert as written, change seq)] since the last call)"""
+        with self._cond:
+            written, self._written = self._written, []
+            return self.committed, written
+
+    def _due(self):
+        if not self._queue:
+            return None
+        if len(self._queue) >= self.max_records:
+            return 0
+        return self._oldest + self.flush_interval - time.monotonic()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._closed:
+                    due = self._due()
+                    if due is not None and due <= 0:
+                        break
+                    self._cond.wait(due)
+                if self._closed:
+                    return
+            if not self.flush():
+                # Back off for one interval before retrying the same batch
+                time.sleep(self.flush_interval)
+
+    def close(self):
+        """Stop the background thread and commit what is still queued"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join()
+        return self.flush()
+
+
+def migrate_alert_dirs(store, alerts_dir):
+    """Import alerts from the old triggered/ and pending/ JSON directories
+
+    Each imported file is renamed to .json.migrated so it is never imported
+    twice. Returns the number of alerts imported.
+    """
+    alerts_dir = Path(alerts_dir)
+    files = sorted(alerts_dir.glob("triggered/*.json")) + sorted(alerts_dir.glob("pending/*.json"))
+    if not files:
+        return 0
+
+    alerts = []
+    for alert_file in files:
+        try:
+            with open(alert_file, 'r') as f:
+                alerts.append(json.load(f))
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error loading alert {alert_file}: {str(e)}")
+
+    # Skip alerts already in the store, e.g. from a migration interrupted before the renames
+    new_alerts = [alert for alert in alerts if "id" in alert and store.get(alert["id"]) is None]
+    store.put_many(new_alerts)
+
+    for alert_file in files:
+        try:
+            alert_file.rename(alert_file.with_suffix(".json.migrated"))
+        except OSError as e:
+            logger.error(f"Error renaming migrated alert {alert_file}: {str(e)}")
+
+    logger.info(f"Imported {len(new_alerts)} alerts from {alerts_dir} into {store.db_path}")
+    return len(new_alerts)
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    store = AlertStore(":memory:")
+    store.put({"id": "a1", "status": "triggered", "created_at": "2024-01-01T00:00:00",
+               "coin": {"address": "0x1", "blockchain": "ethereum"}, "meme": {"id": "reddit-abc"}})
+    store.put({"id": "a2", "status": "triggered", "created_at": "2024-01-02T00:00:00",
+               "coin": {"address": "0x2", "blockchain": "solana"}, "meme": {"id": "reddit-abc"}})
+    store.update_status("a1", "dismissed")
+
+    print(f"Triggered: {[a['id'] for a in store.query(status='triggered')]}")
+    print(f"For meme reddit-abc: {[a['id'] for a in store.query(meme_id='reddit-abc')]}")
+    print(f"Changes since 0: {[(seq, a['id'], a['status']) for seq, a in store.changes_since(0)[0]]}")
+    store.close()
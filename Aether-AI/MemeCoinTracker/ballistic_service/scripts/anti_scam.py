@@ -7,7 +7,6 @@ import os
 import sys
 import json
 import logging
-import requests
 from pathlib import Path
 from datetime import datetime
 
@@ -17,6 +16,7 @@ from config import (
     RUGPULL_API_KEY, TOKEN_SNIFFER_API_KEY,
     RUGPULL_API_ENDPOINT, TOKEN_SNIFFER_API_ENDPOINT
 )
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("anti_scam")
@@ -26,6 +26,9 @@ class AntiScamAnalyzer:
     
     def __init__(self):
         """Initialize the AntiScamAnalyzer"""
+        # Pooled, retrying client shared with the other API callers, for the
+        # RugPull and TokenSniffer checks once they call real endpoints
+        self.http = get_resource("http_client")
         logger.info("AntiScamAnalyzer initialized")
     
     def analyze(self, contract_address, blockchain="ethereum"):
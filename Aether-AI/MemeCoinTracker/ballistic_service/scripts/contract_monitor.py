@@ -8,13 +8,25 @@ import sys
 import json
 import logging
 import time
-import requests
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from datetime import datetime, timedelta
+from datetime import datetime
+
+import requests
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
-from config import ETHERSCAN_API_KEY, PUMPFUN_API_KEY, ETHERSCAN_API_ENDPOINT, PUMPFUN_API_ENDPOINT
+from config import (
+    CONTRACT_REGISTRY_DIR, CONTRACT_FUZZY_MATCHING, CONTRACT_MATCH_WORKERS, ETHERSCAN_API_KEY, PUMPFUN_API_KEY, ETHERSCAN_API_ENDPOINT, PUMPFUN_API_ENDPOINT,
+    CONTRACT_REFRESH_TTL, ETHERSCAN_REQUEST_TIMEOUT, ETHERSCAN_BLOCK_CHUNK, ETHERSCAN_MAX_RESULTS,
+    ETHERSCAN_MAX_CHUNKS_PER_SYNC, ETHERSCAN_INITIAL_LOOKBACK_BLOCKS, ETHERSCAN_BACKFILL_WORKERS,
+    PUMPFUN_STREAM_BATCH, PUMPFUN_STREAM_FLUSH_INTERVAL, PUMPFUN_STREAM_CHUNK_BYTES, PUMPFUN_STREAM_READ_TIMEOUT,
+    PUMPFUN_STREAM_RECONNECT_MAX
+)
+from ballistic_service.scripts.match_index import ContractMatchIndex
+from ballistic_service.scripts.contract_registry import ShardedContractRegistry
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("contract_monitor")
@@ -22,169 +34,563 @@ logger = logging.getLogger("contract_monitor")
 class ContractMonitor:
     """Monitor blockchain for new token contracts and match against keywords"""
     
-    def __init__(self):
-        """Initialize the ContractMonitor"""
+    def __init__(self, etherscan_endpoint=ETHERSCAN_API_ENDPOINT, etherscan_api_key=ETHERSCAN_API_KEY,
+                 pumpfun_endpoint=PUMPFUN_API_ENDPOINT, pumpfun_api_key=PUMPFUN_API_KEY, readonly=False):
+        """Initialize the ContractMonitor
+        
+        A readonly monitor never fetches contracts itself: it opens the
+        registry read-only and reloads what the writing process (the
+        Ballistic service) commits before each match.
+        """
+        self.readonly = readonly
+        self.etherscan_endpoint = etherscan_endpoint
+        self.etherscan_api_key = etherscan_api_key
+        self.pumpfun_endpoint = pumpfun_endpoint
+        self.pumpfun_api_key = pumpfun_api_key
+        
+        # Pooled, retrying client shared with the other API callers
+        self.http = get_resource("http_client")
+        
+        # Open the per-chain contract registry, importing the legacy JSON file on first run
+        self.registry = ShardedContractRegistry(CONTRACT_REGISTRY_DIR, readonly=readonly)
         self.eth_contracts_path = Path("ballistic_service/data/eth_contracts.json")
-        self.eth_contracts = self._load_eth_contracts()
+        if not readonly:
+            self._migrate_legacy_contracts()
+        
+        # One keyword index per chain shard, kept in sync as new rows arrive.
+        # Each shard has its own lock, held while its snapshot is read or
+        # changed (never during API calls), so ingesting one chain never
+        # blocks matching on another.
+        self.match_indexes = {}
+        self._locks = {}
+        self._shards_lock = threading.Lock()
+        for chain in self.registry.chains:
+            self._shard_index(chain)
+        self._match_pool = ThreadPoolExecutor(max_workers=CONTRACT_MATCH_WORKERS, thread_name_prefix="contract-match")
+        
+        # Background refresher state
+        self.last_refreshed = None
+        self._refresh_lock = threading.Lock()
+        self._refresher = None
+        self._stop_refresher = threading.Event()
+        
+        # Solana stream follower state
+        self._solana_follower = None
+        self._stop_solana_follower = threading.Event()
         
         logger.info("ContractMonitor initialized")
     
-    def _load_eth_contracts(self):
-        """Load existing Ethereum contracts data from JSON file"""
-        if self.eth_contracts_path.exists():
-            try:
-                with open(self.eth_contracts_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError) as e:
-                logger.error(f"Error loading ETH contracts data: {str(e)}")
+    def _migrate_legacy_contracts(self):
+        """Import contracts from the legacy eth_contracts.json file into the registry"""
+        if not self.eth_contracts_path.exists():
+            return
+        
+        try:
+            with open(self.eth_contracts_path, 'r') as f:
+                eth_contracts = json.load(f)
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error loading legacy ETH contracts data: {str(e)}")
+            return
         
-        return {"contracts": [], "last_updated": datetime.now().isoformat()}
-    
-    def _save_eth_contracts(self):
-        """Save Ethereum contracts data to JSON file"""
         try:
-            with open(self.eth_contracts_path, 'w') as f:
-                json.dump(self.eth_contracts, f, indent=2)
+            imported = self.registry.import_contracts(
+                eth_contracts.get("contracts", []),
+                last_block=eth_contracts.get("last_block", self.registry.shard('ethereum').last_block)
+            )
         except OSError as e:
-            logger.error(f"Error saving ETH contracts data: {str(e)}")
+            logger.error(f"Error importing legacy ETH contracts data: {str(e)}")
+            return
+        logger.info(f"Imported {imported} contracts from {self.eth_contracts_path}")
+        
+        # Keep the old file around, but make sure it is never imported twice
+        try:
+            self.eth_contracts_path.rename(self.eth_contracts_path.with_suffix(".json.migrated"))
+        except OSError as e:
+            logger.error(f"Error renaming legacy ETH contracts data: {str(e)}")
     
-    def update_ethereum_contracts(self):
-        """Update Ethereum contracts from Etherscan API"""
-        if not ETHERSCAN_API_KEY:
-            logger.warning("Etherscan API key not configured")
-            return False
+    def _shard_index(self, chain):
+        """Return the match index and lock for a chain, creating the shard on first use"""
+        with self._shards_lock:
+            if chain not in self.match_indexes:
+                shard = self.registry.shard(chain)
+                index = ContractMatchIndex(record=shard.record)
+                index.add_entries(shard.index_entries(shard.rows()))
+                self._locks[chain] = threading.Lock()
+                self.match_indexes[chain] = index
+            return self.match_indexes[chain], self._locks[chain]
+    
+    def reload(self):
+        """Pick up contracts the writing process committed, for a readonly monitor
         
+        Returns {chain: contracts added} for the chains that gained any.
+        """
+        # Every chain lock is held, since reloading remaps each shard's strings
+        with self._shards_lock:
+            locks = [self._locks[chain] for chain in sorted(self._locks)]
+        for lock in locks:
+            lock.acquire()
         try:
-            # Get the current time
-            current_time = datetime.now()
-            
-            # Calculate the time 24 hours ago
-            time_24h_ago = current_time - timedelta(hours=24)
-            
-            # Convert to Unix timestamp
-            start_time = int(time_24h_ago.timestamp())
-            end_time = int(current_time.timestamp())
-            
-            # Etherscan API to get token transfers (proxy for new tokens)
-            params = {
-                'module': 'account',
-                'action': 'tokentx',
-                'startblock': 0,
-                'endblock': 999999999,
-                'sort': 'desc',
-                'apikey': ETHERSCAN_API_KEY
-            }
+            first_ranks = {chain: shard.meta["first_rank"] for chain, shard in self.registry.shards.items()}
+            new_rows = self.registry.reload()
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+        
+        added = {}
+        for chain, rows in new_rows.items():
+            if chain not in first_ranks:
+                # A chain created since; its index is built from every row
+                self._shard_index(chain)
+            else:
+                index, lock = self._shard_index(chain)
+                shard = self.registry.shard(chain)
+                rank = shard.columns["rank"]
+                rows = sorted(rows, key=rank.__getitem__)
+                prepended = [row for row in rows if rank[row] < first_ranks[chain]]
+                appended = [row for row in rows if rank[row] >= first_ranks[chain]]
+                with lock:
+                    index.add_entries(shard.index_entries(prepended), prepend=True)
+                    index.add_entries(shard.index_entries(appended))
+            added[chain] = len(rows)
+        
+        self.last_refreshed = time.time()
+        return added
+    
+    def _etherscan_get(self, params):
+        """Call the Etherscan API and return its decoded JSON"""
+        return self.http.get_json(
+            self.etherscan_endpoint,
+            params={**params, 'apikey': self.etherscan_api_key},
+            timeout=ETHERSCAN_REQUEST_TIMEOUT
+        )
+    
+    def _latest_block(self):
+        """Return the current Ethereum block number"""
+        data = self._etherscan_get({'module': 'proxy', 'action': 'eth_blockNumber'})
+        return int(data['result'], 16)
+    
+    def _fetch_token_transfers(self, start_block, end_block):
+        """Fetch token transfers in [start_block, end_block], oldest first
+        
+        Etherscan truncates a query at ETHERSCAN_MAX_RESULTS rows, so a range
+        that comes back full is split in half and each half fetched again.
+        """
+        data = self._etherscan_get({
+            'module': 'account',
+            'action': 'tokentx',
+            'startblock': start_block,
+            'endblock': end_block,
+            'sort': 'asc'
+        })
+        
+        if data['status'] != '1':
+            # An empty range is reported as an error status
+            if data.get('message') == 'No transactions found':
+                return []
+            raise RuntimeError(f"Etherscan API error: {data['message']}")
+        
+        result = data['result']
+        if len(result) >= ETHERSCAN_MAX_RESULTS and end_block > start_block:
+            middle = (start_block + end_block) // 2
+            return self._fetch_token_transfers(start_block, middle) + self._fetch_token_transfers(middle + 1, end_block)
+        
+        return result
+    
+    def _contracts_from_transfers(self, transfers):
+        """Contract records for token addresses not seen before, oldest first"""
+        ethereum = self.registry.shard('ethereum')
+        new_contracts = []
+        seen = set()
+        for tx in transfers:
+            address = tx['contractAddress']
+            # Only consider contracts we haven't seen before
+            if address in seen or address in ethereum:
+                continue
             
-            response = requests.get(ETHERSCAN_API_ENDPOINT, params=params)
-            data = response.json()
+            seen.add(address)
+            new_contracts.append({
+                'address': address,
+                'name': tx['tokenName'],
+                'symbol': tx['tokenSymbol'],
+                'created_at': datetime.fromtimestamp(int(tx['timeStamp'])).isoformat(),
+                'blockchain': 'ethereum'
+            })
+        return new_contracts
+    
+    def _add_contracts(self, new_contracts, chain, newest=True, last_block=None, cursors=None):
+        """Add one chain's contracts to its registry shard and index, then persist them
+        
+        Each shard lists newest contracts first: newly synced contracts are
+        prepended, backfilled historic ones appended. Only the new rows are
+        written.
+        """
+        index, lock = self._shard_index(chain)
+        shard = self.registry.shard(chain)
+        with lock:
+            if new_contracts:
+                ordered = list(reversed(new_contracts)) if newest else new_contracts
+                rows = shard.append(ordered, prepend=newest)
+                index.add_entries(shard.index_entries(rows), prepend=newest)
             
-            if data['status'] != '1':
-                logger.error(f"Etherscan API error: {data['message']}")
-                return False
+            if last_block is not None:
+                shard.last_block = last_block
+            for feed, position in (cursors or {}).items():
+                shard.set_cursor(feed, position)
             
-            # Process the transactions
-            new_contracts = []
-            existing_addresses = {c['address'] for c in self.eth_contracts['contracts']}
+            try:
+                self.registry.flush([chain])
+            except OSError as e:
+                # Unwritten rows stay pending and go out with the next flush
+                logger.error(f"Error saving contract registry: {str(e)}")
+    
+    def update_ethereum_contracts(self):
+        """Fetch token contracts from blocks after the persisted watermark
+        
+        Blocks are requested in ETHERSCAN_BLOCK_CHUNK sized ranges, at most
+        ETHERSCAN_MAX_CHUNKS_PER_SYNC per call, and the watermark is saved
+        after each range so an interrupted sync resumes where it stopped.
+        Without a watermark, sync starts ETHERSCAN_INITIAL_LOOKBACK_BLOCKS
+        (about 24 hours) behind the chain head.
+        """
+        if self.readonly:
+            logger.warning("Read-only ContractMonitor does not fetch Ethereum contracts")
+            return False
+        if not self.etherscan_api_key:
+            logger.warning("Etherscan API key not configured")
+            return False
+        
+        try:
+            head = self._latest_block()
+            last_block = self.registry.shard('ethereum').last_block
+            if last_block is None:
+                last_block = max(0, head - ETHERSCAN_INITIAL_LOOKBACK_BLOCKS)
             
-            for tx in data['result']:
-                # Only consider contracts we haven't seen before
-                if tx['contractAddress'] not in existing_addresses:
-                    # Basic token contract metadata
-                    contract_data = {
-                        'address': tx['contractAddress'],
-                        'name': tx['tokenName'],
-                        'symbol': tx['tokenSymbol'],
-                        'created_at': datetime.fromtimestamp(int(tx['timeStamp'])).isoformat(),
-                        'blockchain': 'ethereum'
-                    }
-                    
-                    new_contracts.append(contract_data)
-                    existing_addresses.add(tx['contractAddress'])
+            found = 0
+            for _ in range(ETHERSCAN_MAX_CHUNKS_PER_SYNC):
+                if last_block >= head:
+                    break
+                
+                end_block = min(head, last_block + ETHERSCAN_BLOCK_CHUNK)
+                new_contracts = self._contracts_from_transfers(self._fetch_token_transfers(last_block + 1, end_block))
+                self._add_contracts(new_contracts, 'ethereum', last_block=end_block)
+                
+                found += len(new_contracts)
+                last_block = end_block
             
-            # Update the contracts data
-            if new_contracts:
-                logger.info(f"Found {len(new_contracts)} new Ethereum contracts")
-                self.eth_contracts['contracts'] = new_contracts + self.eth_contracts['contracts']
-                self.eth_contracts['last_updated'] = current_time.isoformat()
-                self._save_eth_contracts()
+            if found:
+                logger.info(f"Found {found} new Ethereum contracts up to block {last_block}")
+            if last_block < head:
+                logger.info(f"Ethereum sync is {head - last_block} blocks behind; continuing on the next refresh")
             
+            self.last_refreshed = time.time()
             return True
             
         except Exception as e:
             logger.error(f"Error updating Ethereum contracts: {str(e)}")
             return False
     
+    def backfill_ethereum_contracts(self, start_block, end_block, workers=ETHERSCAN_BACKFILL_WORKERS):
+        """Fetch token contracts from a historic block range in parallel
+        
+        The range is split into ETHERSCAN_BLOCK_CHUNK sized chunks fetched
+        on a thread pool, then merged in block order. The sync watermark is
+        left alone. Returns the number of contracts added.
+        """
+        if not self.etherscan_api_key:
+            logger.warning("Etherscan API key not configured")
+            return 0
+        
+        chunks = [
+            (chunk_start, min(end_block, chunk_start + ETHERSCAN_BLOCK_CHUNK - 1))
+            for chunk_start in range(start_block, end_block + 1, ETHERSCAN_BLOCK_CHUNK)
+        ]
+        
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etherscan-backfill") as pool:
+            results = list(pool.map(lambda chunk: self._fetch_token_transfers(*chunk), chunks))
+        
+        transfers = [tx for result in results for tx in result]
+        new_contracts = self._contracts_from_transfers(transfers)
+        # Historic contracts are older than everything already synced
+        self._add_contracts(new_contracts, 'ethereum', newest=False)
+        
+        logger.info(f"Backfilled {len(new_contracts)} Ethereum contracts from blocks {start_block}-{end_block}")
+        return len(new_contracts)
+    
+    def _contract_from_launch(self, event):
+        """Contract record for a PumpFun new-token event"""
+        return {
+            'address': event['mint'],
+            'name': event.get('name') or '',
+            'symbol': event.get('symbol') or '',
+            'created_at': datetime.fromtimestamp(int(event['created_timestamp']) // 1000).isoformat(),
+            'blockchain': 'solana'
+        }
+    
+    def ingest_solana_stream(self, max_seconds=None, stop_event=None):
+        """Read PumpFun new-token events into the registry as they stream in
+        
+        The feed is newline-delimited JSON, one launch per line, resumed from
+        the created_timestamp saved in the registry. Lines are decoded as the
+        chunks arrive, so the response is never held in memory. New contracts
+        are added and the cursor saved every PUMPFUN_STREAM_BATCH events, or
+        PUMPFUN_STREAM_FLUSH_INTERVAL seconds, whichever comes first. Reading
+        stops when the server ends the stream, after max_seconds, or once
+        stop_event is set. Returns the number of contracts added.
+        """
+        solana = self.registry.shard('solana')
+        since = solana.cursor('pumpfun')
+        params = {'since': since} if since is not None else None
+        read_timeout = PUMPFUN_STREAM_READ_TIMEOUT if max_seconds is None else min(PUMPFUN_STREAM_READ_TIMEOUT, max_seconds)
+        deadline = time.monotonic() + max_seconds if max_seconds is not None else None
+        
+        added = 0
+        batch = []
+        batch_addresses = set()
+        pending = 0
+        flushed_at = time.monotonic()
+        
+        def flush():
+            nonlocal added, batch, batch_addresses, pending, flushed_at
+            self._add_contracts(batch, 'solana', cursors={'pumpfun': since})
+            added += len(batch)
+            batch, batch_addresses, pending = [], set(), 0
+            flushed_at = time.monotonic()
+        
+        response = self.http.get(
+            f"{self.pumpfun_endpoint}/tokens/stream",
+            params=params,
+            headers={'X-API-KEY': self.pumpfun_api_key, 'Accept': 'application/x-ndjson'},
+            stream=True,
+            timeout=read_timeout
+        )
+        with response:
+            response.raise_for_status()
+            try:
+                for line in response.iter_lines(chunk_size=PUMPFUN_STREAM_CHUNK_BYTES):
+                    # Blank lines are keep-alive heartbeats
+                    if line:
+                        try:
+                            event = json.loads(line)
+                            address = event['mint']
+                            created = int(event['created_timestamp'])
+                        except (ValueError, KeyError, TypeError) as e:
+                            logger.warning(f"Skipping malformed PumpFun event: {str(e)}")
+                            continue
+                        
+                        # Launches sharing the cursor timestamp are sent again on resume
+                        if address not in batch_addresses and address not in solana:
+                            batch_addresses.add(address)
+                            batch.append(self._contract_from_launch(event))
+                        since = max(since or 0, created)
+                        pending += 1
+                    
+                    now = time.monotonic()
+                    if pending >= PUMPFUN_STREAM_BATCH or (pending and now - flushed_at >= PUMPFUN_STREAM_FLUSH_INTERVAL):
+                        flush()
+                    if (deadline is not None and now >= deadline) or (stop_event is not None and stop_event.is_set()):
+                        break
+            except requests.RequestException as e:
+                # A dropped or idle stream ends this read; the cursor says where to resume
+                logger.info(f"PumpFun stream ended: {str(e)}")
+        
+        if pending:
+            flush()
+        return added
+    
     def update_solana_contracts(self):
-        """Update Solana contracts from PumpFun API"""
-        if not PUMPFUN_API_KEY:
+        """Update Solana contracts from the PumpFun new-token stream
+        
+        The stream follower keeps the registry current, so this only starts
+        it if it is not running yet and returns at once; the stream is never
+        read on the caller's thread.
+        """
+        if self.readonly:
+            logger.warning("Read-only ContractMonitor does not fetch Solana contracts")
+            return False
+        if not self.pumpfun_api_key:
             logger.warning("PumpFun API key not configured")
             return False
         
-        try:
-            # For this implementation, we'll just log the attempt
-            # as the actual PumpFun API endpoint is not specified
-            logger.info("Attempted to update Solana contracts from PumpFun")
-            
-            # In a real implementation, this would make API calls to PumpFun
-            # and update the contract data
-            
-            return True
+        self.start_solana_follower()
+        return True
+    
+    def start_solana_follower(self):
+        """Follow the PumpFun stream on a background thread so launches are matched within seconds"""
+        if self.readonly:
+            logger.warning("Read-only ContractMonitor does not follow the PumpFun stream")
+            return
+        if not self.pumpfun_api_key:
+            logger.warning("PumpFun API key not configured")
+            return
+        if self._solana_follower and self._solana_follower.is_alive():
+            return
+        
+        self._stop_solana_follower.clear()
+        self._solana_follower = threading.Thread(target=self._solana_follow_loop, name="solana-follower")
+        self._solana_follower.daemon = True
+        self._solana_follower.start()
+        
+        logger.info("Solana stream follower started")
+    
+    def stop_solana_follower(self):
+        """Stop the PumpFun stream follower"""
+        self._stop_solana_follower.set()
+        if self._solana_follower:
+            self._solana_follower.join(timeout=5.0)
+            self._solana_follower = None
+    
+    def _solana_follow_loop(self):
+        """Keep reading the PumpFun stream, reconnecting with backoff after failures"""
+        failures = 0
+        while not self._stop_solana_follower.is_set():
+            try:
+                added = self.ingest_solana_stream(stop_event=self._stop_solana_follower)
+                if added:
+                    logger.info(f"Streamed {added} new Solana contracts")
+                failures = 0
+            except Exception as e:
+                failures += 1
+                logger.error(f"Error following PumpFun stream: {str(e)}")
             
-        except Exception as e:
-            logger.error(f"Error updating Solana contracts: {str(e)}")
-            return False
+            wait = min(PUMPFUN_STREAM_RECONNECT_MAX, 2 ** failures) if failures else 1.0
+            self._stop_solana_follower.wait(wait)
     
     def update_contracts(self):
         """Update contracts from all monitored blockchains"""
+        if self.readonly:
+            self.reload()
+            return True
+        
         ethereum_updated = self.update_ethereum_contracts()
         solana_updated = self.update_solana_contracts()
         
         return ethereum_updated or solana_updated
     
-    def find_matches(self, keywords):
-        """Find contracts that match the given keywords"""
-        # First, update contracts to ensure we have the latest data
-        self.update_contracts()
+    def refresh(self):
+        """Update contracts now, unless another refresh is already running"""
+        if not self._refresh_lock.acquire(blocking=False):
+            # Wait for the running refresh instead of starting a second one
+            with self._refresh_lock:
+                return self.last_refreshed is not None
         
-        # Convert keywords to lowercase for case-insensitive matching
-        normalized_keywords = [kw.lower() for kw in keywords]
+        try:
+            return self.update_contracts()
+        finally:
+            self._refresh_lock.release()
+    
+    def snapshot_age(self):
+        """Seconds since contracts were last fetched successfully, or None if never"""
+        if self.last_refreshed is None:
+            return None
+        return time.time() - self.last_refreshed
+    
+    def start_refresher(self, ttl=CONTRACT_REFRESH_TTL):
+        """Refresh contracts on a background thread whenever the snapshot is ttl seconds old"""
+        if self.readonly:
+            logger.warning("Read-only ContractMonitor reloads on match and runs no refresher")
+            return
+        if self._refresher and self._refresher.is_alive():
+            return
         
-        matches = []
+        self._stop_refresher.clear()
+        self._refresher = threading.Thread(target=self._refresh_loop, args=(ttl,), name="contract-refresher")
+        self._refresher.daemon = True
+        self._refresher.start()
         
-        # Search through Ethereum contracts
-        for contract in self.eth_contracts['contracts']:
-            # Check if any keyword is in the contract name or symbol
-            name_lower = contract['name'].lower()
-            symbol_lower = contract['symbol'].lower()
+        logger.info(f"Contract refresher started (TTL {ttl}s)")
+    
+    def stop_refresher(self):
+        """Stop the background refresher"""
+        self._stop_refresher.set()
+        if self._refresher:
+            self._refresher.join(timeout=5.0)
+            self._refresher = None
+    
+    def _refresh_loop(self, ttl):
+        """Background loop keeping the contract snapshot within ttl"""
+        while not self._stop_refresher.is_set():
+            age = self.snapshot_age()
+            if age is None or age >= ttl:
+                try:
+                    self.refresh()
+                except Exception as e:
+                    logger.error(f"Error in contract refresher: {str(e)}")
+                age = self.snapshot_age()
             
-            for keyword in normalized_keywords:
-                if keyword in name_lower or keyword in symbol_lower:
-                    # Calculate a simple match score based on exact match vs substring
-                    score = 0.0
-                    
-                    # Exact matches are scored higher
-                    if keyword == name_lower or keyword == symbol_lower:
-                        score = 1.0
-                    else:
-                        # Calculate partial match score based on length ratio
-                        name_ratio = len(keyword) / len(name_lower) if name_lower else 0
-                        symbol_ratio = len(keyword) / len(symbol_lower) if symbol_lower else 0
-                        score = max(name_ratio, symbol_ratio) * 0.8  # Scale down partial matches
-                    
-                    match_data = {
-                        **contract,  # Include all contract fields
-                        'match_keyword': keyword,
-                        'match_score': score,
-                        'match_type': 'name' if keyword in name_lower else 'symbol'
-                    }
-                    
-                    matches.append(match_data)
-                    break  # Only count each contract once per keyword set
+            # A refresh forced by find_matches pushes the next one back
+            wait = ttl - age if age is not None and age < ttl else ttl
+            self._stop_refresher.wait(max(1.0, wait))
+    
+    def find_matches(self, keywords, max_staleness=None, fuzzy=CONTRACT_FUZZY_MATCHING, chains=None):
+        """Find contracts that match the given keywords
+        
+        Matching reads the current contract snapshot and never waits on the
+        network, unless max_staleness (seconds) is given and the snapshot is
+        older than that, in which case contracts are refreshed first. A
+        readonly monitor reloads newly committed contracts instead. With
+        fuzzy set, near-miss names and tickers ("p3pe", "peepe") match too,
+        at lower scores than substring matches. chains limits matching to
+        those chains' shards; by default every chain is searched.
+        """
+        return self.find_matches_many([keywords], max_staleness, fuzzy, chains)[0]
+    
+    def _match_shard(self, chain, keyword_sets, fuzzy):
+        index, lock = self._shard_index(chain)
+        with lock:
+            return index.find_matches_many(keyword_sets, fuzzy=fuzzy)
+    
+    def find_matches_many(self, keyword_sets, max_staleness=None, fuzzy=CONTRACT_FUZZY_MATCHING, chains=None):
+        """Find matches for many keyword sets against one contract snapshot
+        
+        Returns one match list per keyword set, each identical to what
+        find_matches would return for it. Keywords shared between sets are
+        looked up once, so a scan of many memes costs a single batch. Chain
+        shards are matched on the worker pool and their results merged by
+        score; within equal scores, shards keep the order of chains.
+        """
+        if self.readonly:
+            self.reload()
+        elif max_staleness is not None:
+            age = self.snapshot_age()
+            if age is None or age > max_staleness:
+                self.refresh()
         
-        # Sort matches by score (highest first)
-        matches.sort(key=lambda x: x['match_score'], reverse=True)
+        keyword_sets = list(keyword_sets)
+        selected = [chain for chain in (chains or list(self.match_indexes)) if chain in self.match_indexes]
+        if len(selected) > 1:
+            shard_results = list(self._match_pool.map(
+                lambda chain: self._match_shard(chain, keyword_sets, fuzzy), selected
+            ))
+        else:
+            shard_results = [self._match_shard(chain, keyword_sets, fuzzy) for chain in selected]
         
+        if not shard_results:
+            return [[] for _ in keyword_sets]
+        if len(shard_results) == 1:
+            return shard_results[0]
+        
+        matches = []
+        for shard_matches in zip(*shard_results):
+            merged = [match for chain_matches in shard_matches for match in chain_matches]
+            # Stable, so each shard's own ordering survives among equal scores
+            merged.sort(key=lambda match: -match['match_score'])
+            matches.append(merged)
         return matches
+    
+    def stats(self):
+        """Report the contract snapshot size and age"""
+        age = self.snapshot_age()
+        return {
+            "contracts": sum(len(index) for index in list(self.match_indexes.values())),
+            "shards": {chain: len(index) for chain, index in list(self.match_indexes.items())},
+            "registry": self.registry.stats(),
+            "snapshot_age_seconds": round(age, 1) if age is not None else None,
+            "last_refreshed": datetime.fromtimestamp(self.last_refreshed).isoformat() if self.last_refreshed else None,
+            "refresher_running": bool(self._refresher and self._refresher.is_alive()),
+            "solana_follower_running": bool(self._solana_follower and self._solana_follower.is_alive()),
+            "pumpfun_cursor": self.registry.shards['solana'].cursor('pumpfun') if 'solana' in self.registry.shards else None,
+            "readonly": self.readonly
+        }
 
 
 # For testing
@@ -200,6 +606,7 @@ if __name__ == "__main__":
     test_keywords = ["doge", "pepe", "meme"]
     print(f"Finding matches for keywords: {test_keywords}")
     matches = monitor.find_matches(test_keywords)
+    print(f"Snapshot: {monitor.stats()}")
     
     if matches:
         print(f"Found {len(matches)} matches:")
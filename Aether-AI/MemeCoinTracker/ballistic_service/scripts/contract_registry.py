@@ -0,0 +1,626 @@
+#!/usr/bin/env python3
+"""
+Contract Registry - Columnar, append-only storage for known token contracts
+
+Every contract is one row across a set of fixed-width column files: string
+ids for the address, name and symbol, a created_at Unix timestamp, a chain id
+and a registry rank. Strings are interned into a single string table, so the
+thousands of tokens sharing a name or symbol store it once. The table's bytes
+are memory-mapped and decoded on demand, and the numeric columns load
+straight into arrays, so opening a large registry costs a few reads rather
+than parsing JSON.
+
+A ShardedContractRegistry keeps one such registry per chain, in a
+subdirectory named after it, so a high-volume chain never grows or locks
+another chain's files. Each shard has its own writer lock. Shard commits
+and reader loads also take commit.lock (exclusive and shared), so a reader
+never sees a commit that is only half done.
+
+Files only ever grow. New rows and strings are written after the committed
+end of each file, then meta.json is atomically replaced with the new row and
+string counts; anything past those counts (a torn write) is ignored on open
+and overwritten by the next flush. Newest-first registry order is kept
+through the rank column: synced contracts are prepended with decreasing
+ranks, backfilled ones appended with increasing ranks.
+
+A registry has a single writer. Opening it for writing takes an exclusive
+flock on writer.lock for as long as it stays open, so a second writer (in
+this or another process) fails instead of appending over the first one's
+rows. Other processes open it read-only and call reload() to pick up rows
+the writer has committed since.
+"""
+
+import os
+import sys
+import json
+import mmap
+import fcntl
+import shutil
+import logging
+from array import array
+from pathlib import Path
+from datetime import datetime
+from contextlib import contextmanager
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from config import CONTRACT_REGISTRY_DIR
+
+# Configure logging
+logger = logging.getLogger("contract_registry")
+
+# Column name -> array typecode, stored in native byte order
+COLUMNS = {
+    "address": "I",
+    "name": "I",
+    "symbol": "I",
+    "created_at": "q",
+    "chain": "B",
+    "rank": "q",
+}
+META_FILE = "meta.json"
+STRINGS_FILE = "strings.dat"
+STRING_ENDS_FILE = "string_ends.col"
+WRITER_LOCK_FILE = "writer.lock"
+COMMIT_LOCK_FILE = "commit.lock"
+DEFAULT_CHAINS = ["ethereum", "solana"]
+
+
+def _to_timestamp(created_at):
+    """Unix timestamp for an ISO-format datetime, or 0 if unknown"""
+    if not created_at:
+        return 0
+    try:
+        return int(datetime.fromisoformat(created_at).timestamp())
+    except ValueError:
+        return 0
+
+
+def _from_timestamp(timestamp):
+    return datetime.fromtimestamp(timestamp).isoformat() if timestamp else ""
+
+
+def _load_column(path, typecode, count, start=0):
+    """Read items start to count of a column file into an array"""
+    column = array(typecode)
+    if count > start:
+        with open(path, 'rb') as f:
+            f.seek(start * column.itemsize)
+            column.frombytes(f.read((count - start) * column.itemsize))
+        if len(column) < count - start:
+            raise ValueError(f"{path} holds {start + len(column)} of {count} committed items")
+    return column
+
+
+def _lock_file(path, operation):
+    """Open path and flock it, returning the open file that holds the lock"""
+    f = open(path, 'a')
+    try:
+        fcntl.flock(f.fileno(), operation)
+    except BaseException:
+        f.close()
+        raise
+    return f
+
+
+def _write_at(path, offset, data):
+    """Write data at offset, dropping anything a torn earlier write left after it"""
+    with open(path, 'r+b' if path.exists() else 'wb') as f:
+        f.seek(offset)
+        f.write(data)
+        f.truncate()
+
+
+class _StringTable:
+    """Append-only table of distinct strings, memory-mapped from disk"""
+
+    def __init__(self, directory, count, size):
+        self.path = directory / STRINGS_FILE
+        self.ends_path = directory / STRING_ENDS_FILE
+
+        # End offset of each string in the data file
+        self.ends = _load_column(self.ends_path, 'Q', count)
+        self.size = size
+
+        self._blob = None
+        self._map(size)
+        self._mapped = count
+        # Strings added since the file was mapped
+        self._tail = []
+
+        self._flushed = count
+        self._flushed_size = size
+        self._pending = []
+
+        # String -> id, only built once something is interned
+        self._ids = None
+
+    def _map(self, size):
+        if size:
+            with open(self.path, 'rb') as f:
+                self._blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return len(self.ends)
+
+    def get(self, string_id):
+        if string_id >= self._mapped:
+            return self._tail[string_id - self._mapped]
+        start = self.ends[string_id - 1] if string_id else 0
+        return self._blob[start:self.ends[string_id]].decode("utf-8")
+
+    def intern(self, string):
+        """Return the id of string, adding it to the table if it is new"""
+        if self._ids is None:
+            self._ids = {self.get(i): i for i in range(len(self))}
+
+        string_id = self._ids.get(string)
+        if string_id is None:
+            data = string.encode("utf-8")
+            string_id = len(self.ends)
+            self.size += len(data)
+            self.ends.append(self.size)
+            self._tail.append(string)
+            self._pending.append(data)
+            self._ids[string] = string_id
+        return string_id
+
+    def flush(self):
+        """Write strings added since the last flush"""
+        if not self._pending:
+            return
+        _write_at(self.path, self._flushed_size, b"".join(self._pending))
+        _write_at(self.ends_path, self._flushed * self.ends.itemsize, self.ends[self._flushed:].tobytes())
+        self._pending = []
+        self._flushed = len(self.ends)
+        self._flushed_size = self.size
+
+    def reload(self, count, size):
+        """Map strings another process committed, for a table opened read-only"""
+        if count == len(self.ends):
+            return
+        self.ends.extend(_load_column(self.ends_path, 'Q', count, start=len(self.ends)))
+        self.close()
+        self._map(size)
+        self.size = self._flushed_size = size
+        self._mapped = self._flushed = count
+        if self._ids is not None:
+            for string_id in range(len(self._ids), count):
+                self._ids[self.get(string_id)] = string_id
+
+    def close(self):
+        if self._blob is not None:
+            self._blob.close()
+            self._blob = None
+
+
+class ContractRegistry:
+    """Columnar contract registry with interned strings and append-only files"""
+
+    def __init__(self, directory=CONTRACT_REGISTRY_DIR, readonly=False):
+        """Open (or, unless readonly, create) the registry in directory"""
+        self.directory = Path(directory)
+        self.readonly = readonly
+        self._writer_lock = None
+        if not readonly:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            try:
+                self._writer_lock = _lock_file(self.directory / WRITER_LOCK_FILE, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                raise ValueError(f"Registry {self.directory} is already open for writing") from None
+
+        self._meta_version = self._meta_stat()
+        self.meta = self._load_meta()
+        rows = self.meta["rows"]
+
+        self.columns = {
+            name: _load_column(self.directory / f"{name}.col", typecode, rows)
+            for name, typecode in COLUMNS.items()
+        }
+        self.strings = _StringTable(self.directory, self.meta["strings"], self.meta["string_bytes"])
+        self._flushed_rows = rows
+
+        # Address -> row, only built once an address is looked up
+        self._address_rows = None
+
+        logger.info(f"ContractRegistry opened with {rows} contracts under {self.directory}")
+
+    def __len__(self):
+        return len(self.columns["rank"])
+
+    def __contains__(self, address):
+        return self.row_for_address(address) is not None
+
+    def _meta_stat(self):
+        """Identity of the committed meta.json; changes whenever a flush replaces it"""
+        try:
+            stat = os.stat(self.directory / META_FILE)
+        except FileNotFoundError:
+            return None
+        return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+    def _load_meta(self):
+        meta = {
+            "rows": 0,
+            "strings": 0,
+            "string_bytes": 0,
+            "chains": list(DEFAULT_CHAINS),
+            "first_rank": 0,
+            "next_rank": 0,
+            "last_block": None,
+            "cursors": {},
+            "last_updated": None,
+        }
+        meta_path = self.directory / META_FILE
+        if meta_path.exists():
+            with open(meta_path, 'r') as f:
+                meta.update(json.load(f))
+        return meta
+
+    @property
+    def last_block(self):
+        """Ethereum block the registry has been synced up to"""
+        return self.meta["last_block"]
+
+    @last_block.setter
+    def last_block(self, block):
+        self.meta["last_block"] = block
+
+    def cursor(self, feed):
+        """Resume position saved for a streamed feed, or None"""
+        return self.meta["cursors"].get(feed)
+
+    def set_cursor(self, feed, position):
+        """Record how far a feed has been read; committed by the next flush()"""
+        self.meta["cursors"][feed] = position
+
+    def _chain_id(self, chain):
+        chains = self.meta["chains"]
+        if chain not in chains:
+            chains.append(chain)
+        return chains.index(chain)
+
+    def append(self, contracts, prepend=False):
+        """Add contracts at the end (or, with prepend, the front) of the registry
+
+        Returns their row numbers. Nothing is written until flush().
+        """
+        if self.readonly:
+            raise ValueError("Registry was opened read-only")
+
+        contracts = list(contracts)
+        if prepend:
+            self.meta["first_rank"] -= len(contracts)
+            ranks = range(self.meta["first_rank"], self.meta["first_rank"] + len(contracts))
+        else:
+            ranks = range(self.meta["next_rank"], self.meta["next_rank"] + len(contracts))
+            self.meta["next_rank"] += len(contracts)
+
+        columns, strings = self.columns, self.strings
+        rows = []
+        for contract, rank in zip(contracts, ranks):
+            row = len(self)
+            columns["address"].append(strings.intern(contract['address']))
+            columns["name"].append(strings.intern(contract['name']))
+            columns["symbol"].append(strings.intern(contract['symbol']))
+            columns["created_at"].append(_to_timestamp(contract.get('created_at')))
+            columns["chain"].append(self._chain_id(contract.get('blockchain', 'ethereum')))
+            columns["rank"].append(rank)
+
+            if self._address_rows is not None:
+                self._address_rows[contract['address']] = row
+            rows.append(row)
+
+        if contracts:
+            self.meta["last_updated"] = datetime.now().isoformat()
+        return rows
+
+    def flush(self):
+        """Write new rows and strings, then commit them by replacing meta.json"""
+        if self.readonly:
+            raise ValueError("Registry was opened read-only")
+
+        self.strings.flush()
+        for name, column in self.columns.items():
+            _write_at(self.directory / f"{name}.col", self._flushed_rows * column.itemsize,
+                      column[self._flushed_rows:].tobytes())
+        self._flushed_rows = len(self)
+
+        self.meta.update(rows=len(self), strings=len(self.strings), string_bytes=self.strings.size)
+        meta_path = self.directory / META_FILE
+        tmp_path = meta_path.with_suffix(".json.tmp")
+        with open(tmp_path, 'w') as f:
+            json.dump(self.meta, f)
+        os.replace(tmp_path, meta_path)
+
+    def reload(self):
+        """Load rows the writer committed since this read-only registry was opened
+
+        Returns the new row numbers, in the order they were committed. Costs a
+        single stat while meta.json is unchanged.
+        """
+        if not self.readonly:
+            raise ValueError("Only a read-only registry reloads")
+
+        # Stat before reading, so a commit racing this reload is seen next time
+        version = self._meta_stat()
+        if version == self._meta_version:
+            return []
+        meta = self._load_meta()
+
+        start, rows = len(self), meta["rows"]
+        if rows < start:
+            raise ValueError(f"Registry {self.directory} shrank from {start} to {rows} rows")
+        new_columns = {
+            name: _load_column(self.directory / f"{name}.col", typecode, rows, start=start)
+            for name, typecode in COLUMNS.items()
+        }
+        self.strings.reload(meta["strings"], meta["string_bytes"])
+        for name, column in new_columns.items():
+            self.columns[name].extend(column)
+        self.meta = meta
+        self._meta_version = version
+        self._flushed_rows = rows
+
+        new_rows = range(start, rows)
+        if self._address_rows is not None:
+            addresses = self.columns["address"]
+            self._address_rows.update((self.strings.get(addresses[row]), row) for row in new_rows)
+        return list(new_rows)
+
+    def import_contracts(self, contracts, last_block=None):
+        """Bulk-load contracts listed newest first, skipping known addresses"""
+        new_contracts = []
+        seen = set()
+        for contract in contracts:
+            address = contract.get('address')
+            if address and address not in seen and address not in self:
+                seen.add(address)
+                new_contracts.append(contract)
+        self.append(new_contracts)
+        if last_block is not None:
+            self.last_block = last_block
+        self.flush()
+        return len(new_contracts)
+
+    def row_for_address(self, address):
+        if self._address_rows is None:
+            addresses = self.columns["address"]
+            self._address_rows = {self.strings.get(addresses[row]): row for row in range(len(self))}
+        return self._address_rows.get(address)
+
+    def name(self, row):
+        return self.strings.get(self.columns["name"][row])
+
+    def symbol(self, row):
+        return self.strings.get(self.columns["symbol"][row])
+
+    def record(self, row):
+        """Contract dict for a row"""
+        columns = self.columns
+        return {
+            'address': self.strings.get(columns["address"][row]),
+            'name': self.strings.get(columns["name"][row]),
+            'symbol': self.strings.get(columns["symbol"][row]),
+            'created_at': _from_timestamp(columns["created_at"][row]),
+            'blockchain': self.meta["chains"][columns["chain"][row]]
+        }
+
+    def rows(self, since=None):
+        """Row numbers in registry order, optionally only contracts created since a datetime"""
+        if since is None:
+            rows = range(len(self))
+        else:
+            # Filtered on the timestamp column, without decoding any strings
+            cutoff = since.timestamp()
+            created_at = self.columns["created_at"]
+            rows = [row for row in range(len(self)) if created_at[row] >= cutoff]
+        return sorted(rows, key=self.columns["rank"].__getitem__)
+
+    def iter_contracts(self, since=None):
+        """Yield contract dicts in registry order"""
+        for row in self.rows(since):
+            yield self.record(row)
+
+    def index_entries(self, rows):
+        """Yield (row, name, symbol) for building a ContractMatchIndex"""
+        for row in rows:
+            yield row, self.name(row), self.symbol(row)
+
+    def stats(self):
+        """Report registry size"""
+        return {
+            "contracts": len(self),
+            "strings": len(self.strings),
+            "string_bytes": self.strings.size,
+            "column_bytes": sum(len(column) * column.itemsize for column in self.columns.values()),
+            "chains": list(self.meta["chains"])
+        }
+
+    def close(self):
+        self.strings.close()
+        if self._writer_lock is not None:
+            self._writer_lock.close()
+            self._writer_lock = None
+
+
+class ShardedContractRegistry:
+    """One ContractRegistry per chain under a common directory"""
+
+    def __init__(self, directory=CONTRACT_REGISTRY_DIR, readonly=False, chains=DEFAULT_CHAINS):
+        """Open the chain shards in directory, creating the given chains unless readonly"""
+        self.directory = Path(directory)
+        self.readonly = readonly
+        self.shards = {}
+
+        if not readonly:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            with self._commit_lock(fcntl.LOCK_EX):
+                self._migrate_flat_registry()
+
+        with self._commit_lock(fcntl.LOCK_SH):
+            existing = self._existing_chains()
+            try:
+                for chain in (existing if readonly else list(dict.fromkeys(list(chains) + existing))):
+                    self.shards[chain] = ContractRegistry(self.directory / chain, readonly=readonly)
+            except (ValueError, OSError):
+                # Release the writer locks already taken
+                self.close()
+                raise
+
+    @contextmanager
+    def _commit_lock(self, operation):
+        """Hold commit.lock: exclusive while committing shards, shared while loading them"""
+        lock_path = self.directory / COMMIT_LOCK_FILE
+        if self.readonly and not lock_path.exists():
+            # Nothing has been written here yet, or only by a writer without the lock
+            yield
+            return
+        f = _lock_file(lock_path, operation)
+        try:
+            yield
+        finally:
+            f.close()
+
+    def _existing_chains(self):
+        if not self.directory.exists():
+            return []
+        return sorted(
+            p.name for p in self.directory.iterdir()
+            if (p / META_FILE).exists() and not p.name.endswith(".migrated")
+        )
+
+    def _migrate_flat_registry(self):
+        """Split a single-directory registry from before sharding into chain shards"""
+        meta_path = self.directory / META_FILE
+        if not meta_path.exists():
+            return
+
+        flat = ContractRegistry(self.directory, readonly=True)
+        try:
+            by_chain = {}
+            for contract in flat.iter_contracts():
+                by_chain.setdefault(contract['blockchain'], []).append(contract)
+
+            # The Ethereum shard takes the sync watermark even if it gets no rows
+            chains = set(by_chain) | ({"ethereum"} if flat.last_block is not None else set())
+            for chain in chains:
+                shard = ContractRegistry(self.directory / chain)
+                shard.import_contracts(by_chain.get(chain, []),
+                                       last_block=flat.last_block if chain == "ethereum" else None)
+                shard.meta["cursors"].update(flat.meta["cursors"])
+                shard.flush()
+                shard.close()
+        finally:
+            flat.close()
+        logger.info(f"Split {len(flat)} contracts under {self.directory} into {len(chains)} chain shards")
+
+        # Keep the flat files around, out of the way of the shards
+        migrated_dir = self.directory / "flat.migrated"
+        migrated_dir.mkdir(exist_ok=True)
+        for name in [META_FILE, STRINGS_FILE, STRING_ENDS_FILE] + [f"{column}.col" for column in COLUMNS]:
+            if (self.directory / name).exists():
+                shutil.move(str(self.directory / name), str(migrated_dir / name))
+
+    def __len__(self):
+        return sum(len(shard) for shard in self.shards.values())
+
+    def __contains__(self, address):
+        return any(address in shard for shard in self.shards.values())
+
+    @property
+    def chains(self):
+        return list(self.shards)
+
+    def shard(self, chain):
+        """The registry for a chain, created on first use"""
+        shard = self.shards.get(chain)
+        if shard is None:
+            if self.readonly:
+                raise KeyError(f"No {chain} shard in read-only registry {self.directory}")
+            shard = self.shards[chain] = ContractRegistry(self.directory / chain)
+        return shard
+
+    def flush(self, chains=None):
+        """Commit the given chains' shards (by default all of them) as one step for readers"""
+        if self.readonly:
+            raise ValueError("Registry was opened read-only")
+        with self._commit_lock(fcntl.LOCK_EX):
+            for chain in (chains or self.chains):
+                self.shards[chain].flush()
+
+    def reload(self):
+        """Load what the writer committed since this read-only registry was opened
+
+        Opens shards created since, and returns {chain: new row numbers} for
+        every shard that gained rows.
+        """
+        if not self.readonly:
+            raise ValueError("Only a read-only registry reloads")
+
+        new_rows = {}
+        with self._commit_lock(fcntl.LOCK_SH):
+            for chain in self._existing_chains():
+                shard = self.shards.get(chain)
+                if shard is None:
+                    shard = self.shards[chain] = ContractRegistry(self.directory / chain, readonly=True)
+                    rows = list(range(len(shard)))
+                else:
+                    rows = shard.reload()
+                if rows:
+                    new_rows[chain] = rows
+        return new_rows
+
+    def import_contracts(self, contracts, last_block=None):
+        """Bulk-load contracts listed newest first into their chain shards"""
+        by_chain = {}
+        for contract in contracts:
+            by_chain.setdefault(contract.get('blockchain', 'ethereum'), []).append(contract)
+        imported = 0
+        with self._commit_lock(fcntl.LOCK_EX):
+            for chain, chain_contracts in by_chain.items():
+                imported += self.shard(chain).import_contracts(
+                    chain_contracts, last_block=last_block if chain == "ethereum" else None
+                )
+        return imported
+
+    def iter_contracts(self, since=None, chains=None):
+        """Yield contract dicts shard by shard, each in registry order"""
+        for chain in (chains or self.chains):
+            if chain in self.shards:
+                yield from self.shards[chain].iter_contracts(since=since)
+
+    def stats(self):
+        """Report the size of every shard"""
+        return {chain: shard.stats() for chain, shard in self.shards.items()}
+
+    def close(self):
+        for shard in self.shards.values():
+            shard.close()
+
+
+# For testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        registry = ContractRegistry(tmp_dir)
+        registry.append([
+            {"address": "0x1", "name": "DogeCoin", "symbol": "DOGE", "created_at": "2024-01-01T00:00:00"},
+            {"address": "0x2", "name": "Pepe", "symbol": "PEPE", "created_at": "2024-01-02T00:00:00"},
+        ])
+        registry.append([{"address": "0x3", "name": "Pepe", "symbol": "PEPE2", "blockchain": "solana"}], prepend=True)
+        registry.last_block = 19000000
+        registry.flush()
+
+        reader = ContractRegistry(tmp_dir, readonly=True)
+        registry.append([{"address": "0x4", "name": "Bonk", "symbol": "BONK", "blockchain": "solana"}], prepend=True)
+        registry.flush()
+        print(f"Reloaded rows: {reader.reload()}")
+        for contract in reader.iter_contracts():
+            print(f"- {contract}")
+        print(f"0x2 known: {'0x2' in reader}, stats: {reader.stats()}")
+        reader.close()
+        registry.close()
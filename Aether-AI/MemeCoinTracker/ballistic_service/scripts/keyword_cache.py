@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Keyword Cache - Bounded LRU cache of extracted keywords keyed by content hash
+"""
+
+import sys
+import json
+import time
+import logging
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from collections import OrderedDict
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+# Configure logging
+logger = logging.getLogger("keyword_cache")
+
+
+def nlp_model_version(nlp):
+    """Identify an NLP pipeline so cached results from other models are ignored"""
+    meta = getattr(nlp, "meta", {}) or {}
+    pipes = ",".join(getattr(nlp, "pipe_names", []))
+    return f"{meta.get('lang', '')}_{meta.get('name', '')}-{meta.get('version', '')}[{pipes}]"
+
+
+class KeywordCache:
+    """LRU cache of keyword lists, optionally persisted to SQLite"""
+
+    def __init__(self, max_entries=10000, model_version="", db_path=None, max_disk_entries=None):
+        """Initialize the cache, opening the SQLite backing store if db_path is given"""
+        self.max_entries = max_entries
+        self.model_version = model_version
+        self.max_disk_entries = max_disk_entries or max_entries * 10
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_prune = 0
+
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self._conn = None
+        if db_path:
+            self._init_db(db_path)
+
+        logger.info(f"KeywordCache initialized (max {max_entries} entries, persistent: {bool(self._conn)})")
+
+    def _init_db(self, db_path):
+        """Open the SQLite backing store"""
+        try:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute('''
+            CREATE TABLE IF NOT EXISTS keyword_cache (
+                key TEXT PRIMARY KEY,
+                keywords TEXT NOT NULL,
+                last_used REAL NOT NULL
+            )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_keyword_cache_last_used ON keyword_cache (last_used)")
+            self._conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"Error opening keyword cache database: {str(e)}")
+            self._conn = None
+
+    def key(self, text):
+        """Hash of the model version and the whitespace-normalized text"""
+        normalized = " ".join(text.split())
+        return hashlib.sha1(f"{self.model_version}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def get(self, text):
+        """Return the cached keywords for text, or None on a miss"""
+        key = self.key(text)
+
+        with self._lock:
+            keywords = self._entries.get(key)
+            if keywords is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return list(keywords)
+
+            keywords = self._load(key)
+            if keywords is not None:
+                self._remember(key, keywords)
+                self.disk_hits += 1
+                return list(keywords)
+
+            self.misses += 1
+            return None
+
+    def put(self, text, keywords):
+        """Cache the keywords extracted from text"""
+        key = self.key(text)
+
+        with self._lock:
+            self._remember(key, list(keywords))
+            self._store(key, keywords)
+
+    def _remember(self, key, keywords):
+        self._entries[key] = keywords
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _load(self, key):
+        if not self._conn:
+            return None
+
+        try:
+            row = self._conn.execute("SELECT keywords FROM keyword_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE keyword_cache SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._conn.commit()
+            return json.loads(row[0])
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            logger.error(f"Error reading keyword cache: {str(e)}")
+            return None
+
+    def _store(self, key, keywords):
+        if not self._conn:
+            return
+
+        try:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO keyword_cache (key, keywords, last_used) VALUES (?, ?, ?)",
+                (key, json.dumps(keywords), time.time())
+            )
+            self._conn.commit()
+
+            self._puts_since_prune += 1
+            if self._puts_since_prune >= 1000:
+                self._prune()
+        except sqlite3.Error as e:
+            logger.error(f"Error writing keyword cache: {str(e)}")
+
+    def _prune(self):
+        """Drop the least recently used rows beyond max_disk_entries"""
+        self._puts_since_prune = 0
+        self._conn.execute('''
+            DELETE FROM keyword_cache WHERE key IN (
+                SELECT key FROM keyword_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.max_disk_entries,))
+        self._conn.commit()
+
+    def stats(self):
+        """Report cache size and hit/miss counters"""
+        lookups = self.hits + self.disk_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            "model_version": self.model_version
+        }
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    cache = KeywordCache(max_entries=2, model_version="test", db_path=":memory:")
+    cache.put("Doge to the moon", ["doge", "moon"])
+    cache.put("Pepe  rising", ["pepe"])
+    cache.put("Wojak crying", ["wojak"])
+
+    print(f"Lookup 'Pepe rising': {cache.get('Pepe rising')}")
+    print(f"Lookup 'Doge to the moon' (evicted from memory): {cache.get('Doge to the moon')}")
+    print(f"Lookup 'unknown': {cache.get('unknown')}")
+    print(f"Stats: {cache.stats()}")
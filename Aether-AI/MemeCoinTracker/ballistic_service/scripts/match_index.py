@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+Match Index - Keyword lookup over contract names and symbols
+
+Keeps an exact-match hash map and a trigram inverted index over the lowercased
+name and symbol of every contract. A keyword of three or more characters is
+looked up through the rarest of its trigrams, and each candidate is verified
+with a real substring test, so results are identical to scanning every
+contract. Shorter keywords fall back to a linear scan, shared by every
+keyword in a batch.
+
+An optional fuzzy mode catches near-miss names and tickers ("p3pe",
+"peepe" for "pepe"). It indexes the distinct leet-folded words of names and
+symbols by padded trigram, draws candidates only from a keyword's rarest
+trigrams (the prefix filter for a Jaccard threshold), verifies at most the
+candidates sharing the most of those trigrams, and ranks survivors by
+bounded edit distance. The fuzzy index is
+built on first use.
+"""
+
+import re
+import sys
+import math
+import logging
+from array import array
+from collections import Counter
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+# Configure logging
+logger = logging.getLogger("match_index")
+
+NGRAM = 3
+
+# Fuzzy matching
+FUZZY_MIN_KEYWORD_LENGTH = 4  # shorter keywords only match exactly
+FUZZY_MIN_SIMILARITY = 0.4  # Jaccard similarity of padded trigram sets
+FUZZY_MAX_EDITS = 2  # edit distance beyond which a near miss is dropped
+FUZZY_MAX_CANDIDATES = 500  # words verified per keyword at most, those sharing the most of its rarest trigrams
+FUZZY_SCORE_SCALE = 0.9  # a fuzzy match never scores like an exact one
+
+# Digits and symbols commonly swapped in for letters, folded before fuzzy comparison
+LEET_TABLE = str.maketrans("013457$@", "oieastsa")
+_WORD_SPLIT = re.compile(r"[^0-9a-z$@]+")
+
+
+def _trigrams(text):
+    return {text[i:i + NGRAM] for i in range(len(text) - NGRAM + 1)}
+
+
+def _padded_trigrams(word):
+    """Trigrams of a word padded so its start and end count too"""
+    return _trigrams(f"  {word} ")
+
+
+def fold_leet(text):
+    """Lowercase text and map look-alike digits and symbols to letters"""
+    return text.lower().translate(LEET_TABLE)
+
+
+def edit_distance(a, b, max_distance):
+    """Levenshtein distance between a and b, or None if it exceeds max_distance"""
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > max_distance:
+            return None
+        previous = current
+
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class _FuzzyIndex:
+    """Padded-trigram index over the distinct leet-folded words of names and symbols"""
+
+    def __init__(self):
+        self.words = []
+        self.word_ids = {}
+        self.gram_counts = array('H')
+        # Per word: contract_id << 1 | 1 if the word is the contract's symbol
+        self.word_contracts = []
+        self.postings = {}
+
+    def add(self, contract_id, name_lower, symbol_lower):
+        fields = [(word, 0) for word in _WORD_SPLIT.split(name_lower)]
+        fields.append((symbol_lower, 1))
+
+        seen = set()
+        for word, is_symbol in fields:
+            word = word.translate(LEET_TABLE)
+            if len(word) < NGRAM or (word, is_symbol) in seen:
+                continue
+            seen.add((word, is_symbol))
+
+            word_id = self.word_ids.get(word)
+            if word_id is None:
+                word_id = self.word_ids[word] = len(self.words)
+                grams = _padded_trigrams(word)
+                self.words.append(word)
+                self.gram_counts.append(len(grams))
+                self.word_contracts.append(array('I'))
+                for gram in grams:
+                    self.postings.setdefault(gram, array('I')).append(word_id)
+            self.word_contracts[word_id].append(contract_id << 1 | is_symbol)
+
+    def similar_words(self, query, min_similarity, max_candidates, max_length_difference):
+        """Return (word id, Jaccard similarity) for words at least min_similarity from query
+
+        Words whose length differs from the query's by more than
+        max_length_difference are skipped without being verified.
+        """
+        query_grams = _padded_trigrams(query)
+        # A word this similar shares at least `needed` grams, so it must hold
+        # one of the len - needed + 1 rarest grams of the query
+        needed = math.ceil(min_similarity * len(query_grams))
+        postings = sorted((self.postings.get(gram, ()) for gram in query_grams), key=len)
+
+        # Past the cap, keep the candidates sharing the most of those grams
+        shared = Counter()
+        for word_ids in postings[:len(query_grams) - needed + 1]:
+            shared.update(word_ids)
+        if len(shared) > max_candidates:
+            candidates = [word_id for word_id, _ in shared.most_common(max_candidates)]
+        else:
+            candidates = shared
+
+        similar = []
+        words, gram_counts = self.words, self.gram_counts
+        for word_id in candidates:
+            word = words[word_id]
+            if abs(len(word) - len(query)) > max_length_difference:
+                continue
+            # Substring tests on the padded word are cheaper than building its trigram set
+            padded = f"  {word} "
+            overlap = sum(1 for gram in query_grams if gram in padded)
+            similarity = overlap / (len(query_grams) + gram_counts[word_id] - overlap)
+            if similarity >= min_similarity:
+                similar.append((word_id, similarity))
+        return similar
+
+    def stats(self):
+        return {"words": len(self.words), "trigrams": len(self.postings)}
+
+
+def score_match(keyword, name_lower, symbol_lower):
+    """Score a keyword that occurs in a contract's name or symbol
+
+    Exact matches score 1.0. Partial matches score 0.8 times the larger
+    keyword-to-field length ratio. Returns (score, "name" or "symbol").
+    """
+    if keyword == name_lower or keyword == symbol_lower:
+        score = 1.0
+    else:
+        name_ratio = len(keyword) / len(name_lower) if name_lower else 0
+        symbol_ratio = len(keyword) / len(symbol_lower) if symbol_lower else 0
+        score = max(name_ratio, symbol_ratio) * 0.8  # Scale down partial matches
+
+    return score, 'name' if keyword in name_lower else 'symbol'
+
+
+class ContractMatchIndex:
+    """Incrementally updated keyword index over a list of contracts"""
+
+    def __init__(self, contracts=(), record=None):
+        """Initialize the index with contracts in registry order
+
+        With record given, the index holds registry row numbers (added with
+        add_entries) instead of contract dicts, and calls record(row) to
+        build the contract dict of each match.
+        """
+        self.record = record
+        self.contracts = array('I') if record else []
+        self.names = []
+        self.symbols = []
+        # Position of each contract in the registry list; prepended contracts get lower ranks
+        self.ranks = array('q')
+        self._first_rank = 0
+        self._next_rank = 0
+
+        self.exact = {}
+        self.postings = {}
+        # Built by the first fuzzy lookup, then kept up to date
+        self._fuzzy = None
+
+        self.add_contracts(contracts)
+
+    def __len__(self):
+        return len(self.contracts)
+
+    def add_contracts(self, contracts, prepend=False):
+        """Index contracts appended to (or, with prepend, inserted at the front of) the registry"""
+        self.add_entries(((contract, contract['name'], contract['symbol']) for contract in contracts), prepend)
+
+    def add_entries(self, entries, prepend=False):
+        """Index (contract, name, symbol) entries, like add_contracts"""
+        entries = list(entries)
+        if prepend:
+            self._first_rank -= len(entries)
+            ranks = range(self._first_rank, self._first_rank + len(entries))
+        else:
+            ranks = range(self._next_rank, self._next_rank + len(entries))
+            self._next_rank += len(entries)
+
+        for (contract, name, symbol), rank in zip(entries, ranks):
+            contract_id = len(self.contracts)
+            # Many tokens share a name or symbol; keep one copy of each
+            name_lower = sys.intern(name.lower())
+            symbol_lower = sys.intern(symbol.lower())
+
+            self.contracts.append(contract)
+            self.names.append(name_lower)
+            self.symbols.append(symbol_lower)
+            self.ranks.append(rank)
+
+            self.exact.setdefault(name_lower, array('I')).append(contract_id)
+            if symbol_lower != name_lower:
+                self.exact.setdefault(symbol_lower, array('I')).append(contract_id)
+
+            for gram in _trigrams(name_lower) | _trigrams(symbol_lower):
+                postings = self.postings.get(gram)
+                if postings is None:
+                    postings = self.postings[gram] = array('I')
+                postings.append(contract_id)
+
+            if self._fuzzy is not None:
+                self._fuzzy.add(contract_id, name_lower, symbol_lower)
+
+    def _fuzzy_index(self):
+        if self._fuzzy is None:
+            self._fuzzy = _FuzzyIndex()
+            for contract_id, (name_lower, symbol_lower) in enumerate(zip(self.names, self.symbols)):
+                self._fuzzy.add(contract_id, name_lower, symbol_lower)
+            logger.info(f"Built fuzzy match index: {self._fuzzy.stats()}")
+        return self._fuzzy
+
+    def _candidates(self, keyword):
+        """Contract ids that may contain keyword (a superset of the true hits)"""
+        if len(keyword) < NGRAM:
+            return range(len(self.contracts))
+
+        rarest = None
+        for gram in _trigrams(keyword):
+            postings = self.postings.get(gram)
+            if postings is None:
+                return ()
+            if rarest is None or len(postings) < len(rarest):
+                rarest = postings
+        return rarest
+
+    def lookup(self, keyword):
+        """Return the ids of contracts whose name or symbol contains keyword"""
+        # Whole-name and whole-symbol hits need no substring verification
+        exact = self.exact.get(keyword, ())
+        hits = list(exact)
+
+        exact = set(exact)
+        names, symbols = self.names, self.symbols
+        for contract_id in self._candidates(keyword):
+            if contract_id in exact:
+                continue
+            if keyword in names[contract_id] or keyword in symbols[contract_id]:
+                hits.append(contract_id)
+        return hits
+
+    def lookup_many(self, keywords):
+        """Return {keyword: contract ids} for many keywords in one batch
+
+        Each distinct keyword is looked up once. Keywords too short for the
+        trigram index share a single linear pass over the registry instead
+        of one pass each.
+        """
+        hits = {}
+        short = []
+        for keyword in keywords:
+            if keyword in hits:
+                continue
+            if len(keyword) < NGRAM:
+                hits[keyword] = []
+                short.append(keyword)
+            else:
+                hits[keyword] = self.lookup(keyword)
+
+        if short:
+            for contract_id, (name, symbol) in enumerate(zip(self.names, self.symbols)):
+                for keyword in short:
+                    if keyword in name or keyword in symbol:
+                        hits[keyword].append(contract_id)
+        return hits
+
+    def fuzzy_lookup(self, keyword):
+        """Return {contract id: (score, match type)} for near misses of keyword
+
+        Scores are FUZZY_SCORE_SCALE times one minus the edit distance
+        relative to the longer word, so "p3pe" for "pepe" scores 0.9 and
+        "peepe" 0.72. Match types are "fuzzy_name" or "fuzzy_symbol".
+        """
+        if len(keyword) < FUZZY_MIN_KEYWORD_LENGTH:
+            return {}
+
+        query = fold_leet(keyword)
+        fuzzy = self._fuzzy_index()
+        results = {}
+        for word_id, _ in fuzzy.similar_words(query, FUZZY_MIN_SIMILARITY, FUZZY_MAX_CANDIDATES, FUZZY_MAX_EDITS):
+            word = fuzzy.words[word_id]
+            distance = edit_distance(query, word, FUZZY_MAX_EDITS)
+            if distance is None:
+                continue
+
+            score = FUZZY_SCORE_SCALE * (1 - distance / max(len(query), len(word)))
+            for entry in fuzzy.word_contracts[word_id]:
+                contract_id = entry >> 1
+                if contract_id not in results or score > results[contract_id][0]:
+                    results[contract_id] = (score, 'fuzzy_symbol' if entry & 1 else 'fuzzy_name')
+        return results
+
+    def find_matches(self, keywords, min_score=0.0, fuzzy=False):
+        """Find contracts matching any keyword, scored like a scan of the registry
+
+        Each contract is credited to the first keyword, in keyword order,
+        that it contains with at least min_score. With fuzzy set, contracts
+        no keyword contains are then credited to the first keyword they
+        nearly match. Matches are sorted by score, highest first, with ties
+        kept in registry order.
+        """
+        return self.find_matches_many([keywords], min_score, fuzzy)[0]
+
+    def find_matches_many(self, keyword_sets, min_score=0.0, fuzzy=False):
+        """Run find_matches for many keyword sets, sharing lookups between them
+
+        Returns one match list per keyword set, in the same order.
+        """
+        keyword_sets = [[kw.lower() for kw in keywords] for keywords in keyword_sets]
+        hits = self.lookup_many(kw for keywords in keyword_sets for kw in keywords)
+
+        fuzzy_hits = {}
+        if fuzzy:
+            for keyword in hits:
+                fuzzy_hits[keyword] = self.fuzzy_lookup(keyword)
+
+        return [self._collect_matches(keywords, hits, min_score, fuzzy_hits) for keywords in keyword_sets]
+
+    def _collect_matches(self, keywords, hits, min_score, fuzzy_hits):
+        """Score and order the matches of one keyword set from shared lookup results"""
+        matched = {}
+        for keyword in keywords:
+            for contract_id in hits[keyword]:
+                if contract_id in matched:
+                    continue
+                score, match_type = score_match(keyword, self.names[contract_id], self.symbols[contract_id])
+                if score >= min_score:
+                    matched[contract_id] = (keyword, score, match_type)
+
+        # Near misses only for contracts no keyword matched exactly
+        for keyword in keywords if fuzzy_hits else ():
+            for contract_id, (score, match_type) in fuzzy_hits[keyword].items():
+                if contract_id not in matched and score >= min_score:
+                    matched[contract_id] = (keyword, score, match_type)
+
+        matches = []
+        for contract_id, (keyword, score, match_type) in matched.items():
+            contract = self.contracts[contract_id]
+            if self.record:
+                contract = self.record(contract)
+            matches.append((-score, self.ranks[contract_id], {
+                **contract,  # Include all contract fields
+                'match_keyword': keyword,
+                'match_score': score,
+                'match_type': match_type
+            }))
+
+        matches.sort(key=lambda item: item[:2])
+        return [match for _, _, match in matches]
+
+    def stats(self):
+        """Report index size"""
+        return {
+            "contracts": len(self.contracts),
+            "exact_keys": len(self.exact),
+            "trigrams": len(self.postings),
+            "postings": sum(len(postings) for postings in self.postings.values()),
+            "fuzzy": self._fuzzy.stats() if self._fuzzy is not None else None
+        }
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    index = ContractMatchIndex([
+        {"address": "0x1", "name": "DogeCoin", "symbol": "DOGE"},
+        {"address": "0x2", "name": "Pepe", "symbol": "PEPE"},
+    ])
+    index.add_contracts([{"address": "0x3", "name": "Doge Killer", "symbol": "LEASH"}], prepend=True)
+    index.add_contracts([
+        {"address": "0x4", "name": "P3PE", "symbol": "P3PE"},
+        {"address": "0x5", "name": "Peepe Inu", "symbol": "PEEPE"},
+    ])
+
+    for keywords, matches in zip([["doge", "pepe", "sh"], ["leash"]],
+                                 index.find_matches_many([["doge", "pepe", "sh"], ["leash"]])):
+        print(f"{keywords}:")
+        for match in matches:
+            print(f"- {match['name']} ({match['symbol']}): {match['match_score']:.2f} via {match['match_type']}")
+    print("['pepe'] with fuzzy matching:")
+    for match in index.find_matches(["pepe"], fuzzy=True):
+        print(f"- {match['name']} ({match['symbol']}): {match['match_score']:.2f} via {match['match_type']}")
+    print(f"Stats: {index.stats()}")
@@ -9,7 +9,7 @@ import json
 import logging
 import re
 import time
-import random
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 from datetime import datetime, timedelta
 import praw
@@ -22,12 +22,95 @@ sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent))
 from config import (
     REDDIT_CLIENT_ID, REDDIT_CLIENT_SECRET, REDDIT_USER_AGENT,
     TWITTER_API_KEY, TWITTER_API_SECRET, TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET,
-    MEME_SOURCES
+    MEME_SOURCES, MEME_STORE_DIR, NLP_BATCH_SIZE, NLP_N_PROCESS,
+    SCAN_CONCURRENT, SCAN_MAX_WORKERS, SCAN_SOURCE_TIMEOUT, SCAN_REQUEST_TIMEOUT,
+    SCAN_PAGE_SIZE, SCAN_MAX_BACKFILL_PAGES
 )
+from ballistic_service.scripts.seen_index import SeenIndex
+from ballistic_service.scripts.meme_store import MemeStore
+from ballistic_service.scripts.source_cursors import SourceCursors, source_key
+from ballistic_service.scripts.replay_source import ReplayRedditClient, ReplayTwitterClient
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("meme_scanner")
 
+# Pipeline components the keyword extractor never reads (it only uses NER and POS tags)
+UNUSED_NLP_COMPONENTS = ["parser", "lemmatizer"]
+
+
+def load_nlp():
+    """Load the spaCy pipeline used for keyword extraction"""
+    try:
+        # Try to load a more comprehensive model if available
+        nlp = spacy.load("en_core_web_sm", disable=UNUSED_NLP_COMPONENTS)
+        logger.info(f"Loaded spaCy en_core_web_sm model with components {nlp.pipe_names}")
+    except OSError:
+        # Fall back to basic English tokenizer
+        nlp = English()
+        logger.warning("Using basic English tokenizer - for better results install en_core_web_sm")
+    
+    return nlp
+
+
+def create_reddit_client():
+    """Create the Reddit API client"""
+    return praw.Reddit(
+        client_id=REDDIT_CLIENT_ID,
+        client_secret=REDDIT_CLIENT_SECRET,
+        user_agent=REDDIT_USER_AGENT,
+        timeout=SCAN_REQUEST_TIMEOUT
+    )
+
+
+def create_twitter_client():
+    """Create the Twitter API client"""
+    auth = tweepy.OAuthHandler(TWITTER_API_KEY, TWITTER_API_SECRET)
+    auth.set_access_token(TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET)
+    return tweepy.API(auth, timeout=SCAN_REQUEST_TIMEOUT)
+
+
+def _describe_source(source):
+    """Human-readable name of a meme source for log messages"""
+    if source["platform"] == "reddit":
+        return f"Reddit {source['subreddit']}"
+    return f"Twitter for {source.get('track')}"
+
+
+def meme_text(meme_data):
+    """Combine a meme's title and text for processing"""
+    text = ""
+    if "title" in meme_data:
+        text += meme_data["title"] + " "
+    if "text" in meme_data:
+        text += meme_data["text"]
+    return text
+
+
+def keywords_from_doc(doc, text):
+    """Extract relevant keywords from a processed spaCy doc"""
+    # Extract keywords (nouns, proper nouns, and hashtags)
+    keywords = []
+    
+    # Extract hashtags first
+    hashtags = re.findall(r'#(\w+)', text)
+    keywords.extend(hashtags)
+    
+    # Extract named entities if available
+    if hasattr(doc, "ents"):
+        for ent in doc.ents:
+            if ent.label_ in ("PERSON", "ORG", "PRODUCT", "WORK_OF_ART"):
+                keywords.append(ent.text.lower())
+    
+    # Extract nouns and proper nouns
+    for token in doc:
+        if token.pos_ in ("NOUN", "PROPN") and len(token.text) > 2:
+            keywords.append(token.text.lower())
+    
+    # Remove duplicates and normalize
+    return list(set(keywords))
+
+
 class MemeScanner:
     """Scanner for trending memes on social media platforms"""
     
@@ -36,30 +119,33 @@ class MemeScanner:
         self.init_reddit()
         self.init_twitter()
         
-        # Initialize NLP for keyword extraction
-        try:
-            # Try to load a more comprehensive model if available
-            self.nlp = spacy.load("en_core_web_sm")
-            logger.info("Loaded spaCy en_core_web_sm model")
-        except OSError:
-            # Fall back to basic English tokenizer
-            self.nlp = English()
-            logger.warning("Using basic English tokenizer - for better results install en_core_web_sm")
-        
-        # Load existing keyword data if available
+        # Worker pool for concurrent source fetching, created on first use
+        self._fetch_pool = None
+        # Source key -> fetch still running after its scan timed out
+        self._running_fetches = {}
+        
+        # Initialize NLP for keyword extraction (shared across the process)
+        self.nlp = get_resource("spacy_nlp")
+        self.keyword_cache = get_resource("keyword_cache")
+        
+        # Open the meme store, importing the legacy JSON file on first run
+        self.meme_store = MemeStore(MEME_STORE_DIR)
         self.meme_data_path = Path("ballistic_service/data/raw_memes.json")
-        self.meme_data = self._load_meme_data()
+        self._migrate_legacy_meme_data()
+        
+        # Index of stored meme ids for constant-time deduplication
+        self.seen_ids = SeenIndex(self.meme_data_path.with_suffix(".seen"))
+        self.seen_ids.load(self.meme_store.ids())
+        
+        # Per-source watermarks so each poll only fetches unseen items
+        self.cursors = SourceCursors("ballistic_service/data/source_cursors.json")
         
         logger.info("MemeScanner initialized")
     
     def init_reddit(self):
         """Initialize Reddit API client"""
         try:
-            self.reddit = praw.Reddit(
-                client_id=REDDIT_CLIENT_ID,
-                client_secret=REDDIT_CLIENT_SECRET,
-                user_agent=REDDIT_USER_AGENT
-            )
+            self.reddit = get_resource("reddit_client")
             logger.info("Reddit API client initialized")
         except Exception as e:
             self.reddit = None
@@ -68,172 +154,295 @@ class MemeScanner:
     def init_twitter(self):
         """Initialize Twitter API client"""
         try:
-            auth = tweepy.OAuthHandler(TWITTER_API_KEY, TWITTER_API_SECRET)
-            auth.set_access_token(TWITTER_ACCESS_TOKEN, TWITTER_ACCESS_SECRET)
-            self.twitter = tweepy.API(auth)
+            self.twitter = get_resource("twitter_client")
             logger.info("Twitter API client initialized")
         except Exception as e:
             self.twitter = None
             logger.error(f"Failed to initialize Twitter API: {str(e)}")
     
-    def _load_meme_data(self):
-        """Load existing meme data from JSON file"""
-        if self.meme_data_path.exists():
-            try:
-                with open(self.meme_data_path, 'r') as f:
-                    return json.load(f)
-            except (json.JSONDecodeError, OSError) as e:
-                logger.error(f"Error loading meme data: {str(e)}")
-        
-        return {"memes": []}
+    def use_replay_feed(self, feed):
+        """Read Reddit and Twitter from a ReplayFeed instead of the live APIs"""
+        self.reddit = ReplayRedditClient(feed)
+        self.twitter = ReplayTwitterClient(feed)
+        logger.info(f"Scanning replayed feed of {len(feed)} items")
     
-    def _save_meme_data(self):
-        """Save meme data to JSON file"""
+    def _migrate_legacy_meme_data(self):
+        """Import memes from the legacy raw_memes.json file into the meme store"""
+        if not self.meme_data_path.exists():
+            return
+        
         try:
-            with open(self.meme_data_path, 'w') as f:
-                json.dump(self.meme_data, f, indent=2)
+            with open(self.meme_data_path, 'r') as f:
+                memes = json.load(f).get("memes", [])
+        except (json.JSONDecodeError, OSError) as e:
+            logger.error(f"Error loading legacy meme data: {str(e)}")
+            return
+        
+        if not memes:
+            return
+        
+        imported = self.meme_store.import_memes(memes)
+        logger.info(f"Imported {imported} memes from {self.meme_data_path}")
+        
+        # Keep the old file around, but make sure it is never imported twice
+        try:
+            self.meme_data_path.rename(self.meme_data_path.with_suffix(".json.migrated"))
         except OSError as e:
-            logger.error(f"Error saving meme data: {str(e)}")
+            logger.error(f"Error renaming legacy meme data: {str(e)}")
     
-    def scan_trending_memes(self):
-        """Scan social media platforms for trending memes"""
-        new_memes = []
+    def _fetch_reddit_source(self, source):
+        """Fetch posts newer than the source's watermark as meme records
         
-        # Scan Reddit for memes
-        if self.reddit:
-            for source in [s for s in MEME_SOURCES if s["platform"] == "reddit"]:
-                try:
-                    subreddit_name = source["subreddit"]
-                    subreddit = self.reddit.subreddit(subreddit_name)
-                    
-                    # Get hot posts from subreddit
-                    for post in subreddit.hot(limit=10):
-                        # Skip posts we've already processed
-                        if any(m["id"] == f"reddit-{post.id}" for m in self.meme_data["memes"]):
-                            continue
-                        
-                        meme_data = {
-                            "id": f"reddit-{post.id}",
-                            "platform": "reddit",
-                            "subreddit": subreddit_name,
-                            "title": post.title,
-                            "text": post.selftext if hasattr(post, "selftext") else "",
-                            "url": post.url,
-                            "score": post.score,
-                            "num_comments": post.num_comments,
-                            "created_utc": post.created_utc,
-                            "timestamp": datetime.now().isoformat(),
-                            "processed": False
-                        }
-                        
-                        new_memes.append(meme_data)
-                        self.meme_data["memes"].append(meme_data)
-                
-                except Exception as e:
-                    logger.error(f"Error scanning Reddit {source['subreddit']}: {str(e)}")
-        
-        # Scan Twitter for memes
-        if self.twitter:
-            for source in [s for s in MEME_SOURCES if s["platform"] == "twitter"]:
-                try:
-                    query = " OR ".join(source["track"])
-                    
-                    # Get recent tweets with the keywords
-                    tweets = self.twitter.search_tweets(q=query, count=20, result_type="popular")
-                    
-                    for tweet in tweets:
-                        # Skip tweets we've already processed
-                        if any(m["id"] == f"twitter-{tweet.id}" for m in self.meme_data["memes"]):
-                            continue
-                        
-                        meme_data = {
-                            "id": f"twitter-{tweet.id}",
-                            "platform": "twitter",
-                            "user": tweet.user.screen_name,
-                            "text": tweet.text,
-                            "favorite_count": tweet.favorite_count,
-                            "retweet_count": tweet.retweet_count,
-                            "created_at": tweet.created_at.isoformat(),
-                            "timestamp": datetime.now().isoformat(),
-                            "processed": False
-                        }
-                        
-                        new_memes.append(meme_data)
-                        self.meme_data["memes"].append(meme_data)
+        Returns the meme records, the fullname of the newest post seen and
+        the number of API requests made. Polls without a watermark take a single page of the `new` listing;
+        later polls page forward with `before` while pages come back full,
+        up to SCAN_MAX_BACKFILL_PAGES, so bursts are caught up on.
+        """
+        subreddit_name = source["subreddit"]
+        subreddit = self.reddit.subreddit(subreddit_name)
+        
+        cursor = self.cursors.get(source)
+        newest = cursor
+        posts = []
+        requests = 0
+        for _ in range(SCAN_MAX_BACKFILL_PAGES):
+            params = {"before": newest} if newest else {}
+            page = list(subreddit.new(limit=SCAN_PAGE_SIZE, params=params))
+            requests += 1
+            if page:
+                # Listings are newest first
+                newest = page[0].name
+                posts.extend(page)
+            if cursor is None or len(page) < SCAN_PAGE_SIZE:
+                break
+        
+        memes = []
+        for post in posts:
+            memes.append({
+                "id": f"reddit-{post.id}",
+                "platform": "reddit",
+                "subreddit": subreddit_name,
+                "title": post.title,
+                "text": post.selftext if hasattr(post, "selftext") else "",
+                "url": post.url,
+                "score": post.score,
+                "num_comments": post.num_comments,
+                "created_utc": post.created_utc,
+                "timestamp": datetime.now().isoformat(),
+                "processed": False
+            })
+        
+        return memes, newest, requests
+    
+    def _fetch_twitter_source(self, source):
+        """Fetch tweets newer than the source's since_id as meme records
+        
+        Returns the meme records, the highest tweet id seen and the number
+        of API requests made. When a page
+        comes back full, older pages down to the watermark are fetched with
+        max_id, up to SCAN_MAX_BACKFILL_PAGES.
+        """
+        query = " OR ".join(source["track"])
+        since_id = self.cursors.get(source)
+        
+        tweets = []
+        max_id = None
+        requests = 0
+        for _ in range(SCAN_MAX_BACKFILL_PAGES):
+            params = {}
+            if since_id:
+                params["since_id"] = since_id
+            if max_id:
+                params["max_id"] = max_id
+            
+            # Recent results are ordered by id, which since_id/max_id paging relies on
+            page = self.twitter.search_tweets(q=query, count=SCAN_PAGE_SIZE, result_type="recent", **params)
+            requests += 1
+            tweets.extend(page)
+            if since_id is None or len(page) < SCAN_PAGE_SIZE:
+                break
+            max_id = min(tweet.id for tweet in page) - 1
+        
+        memes = []
+        for tweet in tweets:
+            memes.append({
+                "id": f"twitter-{tweet.id}",
+                "platform": "twitter",
+                "user": tweet.user.screen_name,
+                "text": tweet.text,
+                "favorite_count": tweet.favorite_count,
+                "retweet_count": tweet.retweet_count,
+                "created_at": tweet.created_at.isoformat(),
+                "timestamp": datetime.now().isoformat(),
+                "processed": False
+            })
+        
+        newest = max((tweet.id for tweet in tweets), default=since_id)
+        return memes, newest, requests
+    
+    def _fetch_source(self, source):
+        """Fetch (meme records, new watermark, API requests) from a single configured source"""
+        if source["platform"] == "reddit":
+            return self._fetch_reddit_source(source)
+        if source["platform"] == "twitter":
+            return self._fetch_twitter_source(source)
+        return [], None, 0
+    
+    def active_sources(self):
+        """Return the configured sources whose platform client is available"""
+        clients = {"reddit": self.reddit, "twitter": self.twitter}
+        return [s for s in MEME_SOURCES if clients.get(s["platform"])]
+    
+    def _fetch_sequential(self, sources):
+        """Fetch sources one after another"""
+        results = []
+        for source in sources:
+            try:
+                results.append((source, *self._fetch_source(source)))
+            except Exception as e:
+                logger.error(f"Error scanning {_describe_source(source)}: {str(e)}")
+        return results
+    
+    def _fetch_concurrent(self, sources):
+        """Fetch sources in parallel on the bounded fetch pool
+        
+        Sources that fail or do not finish within SCAN_SOURCE_TIMEOUT are
+        logged and skipped, so one slow platform only costs its own results.
+        A timed-out fetch keeps its worker until its client request times
+        out (SCAN_REQUEST_TIMEOUT), and its source is not fetched again
+        until then, so stuck sources never pile up on the pool.
+        """
+        if self._fetch_pool is None:
+            self._fetch_pool = ThreadPoolExecutor(max_workers=SCAN_MAX_WORKERS, thread_name_prefix="meme-fetch")
+        
+        self._running_fetches = {key: future for key, future in self._running_fetches.items() if not future.done()}
+        futures = {}
+        for source in sources:
+            if source_key(source) in self._running_fetches:
+                logger.warning(f"Skipping {_describe_source(source)}: its previous fetch is still running")
+                continue
+            futures[self._fetch_pool.submit(self._fetch_source, source)] = source
+        if not futures:
+            return []
+        done, not_done = wait(futures, timeout=SCAN_SOURCE_TIMEOUT)
+        
+        results = []
+        for future in done:
+            try:
+                results.append((futures[future], *future.result()))
+            except Exception as e:
+                logger.error(f"Error scanning {_describe_source(futures[future])}: {str(e)}")
+        
+        for future in not_done:
+            # The worker keeps running in the background; its result is discarded
+            future.cancel()
+            self._running_fetches[source_key(futures[future])] = future
+            logger.warning(f"Timed out scanning {_describe_source(futures[future])} after {SCAN_SOURCE_TIMEOUT}s")
+        
+        return results
+    
+    def _merge_fetched(self, results):
+        """Store fetched meme records that have not been seen before
+        
+        Returns the new memes and, per source key, the number of new memes
+        and API requests. Watermarks only advance after their memes are
+        stored, so a crash mid-scan re-fetches rather than drops items.
+        """
+        new_memes = []
+        polls = {}
+        for source, memes, cursor, requests in results:
+            source_new = 0
+            for meme_data in memes:
+                # Skip memes we've already processed
+                if meme_data["id"] in self.seen_ids:
+                    continue
                 
-                except Exception as e:
-                    logger.error(f"Error scanning Twitter for {source['track']}: {str(e)}")
+                new_memes.append(meme_data)
+                self.meme_store.append(meme_data)
+                self.seen_ids.add(meme_data["id"])
+                source_new += 1
+            
+            self.cursors.advance(source, cursor)
+            polls[source_key(source)] = {"new": source_new, "requests": requests}
         
-        # Save the updated meme data
+        # Persist newly seen ids now that the memes themselves are stored
         if new_memes:
             logger.info(f"Found {len(new_memes)} new memes")
-            self._save_meme_data()
+            self.seen_ids.flush()
+        self.cursors.save()
+        
+        return new_memes, polls
+    
+    def scan_sources(self, sources, concurrent=SCAN_CONCURRENT):
+        """Poll the given sources, returning (new memes, per-source poll results)"""
+        if concurrent and len(sources) > 1:
+            results = self._fetch_concurrent(sources)
+        else:
+            results = self._fetch_sequential(sources)
         
+        return self._merge_fetched(results)
+    
+    def scan_trending_memes(self, concurrent=SCAN_CONCURRENT):
+        """Scan social media platforms for trending memes"""
+        new_memes, _ = self.scan_sources(self.active_sources(), concurrent)
         return new_memes
     
     def extract_keywords(self, meme_data):
         """Extract relevant keywords from meme data using NLP"""
-        # Combine title and text for processing
-        text = ""
-        if "title" in meme_data:
-            text += meme_data["title"] + " "
-        if "text" in meme_data:
-            text += meme_data["text"]
-        
-        # Process the text
-        doc = self.nlp(text)
-        
-        # Extract keywords (nouns, proper nouns, and hashtags)
-        keywords = []
-        
-        # Extract hashtags first
-        hashtags = re.findall(r'#(\w+)', text)
-        keywords.extend(hashtags)
-        
-        # Extract named entities if available
-        if hasattr(doc, "ents"):
-            for ent in doc.ents:
-                if ent.label_ in ("PERSON", "ORG", "PRODUCT", "WORK_OF_ART"):
-                    keywords.append(ent.text.lower())
-        
-        # Extract nouns and proper nouns
-        for token in doc:
-            if token.pos_ in ("NOUN", "PROPN") and len(token.text) > 2:
-                keywords.append(token.text.lower())
-        
-        # Remove duplicates and normalize
-        keywords = list(set(keywords))
-        
-        # Update the meme entry to mark it as processed
-        for i, meme in enumerate(self.meme_data["memes"]):
-            if meme["id"] == meme_data["id"]:
-                self.meme_data["memes"][i]["processed"] = True
-                self.meme_data["memes"][i]["keywords"] = keywords
-                break
+        text = meme_text(meme_data)
         
-        # Save the updated data
-        self._save_meme_data()
+        # Reposts and re-analysis of the same text skip the NLP pass
+        keywords = self.keyword_cache.get(text)
+        if keywords is None:
+            keywords = keywords_from_doc(self.nlp(text), text)
+            self.keyword_cache.put(text, keywords)
+        
+        # Record a small delta marking the meme as processed
+        self.meme_store.update(meme_data["id"], processed=True, keywords=keywords)
+        self.meme_store.maybe_compact()
         
         return keywords
     
+    def extract_keywords_batch(self, memes, batch_size=NLP_BATCH_SIZE, n_process=NLP_N_PROCESS):
+        """Extract keywords from many memes in one nlp.pipe pass
+        
+        Returns a list of keyword lists in the same order as memes. Texts
+        already in the keyword cache, or repeated within the batch, are not
+        sent through the pipeline again.
+        """
+        texts = [meme_text(meme) for meme in memes]
+        keyword_lists = [self.keyword_cache.get(text) for text in texts]
+        
+        # Group uncached memes by cache key so each distinct text is parsed once
+        pending = {}
+        for i, keywords in enumerate(keyword_lists):
+            if keywords is None:
+                pending.setdefault(self.keyword_cache.key(texts[i]), []).append(i)
+        
+        groups = list(pending.values())
+        docs = self.nlp.pipe((texts[group[0]] for group in groups), batch_size=batch_size, n_process=n_process)
+        for group, doc in zip(groups, docs):
+            keywords = keywords_from_doc(doc, texts[group[0]])
+            self.keyword_cache.put(texts[group[0]], keywords)
+            for i in group:
+                keyword_lists[i] = list(keywords)
+        
+        for meme, keywords in zip(memes, keyword_lists):
+            self.meme_store.update(meme["id"], processed=True, keywords=keywords)
+        
+        self.meme_store.maybe_compact()
+        
+        return keyword_lists
+    
     def clean_old_memes(self, days=7):
         """Clean memes older than specified days"""
-        if not self.meme_data or "memes" not in self.meme_data:
-            return
-        
         cutoff_date = datetime.now() - timedelta(days=days)
         
-        # Filter out old memes
-        original_count = len(self.meme_data["memes"])
-        self.meme_data["memes"] = [
-            meme for meme in self.meme_data["memes"]
-            if datetime.fromisoformat(meme["timestamp"]) > cutoff_date
-        ]
-        
-        removed_count = original_count - len(self.meme_data["memes"])
+        # Drop whole hourly partitions that have expired
+        removed_count = self.meme_store.drop_partitions_before(cutoff_date)
         if removed_count > 0:
             logger.info(f"Removed {removed_count} old memes")
-            self._save_meme_data()
+            self.seen_ids.rebuild(self.meme_store.ids())
 
 
 # For testing
@@ -243,9 +452,8 @@ if __name__ == "__main__":
     memes = scanner.scan_trending_memes()
     
     if memes:
-        for meme in memes:
+        for meme, keywords in zip(memes, scanner.extract_keywords_batch(memes)):
             print(f"Found meme: {meme['id']}")
-            keywords = scanner.extract_keywords(meme)
             print(f"Keywords: {keywords}\n")
     else:
         print("No new memes found")
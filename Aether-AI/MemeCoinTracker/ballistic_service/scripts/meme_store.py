@@ -0,0 +1,486 @@
+#!/usr/bin/env python3
+"""
+Meme Store - Log-structured, time-partitioned storage for scanned memes
+
+Memes are bucketed into hourly partitions by their scan timestamp. Each
+partition is a directory of append-only JSONL segments, where every line is
+one record: a full "put" of a meme, an "update" delta carrying only the
+changed fields, or a "delete" tombstone. Deltas and tombstones are written to
+the partition of the meme they refer to, so a partition is self-contained.
+
+An in-memory index maps each meme id to its partition and record locations.
+Retention drops whole partitions, range reads skip partitions outside the
+requested window, and compaction periodically rewrites a partition's live
+memes into fresh segments so deltas and tombstones do not pile up.
+
+A store has one writer: the Ballistic service's MemeStore. Other processes
+read it with iter_segment_memes, which tolerates the writer compacting or
+dropping a partition while it is being read.
+"""
+
+import os
+import sys
+import json
+import shutil
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+# Configure logging
+logger = logging.getLogger("meme_store")
+
+SEGMENT_PREFIX = "segment-"
+SEGMENT_SUFFIX = ".jsonl"
+PARTITION_FORMAT = "%Y-%m-%dT%H"
+PARTITION_SPAN = timedelta(hours=1)
+
+
+def partition_key(timestamp):
+    """Hourly partition key ("YYYY-MM-DDTHH") for an ISO-format timestamp"""
+    return timestamp[:13]
+
+
+def _partition_start(key):
+    return datetime.strptime(key, PARTITION_FORMAT)
+
+
+def _partition_keys(store_dir):
+    """List the partition keys present in a store directory, oldest first"""
+    keys = []
+    for path in Path(store_dir).iterdir() if Path(store_dir).exists() else []:
+        if not path.is_dir():
+            continue
+        try:
+            _partition_start(path.name)
+            keys.append(path.name)
+        except ValueError:
+            logger.warning(f"Ignoring unexpected directory in meme store: {path}")
+    return sorted(keys)
+
+
+def _partition_in_range(key, since=None, until=None):
+    """Check whether any part of a partition's hour falls inside [since, until)"""
+    start = _partition_start(key)
+    if since is not None and start + PARTITION_SPAN <= since:
+        return False
+    if until is not None and start >= until:
+        return False
+    return True
+
+
+def _segment_numbers(directory):
+    """List the segment numbers present in a directory, oldest first"""
+    numbers = []
+    for path in Path(directory).glob(f"{SEGMENT_PREFIX}*{SEGMENT_SUFFIX}"):
+        try:
+            numbers.append(int(path.name[len(SEGMENT_PREFIX):-len(SEGMENT_SUFFIX)]))
+        except ValueError:
+            logger.warning(f"Ignoring unexpected file in meme store: {path}")
+    return sorted(numbers)
+
+
+def _segment_path(directory, number):
+    return Path(directory) / f"{SEGMENT_PREFIX}{number:06d}{SEGMENT_SUFFIX}"
+
+
+def _read_records(path):
+    """Yield (offset, record) pairs from a segment, skipping torn lines"""
+    offset = 0
+    with open(path, 'rb') as f:
+        for line in f:
+            line_offset = offset
+            offset += len(line)
+            try:
+                yield line_offset, json.loads(line)
+            except json.JSONDecodeError:
+                # A crash mid-append can leave a partial last line
+                logger.warning(f"Skipping corrupt record in {path} at offset {line_offset}")
+
+
+def _iter_directory_memes(directory):
+    """Stream the live memes of one directory of segments without an index
+
+    Only the small update and delete records are held in memory; full meme
+    records are streamed from disk one at a time.
+    """
+    segments = [_segment_path(directory, n) for n in _segment_numbers(directory)]
+
+    # First pass: collect deltas and tombstones, and the last put of each id
+    updates = {}
+    deleted = set()
+    last_put = {}
+    for segment_no, path in enumerate(segments):
+        for offset, record in _read_records(path):
+            meme_id = record.get("id")
+            op = record.get("op")
+            if op == "put":
+                last_put[meme_id] = (segment_no, offset)
+                updates.pop(meme_id, None)
+                deleted.discard(meme_id)
+            elif op == "update":
+                updates.setdefault(meme_id, {}).update(record.get("fields", {}))
+            elif op == "delete":
+                deleted.add(meme_id)
+                updates.pop(meme_id, None)
+
+    # Second pass: stream the puts and apply any pending deltas
+    for segment_no, path in enumerate(segments):
+        for offset, record in _read_records(path):
+            if record.get("op") != "put":
+                continue
+            meme_id = record.get("id")
+            if meme_id in deleted or last_put.get(meme_id) != (segment_no, offset):
+                continue
+            meme = record["meme"]
+            meme.update(updates.get(meme_id, {}))
+            yield meme
+
+
+def _meme_in_range(meme, since=None, until=None):
+    try:
+        timestamp = datetime.fromisoformat(meme["timestamp"])
+    except (KeyError, TypeError, ValueError):
+        return True
+    return (since is None or timestamp >= since) and (until is None or timestamp < until)
+
+
+def _iter_partition_memes(directory, attempts=3):
+    """_iter_directory_memes for a partition the writing process may compact or drop meanwhile"""
+    yielded = set()
+    for _ in range(attempts):
+        try:
+            for meme in _iter_directory_memes(directory):
+                if meme.get("id") not in yielded:
+                    yielded.add(meme.get("id"))
+                    yield meme
+            return
+        except FileNotFoundError:
+            if not directory.exists():
+                # Dropped by retention
+                return
+            # Compacted: the rewritten segments hold every live meme, so list them again
+    logger.warning(f"Gave up reading meme store partition {directory} while it kept being compacted")
+
+
+def iter_segment_memes(store_dir, since=None, until=None):
+    """Stream the live memes of a store directory, optionally within [since, until)
+
+    This is meant for read-only consumers in other processes. Partitions
+    entirely outside the window are never opened, and only partitions that
+    straddle a window edge have their memes' timestamps checked.
+    """
+    for key in _partition_keys(store_dir):
+        if not _partition_in_range(key, since, until):
+            continue
+
+        start = _partition_start(key)
+        boundary = ((since is not None and start < since) or
+                    (until is not None and start + PARTITION_SPAN > until))
+
+        for meme in _iter_partition_memes(Path(store_dir) / key):
+            if not boundary or _meme_in_range(meme, since, until):
+                yield meme
+
+
+class _Partition:
+    """One hour of memes: a directory of append-only segments"""
+
+    def __init__(self, path, segment_max_bytes):
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+
+        self.ids = set()
+        self.record_count = 0
+        self._readers = {}
+        self._writer = None
+
+        numbers = _segment_numbers(self.path)
+        self.active_segment = numbers[-1] if numbers else 1
+
+    def scan(self):
+        """Yield (location, record) for every record in the partition"""
+        for number in _segment_numbers(self.path):
+            for offset, record in _read_records(_segment_path(self.path, number)):
+                yield (number, offset), record
+
+    def write(self, record):
+        """Append a record to the active segment and return its location"""
+        if self._writer is None:
+            self._writer = open(_segment_path(self.path, self.active_segment), 'ab')
+
+        if self._writer.tell() >= self.segment_max_bytes:
+            self._writer.close()
+            self.active_segment += 1
+            self._writer = open(_segment_path(self.path, self.active_segment), 'ab')
+
+        line = (json.dumps(record, separators=(',', ':')) + "\n").encode("utf-8")
+        location = (self.active_segment, self._writer.tell())
+        self._writer.write(line)
+        self._writer.flush()
+        return location
+
+    def read(self, location):
+        segment, offset = location
+        reader = self._readers.get(segment)
+        if reader is None:
+            reader = open(_segment_path(self.path, segment), 'rb')
+            self._readers[segment] = reader
+        reader.seek(offset)
+        return json.loads(reader.readline())
+
+    def start_rewrite(self):
+        """Begin a compaction: new segments are numbered after the old ones"""
+        old_segments = _segment_numbers(self.path)
+        self.close()
+        self.record_count = 0
+        self.active_segment = (old_segments[-1] if old_segments else 0) + 1
+        return old_segments
+
+    def finish_rewrite(self, old_segments):
+        """Make the rewritten segments durable and delete the old ones
+
+        A crash before this point leaves the newer, complete records winning
+        on the next load.
+        """
+        if self._writer:
+            self._writer.flush()
+            os.fsync(self._writer.fileno())
+
+        for number in old_segments:
+            try:
+                _segment_path(self.path, number).unlink()
+            except OSError as e:
+                logger.error(f"Error removing compacted segment {self.path.name}/{number}: {str(e)}")
+
+    def close(self):
+        if self._writer:
+            self._writer.close()
+            self._writer = None
+        for reader in self._readers.values():
+            reader.close()
+        self._readers = {}
+
+    def drop(self):
+        self.close()
+        shutil.rmtree(self.path, ignore_errors=True)
+
+
+class MemeStore:
+    """Time-partitioned, append-only store of memes with an in-memory offset index"""
+
+    def __init__(self, store_dir, segment_max_bytes=16 * 1024 * 1024,
+                 compact_min_records=1000, compact_ratio=0.5):
+        """Open (or create) the store in store_dir and index its partitions"""
+        self.store_dir = Path(store_dir)
+        self.store_dir.mkdir(parents=True, exist_ok=True)
+
+        self.segment_max_bytes = segment_max_bytes
+        self.compact_min_records = compact_min_records
+        self.compact_ratio = compact_ratio
+
+        # meme id -> (partition key, [(segment number, byte offset), ...])
+        self._index = {}
+        self._partitions = {}
+
+        self._load()
+        self._migrate_unpartitioned_segments()
+
+        logger.info(f"MemeStore opened with {len(self._index)} memes in "
+                    f"{len(self._partitions)} partitions under {self.store_dir}")
+
+    def __contains__(self, meme_id):
+        return meme_id in self._index
+
+    def __len__(self):
+        return len(self._index)
+
+    def _load(self):
+        """Rebuild the offset index by scanning every partition"""
+        for key in _partition_keys(self.store_dir):
+            partition = self._partition(key)
+            for location, record in partition.scan():
+                self._apply(key, record, location)
+
+    def _migrate_unpartitioned_segments(self):
+        """Move memes from the older flat segment layout into partitions"""
+        old_segments = _segment_numbers(self.store_dir)
+        if not old_segments:
+            return
+
+        imported = self.import_memes(_iter_directory_memes(self.store_dir))
+        for number in old_segments:
+            _segment_path(self.store_dir, number).unlink()
+
+        logger.info(f"Moved {imported} memes from unpartitioned segments into partitions")
+
+    def _partition(self, key):
+        partition = self._partitions.get(key)
+        if partition is None:
+            partition = _Partition(self.store_dir / key, self.segment_max_bytes)
+            self._partitions[key] = partition
+        return partition
+
+    def _apply(self, key, record, location):
+        """Apply a record to the in-memory index"""
+        meme_id = record.get("id")
+        op = record.get("op")
+        partition = self._partitions[key]
+        partition.record_count += 1
+
+        if op == "put":
+            self._index[meme_id] = (key, [location])
+            partition.ids.add(meme_id)
+        elif op == "update":
+            entry = self._index.get(meme_id)
+            if entry and entry[0] == key:
+                entry[1].append(location)
+        elif op == "delete":
+            entry = self._index.get(meme_id)
+            if entry and entry[0] == key:
+                del self._index[meme_id]
+                partition.ids.discard(meme_id)
+
+    def _write(self, key, record):
+        partition = self._partition(key)
+        location = partition.write(record)
+        self._apply(key, record, location)
+
+    def append(self, meme):
+        """Store a new meme in the partition of its scan timestamp"""
+        key = partition_key(meme.get("timestamp") or datetime.now().isoformat())
+        self._write(key, {"op": "put", "id": meme["id"], "meme": meme})
+
+    def update(self, meme_id, **fields):
+        """Record a delta of changed fields for an existing meme"""
+        entry = self._index.get(meme_id)
+        if entry is None:
+            return False
+
+        self._write(entry[0], {"op": "update", "id": meme_id, "fields": fields})
+        return True
+
+    def delete(self, meme_ids):
+        """Write tombstones for the given meme ids"""
+        removed = 0
+        for meme_id in meme_ids:
+            entry = self._index.get(meme_id)
+            if entry is not None:
+                self._write(entry[0], {"op": "delete", "id": meme_id})
+                removed += 1
+        return removed
+
+    def drop_partitions_before(self, cutoff):
+        """Drop every partition whose hour ends at or before cutoff
+
+        Expiry costs one directory removal per partition; no meme is parsed.
+        Memes in the partition that straddles the cutoff are kept until the
+        whole hour has expired.
+        """
+        removed = 0
+        for key in sorted(self._partitions):
+            if _partition_start(key) + PARTITION_SPAN > cutoff:
+                break
+
+            partition = self._partitions.pop(key)
+            for meme_id in partition.ids:
+                self._index.pop(meme_id, None)
+            removed += len(partition.ids)
+            partition.drop()
+
+        return removed
+
+    def get(self, meme_id):
+        """Return the current state of a meme, or None if it is not stored"""
+        entry = self._index.get(meme_id)
+        if entry is None:
+            return None
+
+        key, locations = entry
+        partition = self._partitions[key]
+        meme = partition.read(locations[0])["meme"]
+        for location in locations[1:]:
+            meme.update(partition.read(location)["fields"])
+        return meme
+
+    def ids(self):
+        """Return the ids of all stored memes"""
+        return list(self._index)
+
+    def iter_memes(self, since=None, until=None):
+        """Iterate over stored memes, optionally only those scanned in [since, until)"""
+        for key in sorted(self._partitions):
+            if not _partition_in_range(key, since, until):
+                continue
+            for meme_id in list(self._partitions[key].ids):
+                meme = self.get(meme_id)
+                if meme is not None and _meme_in_range(meme, since, until):
+                    yield meme
+
+    def maybe_compact(self):
+        """Compact any partition where deltas and dead records dominate"""
+        compacted = False
+        for key, partition in list(self._partitions.items()):
+            if partition.record_count < self.compact_min_records:
+                continue
+
+            overhead = partition.record_count - len(partition.ids)
+            if overhead > partition.record_count * self.compact_ratio:
+                self.compact(key)
+                compacted = True
+
+        return compacted
+
+    def compact(self, key):
+        """Rewrite a partition's live memes into fresh segments and drop the old ones"""
+        partition = self._partitions[key]
+        live_memes = [self.get(meme_id) for meme_id in partition.ids]
+
+        old_segments = partition.start_rewrite()
+        for meme in live_memes:
+            self._write(key, {"op": "put", "id": meme["id"], "meme": meme})
+        partition.finish_rewrite(old_segments)
+
+        logger.info(f"Compacted meme store partition {key} to {len(live_memes)} memes")
+
+    def import_memes(self, memes):
+        """Bulk-load memes that are not already stored"""
+        imported = 0
+        for meme in memes:
+            if meme.get("id") and meme["id"] not in self._index:
+                self.append(meme)
+                imported += 1
+        return imported
+
+    def close(self):
+        """Close all open segment files"""
+        for partition in self._partitions.values():
+            partition.close()
+
+
+# For testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        now = datetime.now()
+        old = now - timedelta(days=8)
+
+        store = MemeStore(tmp_dir, compact_min_records=4)
+        store.append({"id": "reddit-1", "title": "Doge to the moon", "timestamp": now.isoformat(), "processed": False})
+        store.append({"id": "reddit-2", "title": "Pepe rising", "timestamp": now.isoformat(), "processed": False})
+        store.append({"id": "reddit-3", "title": "Old wojak", "timestamp": old.isoformat(), "processed": False})
+        store.update("reddit-1", processed=True, keywords=["doge", "moon"])
+        store.delete(["reddit-2"])
+
+        print(f"Last 6 hours: {[m['id'] for m in store.iter_memes(since=now - timedelta(hours=6))]}")
+        print(f"Dropped {store.drop_partitions_before(now - timedelta(days=7))} expired memes")
+        print(f"Compacted: {store.maybe_compact()}")
+        store.close()
+
+        print(f"Streamed memes: {list(iter_segment_memes(tmp_dir))}")
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Poll Scheduler - Rate-limit-aware, velocity-adaptive polling of meme sources
+
+Each platform has a token bucket sized from its documented quota and
+corrected from the rate-limit state the API clients report. Each source has
+its own poll interval, derived from an exponentially weighted moving average
+of how many new items it produced per second: a busy subreddit is polled
+often enough to collect about POLL_TARGET_NEW_ITEMS per poll, a quiet one
+backs off towards POLL_MAX_INTERVAL. A source whose poll fails or times out
+is retried after an exponentially growing delay, starting at
+POLL_MIN_INTERVAL, until it succeeds again.
+
+Sources the scheduler does not hand out are simply not polled on that
+pass of the service loop, which then sleeps until the next one is due.
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from config import (
+    ALERT_CHECK_INTERVAL, POLL_RATE_LIMITS, POLL_MIN_INTERVAL, POLL_MAX_INTERVAL,
+    POLL_TARGET_NEW_ITEMS, POLL_VELOCITY_ALPHA
+)
+from ballistic_service.scripts.source_cursors import source_key
+
+# Configure logging
+logger = logging.getLogger("poll_scheduler")
+
+
+def read_rate_limits(platform, client):
+    """Return (remaining requests, seconds until reset) reported by an API client, or None
+
+    praw keeps the last X-Ratelimit headers in `reddit.auth.limits`; tweepy
+    keeps the last HTTP response, with X-Rate-Limit headers, as `last_response`.
+    """
+    try:
+        if platform == "reddit":
+            limits = client.auth.limits
+            if limits.get("remaining") is None or limits.get("reset_timestamp") is None:
+                return None
+            return float(limits["remaining"]), max(0.0, limits["reset_timestamp"] - time.time())
+
+        if platform == "twitter":
+            headers = client.last_response.headers
+            if "x-rate-limit-remaining" not in headers:
+                return None
+            reset_in = float(headers.get("x-rate-limit-reset", time.time())) - time.time()
+            return float(headers["x-rate-limit-remaining"]), max(0.0, reset_in)
+    except (AttributeError, TypeError, ValueError):
+        # Replay and fake clients do not report rate limits
+        return None
+
+    return None
+
+
+class TokenBucket:
+    """Token bucket refilled continuously at capacity / period"""
+
+    def __init__(self, capacity, period, clock=time.monotonic):
+        """Initialize a full bucket allowing capacity requests per period seconds"""
+        self.capacity = float(capacity)
+        self.refill_rate = capacity / period
+        self.clock = clock
+        self.tokens = float(capacity)
+        self.blocked_until = 0.0
+        self._updated = clock()
+
+    def _refill(self):
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.refill_rate)
+        self._updated = now
+        return now
+
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; returns False without taking any otherwise"""
+        now = self._refill()
+        if now < self.blocked_until or self.tokens < tokens:
+            return False
+        self.tokens -= tokens
+        return True
+
+    def charge(self, tokens):
+        """Account for requests already made (may leave the bucket in debt)"""
+        self._refill()
+        self.tokens -= tokens
+
+    def observe(self, remaining, reset_in):
+        """Reconcile with the server's view of the remaining quota"""
+        now = self._refill()
+        self.tokens = min(self.tokens, remaining)
+        if remaining < 1:
+            self.blocked_until = now + reset_in
+
+    def stats(self):
+        self._refill()
+        return {
+            "tokens": round(self.tokens, 2),
+            "capacity": self.capacity,
+            "blocked_for": round(max(0.0, self.blocked_until - self.clock()), 1)
+        }
+
+
+class _SourceState:
+    """Polling statistics for one source"""
+
+    def __init__(self, source, now):
+        self.source = source
+        self.interval = float(ALERT_CHECK_INTERVAL)
+        self.velocity = None
+        self.last_poll = None
+        self.last_new = 0
+        self.failures = 0
+        self.next_poll = now
+
+
+class PollScheduler:
+    """Decides which meme sources to poll next"""
+
+    def __init__(self, sources, clock=time.monotonic):
+        """Initialize a scheduler for the given sources, all due immediately"""
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        now = clock()
+        self.sources = {source_key(source): _SourceState(source, now) for source in sources}
+        self.buckets = {
+            platform: TokenBucket(requests, period, clock)
+            for platform, (requests, period) in POLL_RATE_LIMITS.items()
+        }
+
+        logger.info(f"PollScheduler initialized for {len(self.sources)} sources")
+
+    def due_sources(self):
+        """Return the sources that are due and within their platform's quota
+
+        A token is taken for each returned source. A due source whose
+        platform is out of tokens stays due and is retried on the next call.
+        """
+        due = []
+        with self._lock:
+            now = self.clock()
+            for key, state in sorted(self.sources.items(), key=lambda item: item[1].next_poll):
+                if state.next_poll > now:
+                    continue
+
+                bucket = self.buckets.get(state.source["platform"])
+                if bucket and not bucket.try_acquire():
+                    logger.debug(f"Deferring {key}: {state.source['platform']} quota exhausted")
+                    continue
+
+                due.append(state.source)
+        return due
+
+    def record_poll(self, source, new_items, requests=1):
+        """Update a source's velocity and next poll time after it was polled"""
+        with self._lock:
+            state = self.sources.get(source_key(source))
+            if state is None:
+                return
+
+            now = self.clock()
+            bucket = self.buckets.get(source["platform"])
+            if bucket and requests > 1:
+                # One token was taken when the source was handed out
+                bucket.charge(requests - 1)
+
+            if state.last_poll is not None and now > state.last_poll:
+                sample = new_items / (now - state.last_poll)
+                if state.velocity is None:
+                    state.velocity = sample
+                else:
+                    state.velocity = POLL_VELOCITY_ALPHA * sample + (1 - POLL_VELOCITY_ALPHA) * state.velocity
+
+                if state.velocity > 0:
+                    interval = POLL_TARGET_NEW_ITEMS / state.velocity
+                else:
+                    # Nothing seen yet: back off gradually rather than jumping to the maximum
+                    interval = state.interval * 2
+                state.interval = min(POLL_MAX_INTERVAL, max(POLL_MIN_INTERVAL, interval))
+
+            state.last_poll = now
+            state.last_new = new_items
+            state.failures = 0
+            state.next_poll = now + state.interval
+
+    def record_failure(self, source):
+        """Back a source off exponentially after a poll that failed or timed out"""
+        with self._lock:
+            state = self.sources.get(source_key(source))
+            if state is None:
+                return
+
+            state.failures += 1
+            backoff = min(POLL_MAX_INTERVAL, POLL_MIN_INTERVAL * 2 ** (state.failures - 1))
+            state.next_poll = self.clock() + backoff
+            logger.warning(f"Poll of {source_key(source)} failed {state.failures} time(s), retrying in {backoff}s")
+
+    def observe_rate_limits(self, platform, client):
+        """Reconcile a platform's bucket with the limits its client last reported"""
+        limits = read_rate_limits(platform, client)
+        if limits is None or platform not in self.buckets:
+            return
+
+        with self._lock:
+            self.buckets[platform].observe(*limits)
+
+    def next_wakeup(self):
+        """Seconds until the next source is due (0 if one already is)"""
+        with self._lock:
+            if not self.sources:
+                return float(POLL_MAX_INTERVAL)
+            next_poll = min(state.next_poll for state in self.sources.values())
+            return max(0.0, next_poll - self.clock())
+
+    def stats(self):
+        """Report each source's current interval and velocity, and each platform's quota"""
+        with self._lock:
+            now = self.clock()
+            return {
+                "sources": {
+                    key: {
+                        "interval": round(state.interval, 1),
+                        "velocity": round(state.velocity, 4) if state.velocity is not None else None,
+                        "last_new_items": state.last_new,
+                        "failures": state.failures,
+                        "next_poll_in": round(max(0.0, state.next_poll - now), 1)
+                    }
+                    for key, state in self.sources.items()
+                },
+                "platforms": {platform: bucket.stats() for platform, bucket in self.buckets.items()}
+            }
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    fake_now = [0.0]
+    scheduler = PollScheduler(
+        [{"platform": "reddit", "subreddit": "memes"}, {"platform": "reddit", "subreddit": "deadsub"}],
+        clock=lambda: fake_now[0]
+    )
+
+    for _ in range(10):
+        for source in scheduler.due_sources():
+            new_items = 30 if source["subreddit"] == "memes" else 0
+            scheduler.record_poll(source, new_items)
+        fake_now[0] += scheduler.next_wakeup()
+
+    print(f"Schedule: {scheduler.stats()}")
@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Replay Source - Recorded or synthetic social feeds replayed in place of praw/tweepy
+
+A ReplayFeed holds Reddit posts and tweets from a JSONL dump, ordered by their
+original creation time, and releases them on a replay clock running at a
+multiple of real time (1x, 10x, ...) or as fast as the scanner polls ("max").
+ReplayRedditClient and ReplayTwitterClient expose the slice of the praw and
+tweepy APIs that MemeScanner uses, including the `before`, `since_id` and
+`max_id` cursors, so the whole Ballistic pipeline can be load tested offline.
+
+Each JSONL line is one item with a "platform" of "reddit" or "twitter":
+    {"platform": "reddit", "subreddit": "memes", "id": "abc", "title": "...",
+     "selftext": "", "url": "...", "score": 10, "num_comments": 2, "created_utc": 1700000000.0}
+    {"platform": "twitter", "id": 1700000000001, "text": "...", "user": "someone",
+     "favorite_count": 5, "retweet_count": 1, "created_at": "2023-11-14T22:13:20"}
+"""
+
+import sys
+import json
+import time
+import bisect
+import random
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from types import SimpleNamespace
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+from config import MEME_SOURCES
+
+# Configure logging
+logger = logging.getLogger("replay_source")
+
+# Words the synthetic generator builds meme text from; the first group doubles
+# as token names so that generated memes produce contract matches
+SYNTHETIC_COIN_WORDS = [
+    "doge", "pepe", "shiba", "wojak", "bonk", "floki", "frog", "kitty",
+    "chad", "moonboi", "rocket", "banana", "hamster", "turbo", "milady", "brett"
+]
+SYNTHETIC_FILLER_WORDS = [
+    "when", "the", "market", "dumps", "but", "you", "still", "believe", "in",
+    "this", "is", "fine", "new", "meta", "just", "dropped", "send", "it", "to", "moon"
+]
+
+
+def parse_replay_rate(rate):
+    """Parse a rate multiplier such as "1x", "10" or "max" (returned as None)"""
+    if rate is None:
+        return None
+    if isinstance(rate, (int, float)):
+        return float(rate)
+
+    rate = str(rate).strip().lower()
+    if rate == "max":
+        return None
+    return float(rate.rstrip("x"))
+
+
+def _event_time(item):
+    """Original creation time of a dumped item, as a Unix timestamp"""
+    if item["platform"] == "reddit":
+        return float(item["created_utc"])
+    return datetime.fromisoformat(item["created_at"]).timestamp()
+
+
+class _ReplayStream:
+    """Items of one subreddit (or of Twitter) in creation order"""
+
+    def __init__(self, items, start_time):
+        self.items = sorted(items, key=_event_time)
+        self.offsets = [_event_time(item) - start_time for item in self.items]
+        self.positions = {str(item["id"]): i for i, item in enumerate(self.items)}
+        self.released = 0
+
+
+class ReplayFeed:
+    """Replay clock over a set of recorded Reddit and Twitter items"""
+
+    def __init__(self, items, rate=1.0, clock=time.monotonic):
+        """Initialize the feed; rate is a real-time multiplier, or None for max speed"""
+        self.rate = parse_replay_rate(rate)
+        self.clock = clock
+        self.started_at = None
+
+        items = list(items)
+        start_time = min((_event_time(item) for item in items), default=0.0)
+
+        by_stream = {}
+        for item in items:
+            by_stream.setdefault(self._stream_key(item), []).append(item)
+        self.streams = {key: _ReplayStream(stream_items, start_time) for key, stream_items in by_stream.items()}
+
+        # Wall-clock (time.time()) moment each item became visible, keyed by meme id
+        self.release_times = {}
+        self._lock = threading.Lock()
+
+        logger.info(f"ReplayFeed loaded {len(items)} items in {len(self.streams)} streams "
+                    f"at {'max' if self.rate is None else f'{self.rate:g}x'} speed")
+
+    @classmethod
+    def from_jsonl(cls, path, rate=1.0, clock=time.monotonic):
+        """Load a feed from a JSONL dump"""
+        items = []
+        with open(path, 'r') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed line {line_no} in {path}")
+        return cls(items, rate=rate, clock=clock)
+
+    @staticmethod
+    def _stream_key(item):
+        if item["platform"] == "reddit":
+            return ("reddit", item["subreddit"].lower())
+        return ("twitter", "")
+
+    @staticmethod
+    def _meme_id(item):
+        return f"{item['platform']}-{item['id']}"
+
+    def _release(self, key, limit):
+        """Advance the replay clock for a stream and return it with its visible item count"""
+        stream = self.streams.get(key)
+        if stream is None:
+            return None, 0
+
+        with self._lock:
+            now = self.clock()
+            if self.started_at is None:
+                # The replay starts on the first poll, not when the feed is loaded
+                self.started_at = now
+
+            if self.rate is None:
+                # Max speed: every poll makes one more page visible
+                visible = min(len(stream.items), stream.released + limit)
+            else:
+                elapsed = (now - self.started_at) * self.rate
+                visible = bisect.bisect_right(stream.offsets, elapsed)
+
+            if visible > stream.released:
+                wall_now = time.time()
+                for i in range(stream.released, visible):
+                    if self.rate is None:
+                        released_at = wall_now
+                    else:
+                        # When the item became visible, not when it was polled
+                        released_at = wall_now - ((now - self.started_at) - stream.offsets[i] / self.rate)
+                    self.release_times[self._meme_id(stream.items[i])] = released_at
+                stream.released = visible
+
+            return stream, stream.released
+
+    def exhausted(self):
+        """Check whether every item has been released"""
+        with self._lock:
+            return all(stream.released == len(stream.items) for stream in self.streams.values())
+
+    def __len__(self):
+        return sum(len(stream.items) for stream in self.streams.values())
+
+
+class ReplayRedditClient:
+    """praw.Reddit stand-in that serves a ReplayFeed's Reddit posts"""
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    def subreddit(self, name):
+        return _ReplaySubreddit(self.feed, name)
+
+
+class _ReplaySubreddit:
+    def __init__(self, feed, name):
+        self.feed = feed
+        self.display_name = name
+
+    def _listing(self, limit, params=None):
+        stream, released = self.feed._release(("reddit", self.display_name.lower()), limit)
+        if stream is None:
+            return []
+
+        before = (params or {}).get("before")
+        if before:
+            # The `limit` posts immediately newer than the anchor
+            anchor = stream.positions.get(before[len("t3_"):])
+            if anchor is None or anchor >= released:
+                return []
+            page = stream.items[anchor + 1:min(anchor + 1 + limit, released)]
+        else:
+            page = stream.items[max(0, released - limit):released]
+
+        return [
+            SimpleNamespace(
+                id=post["id"],
+                name=f"t3_{post['id']}",
+                title=post.get("title", ""),
+                selftext=post.get("selftext", ""),
+                url=post.get("url", ""),
+                score=post.get("score", 0),
+                num_comments=post.get("num_comments", 0),
+                created_utc=post["created_utc"],
+            )
+            for post in reversed(page)
+        ]
+
+    def hot(self, limit=10, params=None):
+        return self._listing(limit, params)
+
+    def new(self, limit=10, params=None):
+        return self._listing(limit, params)
+
+
+class ReplayTwitterClient:
+    """tweepy.API stand-in that serves a ReplayFeed's tweets"""
+
+    def __init__(self, feed):
+        self.feed = feed
+
+    def search_tweets(self, q, count=20, since_id=None, max_id=None, **kwargs):
+        terms = [term.strip().lower() for term in q.split(" OR ") if term.strip()]
+        stream, released = self.feed._release(("twitter", ""), count)
+        if stream is None:
+            return []
+
+        statuses = []
+        for i in range(released - 1, -1, -1):
+            tweet = stream.items[i]
+            if since_id and tweet["id"] <= int(since_id):
+                # Tweet ids grow with creation time, so everything older is seen too
+                break
+            if max_id and tweet["id"] > int(max_id):
+                continue
+            text = tweet.get("text", "")
+            if terms and not any(term in text.lower() for term in terms):
+                continue
+
+            user = tweet.get("user", "")
+            statuses.append(SimpleNamespace(
+                id=tweet["id"],
+                text=text,
+                user=SimpleNamespace(screen_name=user.get("screen_name", "") if isinstance(user, dict) else user),
+                favorite_count=tweet.get("favorite_count", 0),
+                retweet_count=tweet.get("retweet_count", 0),
+                created_at=datetime.fromisoformat(tweet["created_at"]),
+            ))
+            if len(statuses) >= count:
+                break
+
+        return statuses
+
+
+def generate_synthetic_feed(path, duration=600, base_rate=1.0, burst_every=120,
+                            burst_length=20, burst_factor=15, sources=None, seed=0):
+    """Write a synthetic JSONL dump of memes arriving with periodic bursts
+
+    Arrivals are a Poisson process at base_rate items per second of feed
+    time, multiplied by burst_factor for the last burst_length seconds of
+    every burst_every, so the feed opens quietly. The same seed always
+    produces the same dump.
+    """
+    rng = random.Random(seed)
+    sources = sources or MEME_SOURCES
+    start = time.time() - duration
+    tweet_id = int(start * 1000) << 8
+
+    count = 0
+    offset = 0.0
+    with open(path, 'w') as f:
+        while True:
+            rate = base_rate * (burst_factor if offset % burst_every >= burst_every - burst_length else 1)
+            offset += rng.expovariate(rate)
+            if offset >= duration:
+                break
+
+            source = rng.choice(sources)
+            words = rng.sample(SYNTHETIC_FILLER_WORDS, 5) + [rng.choice(SYNTHETIC_COIN_WORDS)]
+            rng.shuffle(words)
+            created = start + offset
+
+            if source["platform"] == "reddit":
+                post_id = f"{count:x}"
+                item = {
+                    "platform": "reddit",
+                    "subreddit": source["subreddit"],
+                    "id": post_id,
+                    "title": " ".join(words),
+                    "selftext": "",
+                    "url": f"https://i.example.com/{post_id}.png",
+                    "score": rng.randint(0, 5000),
+                    "num_comments": rng.randint(0, 500),
+                    "created_utc": created,
+                }
+            else:
+                tweet_id += rng.randint(1, 255)
+                item = {
+                    "platform": "twitter",
+                    "id": tweet_id,
+                    "text": f"{' '.join(words)} #{rng.choice(source['track'])} #{rng.choice(SYNTHETIC_COIN_WORDS)}",
+                    "user": f"user{rng.randint(1, 1000)}",
+                    "favorite_count": rng.randint(0, 2000),
+                    "retweet_count": rng.randint(0, 500),
+                    "created_at": datetime.fromtimestamp(created).isoformat(),
+                }
+
+            f.write(json.dumps(item) + "\n")
+            count += 1
+
+    logger.info(f"Generated {count} synthetic items over {duration}s into {path}")
+    return count
+
+
+# For testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dump_path = Path(tmp_dir) / "feed.jsonl"
+        generate_synthetic_feed(dump_path, duration=60, base_rate=2.0)
+
+        feed = ReplayFeed.from_jsonl(dump_path, rate="max")
+        reddit = ReplayRedditClient(feed)
+        twitter = ReplayTwitterClient(feed)
+
+        posts = reddit.subreddit("memes").new(limit=5)
+        tweets = twitter.search_tweets(q="meme OR crypto OR memecoin", count=5)
+        print(f"First page of r/memes: {[post.title for post in posts]}")
+        print(f"First page of tweets: {[tweet.text for tweet in tweets]}")
+        print(f"Newer than {posts[0].name}: {reddit.subreddit('memes').new(limit=5, params={'before': posts[0].name})}")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Seen Index - Constant-time lookup of meme ids that have already been stored
+"""
+
+import os
+import sys
+import logging
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+# Configure logging
+logger = logging.getLogger("seen_index")
+
+class SeenIndex:
+    """Hash-set of seen meme ids backed by an append-only companion file"""
+
+    def __init__(self, index_path):
+        """Initialize the SeenIndex with the path of its on-disk companion"""
+        self.index_path = Path(index_path)
+        self._ids = set()
+        self._pending = []
+
+    def __contains__(self, meme_id):
+        return meme_id in self._ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def load(self, meme_ids=None):
+        """Load the index from disk, rebuilding it from meme_ids if it is stale"""
+        self._ids = set()
+        self._pending = []
+
+        if self.index_path.exists():
+            try:
+                with open(self.index_path, 'r') as f:
+                    self._ids = {line.strip() for line in f if line.strip()}
+            except OSError as e:
+                logger.error(f"Error loading seen index: {str(e)}")
+                self._ids = set()
+
+        # The companion is only trusted if it agrees with the stored memes
+        if meme_ids is not None and len(self._ids) != len(meme_ids):
+            logger.info(f"Seen index out of sync ({len(self._ids)} ids, {len(meme_ids)} memes), rebuilding")
+            self.rebuild(meme_ids)
+
+        logger.debug(f"Loaded seen index with {len(self._ids)} ids")
+
+    def add(self, meme_id):
+        """Mark a meme id as seen (persisted on the next flush)"""
+        if meme_id in self._ids:
+            return False
+
+        self._ids.add(meme_id)
+        self._pending.append(meme_id)
+        return True
+
+    def flush(self):
+        """Append ids added since the last flush to the companion file"""
+        if not self._pending:
+            return
+
+        try:
+            with open(self.index_path, 'a') as f:
+                f.write("\n".join(self._pending) + "\n")
+            self._pending = []
+        except OSError as e:
+            logger.error(f"Error saving seen index: {str(e)}")
+
+    def rebuild(self, meme_ids):
+        """Replace the index contents and rewrite the companion file"""
+        self._ids = set(meme_ids)
+        self._pending = []
+
+        tmp_path = self.index_path.with_suffix(self.index_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                for meme_id in self._ids:
+                    f.write(meme_id + "\n")
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.error(f"Error rebuilding seen index: {str(e)}")
+
+
+# For testing
+if __name__ == "__main__":
+    import tempfile
+
+    logging.basicConfig(level=logging.DEBUG)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        index = SeenIndex(Path(tmp_dir) / "raw_memes.seen")
+        index.load(["reddit-abc", "twitter-123"])
+
+        index.add("reddit-def")
+        index.flush()
+
+        reloaded = SeenIndex(index.index_path)
+        reloaded.load()
+        print(f"Seen ids: {sorted(reloaded._ids)}")
+        print(f"reddit-def seen: {'reddit-def' in reloaded}")
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Source Cursors - Persistent per-source polling watermarks for the meme scanner
+"""
+
+import os
+import sys
+import json
+import logging
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
+
+# Configure logging
+logger = logging.getLogger("source_cursors")
+
+
+def source_key(source):
+    """Stable key identifying a configured meme source"""
+    if source["platform"] == "reddit":
+        return f"reddit:{source['subreddit']}"
+    return f"{source['platform']}:{' OR '.join(source.get('track', []))}"
+
+
+class SourceCursors:
+    """Watermarks (Reddit fullnames, Twitter since_ids) persisted as JSON"""
+
+    def __init__(self, cursors_path, max_age_hours=6):
+        """Initialize SourceCursors from cursors_path"""
+        self.cursors_path = Path(cursors_path)
+        self.max_age = timedelta(hours=max_age_hours)
+        self.cursors = self._load_cursors()
+
+    def _load_cursors(self):
+        """Load cursors from the JSON file"""
+        if self.cursors_path.exists():
+            try:
+                with open(self.cursors_path, 'r') as f:
+                    return json.load(f)
+            except (json.JSONDecodeError, OSError) as e:
+                logger.error(f"Error loading source cursors: {str(e)}")
+
+        return {}
+
+    def save(self):
+        """Atomically write cursors to disk"""
+        tmp_path = self.cursors_path.with_suffix(self.cursors_path.suffix + ".tmp")
+        try:
+            with open(tmp_path, 'w') as f:
+                json.dump(self.cursors, f, indent=2)
+            os.replace(tmp_path, self.cursors_path)
+        except OSError as e:
+            logger.error(f"Error saving source cursors: {str(e)}")
+
+    def get(self, source):
+        """Return the watermark for a source, or None to start from the newest page
+
+        A cursor that has not advanced for max_age is dropped. Reddit returns
+        nothing for a `before` anchor that was deleted, so an old cursor is
+        more likely to be stuck than to mean the source went quiet.
+        """
+        entry = self.cursors.get(source_key(source))
+        if not entry:
+            return None
+
+        try:
+            updated_at = datetime.fromisoformat(entry["updated_at"])
+        except (KeyError, ValueError):
+            return None
+
+        if datetime.now() - updated_at > self.max_age:
+            logger.info(f"Resetting stale cursor for {source_key(source)}")
+            return None
+
+        return entry.get("value")
+
+    def advance(self, source, value):
+        """Move a source's watermark forward (persisted on the next save)
+
+        Polls that return nothing new pass the current value back; those
+        leave updated_at alone, so a stuck cursor still ages out in get.
+        """
+        if value is None:
+            return
+
+        entry = self.cursors.get(source_key(source))
+        if entry and entry.get("value") == value:
+            return
+
+        self.cursors[source_key(source)] = {
+            "value": value,
+            "updated_at": datetime.now().isoformat()
+        }
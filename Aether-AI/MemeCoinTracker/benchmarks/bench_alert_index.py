@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Alert Index Benchmark - Re-parsing alerts/triggered vs the AlertEngine index
+
+Writes synthetic alerts in the old one-file-per-alert layout and times
+reading them the old way (parse every file on every call). An AlertEngine
+then migrates them into the SQLite alert store, and get_active_alerts is
+timed both when nothing changed and right after another AlertEngine
+(standing in for the Ballistic service process) created a handful of
+alerts. Lookups by coin and by meme go through the store's indexes.
+
+The last section replays the same meme/coin pairs on several scan passes
+with and without the duplicate suppression window, and reports how many
+alerts were stored.
+"""
+
+import os
+import sys
+import json
+import time
+import uuid
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.alert_engine import AlertEngine
+
+COIN = {"name": "Pepe Classic", "symbol": "PEPEC", "address": "0x1", "blockchain": "ethereum",
+        "match_keyword": "pepe", "match_score": 0.9, "match_type": "name"}
+
+
+def write_legacy_alerts(triggered_dir, count):
+    """Alert files as the file-based AlertEngine wrote them"""
+    triggered_dir.mkdir(parents=True)
+    for i in range(count):
+        alert_id = str(uuid.uuid4())
+        alert = {
+            "id": alert_id,
+            "created_at": datetime.now().isoformat(),
+            "status": "triggered",
+            "meme": {"id": f"meme-{i}", "platform": "reddit", "title": f"Meme {i}"},
+            "coin": {**COIN, "address": f"0x{i % 500:040x}"},
+            "match": {"keyword": "pepe", "score": 0.9, "type": "name"},
+            "keywords": ["pepe"],
+        }
+        with open(triggered_dir / f"{alert_id}.json", 'w') as f:
+            json.dump(alert, f, indent=2)
+
+
+def reparse_all(triggered_dir):
+    """The old get_active_alerts: load every alert file"""
+    alerts = []
+    for alert_file in triggered_dir.glob("*.json"):
+        with open(alert_file, 'r') as f:
+            alerts.append(json.load(f))
+    return alerts
+
+
+def timed_ms(fn, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--changes", type=int, default=10)
+    parser.add_argument("--pairs", type=int, default=500, help="meme/coin pairs seen on every scan pass")
+    parser.add_argument("--passes", type=int, default=10)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'alerts':>7}  {'reparse ms':>10}  {'migrate ms':>10}  {'unchanged ms':>12}  "
+          f"{f'+{args.changes} new ms':>11}  {'by coin ms':>10}  {'by meme ms':>10}")
+    for size in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # Keep the benchmark's alerts out of the real data directory
+            os.chdir(tmp_dir)
+            triggered_dir = Path("ballistic_service/data/alerts/triggered")
+            write_legacy_alerts(triggered_dir, size)
+
+            alerts, reparse = timed_ms(lambda: reparse_all(triggered_dir))
+
+            reader, migrate = timed_ms(AlertEngine, repeat=1)
+            indexed, unchanged = timed_ms(reader.get_active_alerts)
+            assert len(indexed) == len(alerts) == size
+
+            writer = AlertEngine()
+            for i in range(args.changes):
+                writer.create_alert({"id": f"new-{i}"}, COIN, ["pepe"])
+            start = time.perf_counter()
+            assert len(reader.get_active_alerts()) == size + args.changes
+            changed = (time.perf_counter() - start) * 1000
+
+            by_coin, coin_ms = timed_ms(lambda: reader.find_alerts(coin_address=f"0x{7:040x}"))
+            by_meme, meme_ms = timed_ms(lambda: reader.find_alerts(meme_id="meme-7"))
+            assert by_meme and all(alert["meme"]["id"] == "meme-7" for alert in by_meme)
+
+            print(f"{size:>7}  {reparse:10.1f}  {migrate:10.1f}  {unchanged:12.3f}  "
+                  f"{changed:11.1f}  {coin_ms:10.2f}  {meme_ms:10.2f}")
+            os.chdir(PROJECT_ROOT)
+
+    print(f"\n{args.pairs} pairs x {args.passes} passes:")
+    for name, window in (("no window", 0), ("suppressed", 3600)):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            os.chdir(tmp_dir)
+            engine = AlertEngine(suppression_window=window)
+            start = time.perf_counter()
+            for _ in range(args.passes):
+                for i in range(args.pairs):
+                    engine.create_alert({"id": f"meme-{i}"}, {**COIN, "address": f"0x{i:040x}"}, ["pepe"])
+            elapsed = time.perf_counter() - start
+            print(f"{name:>11}: {engine.store.count():6d} alerts stored, {engine.suppressed:6d} hits, "
+                  f"{elapsed * 1000 / (args.pairs * args.passes):.2f} ms per match")
+            os.chdir(PROJECT_ROOT)
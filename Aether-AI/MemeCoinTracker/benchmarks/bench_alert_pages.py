@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Alert Pages Benchmark - /api/alerts work with inline vs stored optimization
+
+Fills the alert store with synthetic alerts, then replays a stream of
+requests for the first page while new alerts keep arriving between
+requests. The "inline" mode is the old handler: slice the active alerts
+and run AlertOptimizer.optimize_alert on every returned alert without an
+optimization. The "paged" mode is page_alerts, with optimization results
+already stored with each alert. Also times walking every page of active
+alerts by cursor, one chain's alerts, and dismissed alerts from the store.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.alert_engine import AlertEngine
+from analysis.cross_service.alert_optimizer import AlertOptimizer
+from shared.event_bus import EventBus
+from benchmarks.bench_alert_index import COIN
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    return (samples[len(samples) // 2] * 1000, samples[min(len(samples) - 1, int(len(samples) * 0.99))] * 1000)
+
+
+def create(engine, rng, i, optimization=None):
+    coin = {**COIN, "address": f"0x{i:040x}", "blockchain": rng.choice(["ethereum", "solana"])}
+    alert = engine.create_alert({"id": f"meme-{i}", "platform": "reddit", "title": f"pepe meme {i}",
+                                 "text": "pepe to the moon"}, coin, ["pepe"])
+    if optimization is not None:
+        engine.update_alert_fields({alert["id"]: {"optimization": optimization}})
+    return alert
+
+
+def timed(fn):
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alerts", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--new-per-request", type=int, default=2, help="alerts arriving between requests")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    logging.getLogger().setLevel(logging.WARNING)
+    rng = random.Random(args.seed)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's alerts out of the real data directory
+        os.chdir(tmp_dir)
+        engine = AlertEngine(event_bus=EventBus())
+        optimizer = AlertOptimizer()
+        optimization = optimizer.optimize_alert(create(engine, rng, 0))
+        alerts = [create(engine, rng, i) for i in range(1, args.alerts)]
+        engine.store.put_many({**alert, "optimization": optimization} for alert in alerts)
+        engine = AlertEngine(event_bus=EventBus())
+        created = args.alerts
+
+        print(f"{args.alerts} alerts, {args.new_per_request} new per request, limit {args.limit}:")
+        for mode in ("inline", "paged"):
+            samples = []
+            for _ in range(args.requests):
+                for _ in range(args.new_per_request):
+                    # Stored with its optimization, as the Ballistic service's optimizer leaves it
+                    create(engine, rng, created, optimization if mode == "paged" else None)
+                    created += 1
+
+                if mode == "inline":
+                    def handle():
+                        for alert in engine.get_active_alerts()[:args.limit]:
+                            if "optimization" not in alert:
+                                alert["optimization"] = optimizer.optimize_alert(alert)
+                else:
+                    def handle():
+                        engine.page_alerts(limit=args.limit)
+                samples.append(timed(handle))
+            p50, p99 = percentiles(samples)
+            print(f"  {mode:>6}: p50 {p50:7.2f} ms  p99 {p99:7.2f} ms")
+
+        def walk(**filters):
+            cursor, pages = None, 0
+            while True:
+                _, cursor, _ = engine.page_alerts(after=cursor, limit=args.limit, **filters)
+                pages += 1
+                if cursor is None:
+                    return pages
+
+        for name, filters in (("active", {}), ("solana", {"chain": "solana"})):
+            start = time.perf_counter()
+            pages = walk(**filters)
+            elapsed = time.perf_counter() - start
+            print(f"  every {name} page: {pages} pages, {elapsed * 1000 / pages:.3f} ms per page")
+
+        for alert in engine.find_alerts(status="triggered", limit=args.alerts // 2):
+            engine.store.update_status(alert["id"], "dismissed")
+        start = time.perf_counter()
+        pages = walk(status="dismissed")
+        elapsed = time.perf_counter() - start
+        print(f"  every dismissed page (store): {pages} pages, {elapsed * 1000 / pages:.3f} ms per page")
+
+        engine.close()
+        os.chdir(PROJECT_ROOT)
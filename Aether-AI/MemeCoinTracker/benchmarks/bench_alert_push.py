@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Alert Push Benchmark - Latency from alert creation to event bus subscribers
+
+One AlertEngine stands in for the Ballistic service and creates alerts
+with write-behind; a second one stands in for the web app, syncing from the
+store every ALERT_WATCH_INTERVAL like its background updater and
+publishing on its event bus. Several subscribers (standing in for browser
+streams) record when each "created" event reached them, and one more never
+reads its queue, to show a slow client cannot hold up the rest. Reports
+delivery latency percentiles against the old 30s browser polling.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from config import ALERT_WATCH_INTERVAL
+from ballistic_service.scripts.alert_engine import AlertEngine
+from shared.event_bus import EventBus, ALERT_TOPIC
+from benchmarks.bench_alert_index import COIN
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--alerts", type=int, default=2000)
+    parser.add_argument("--rate", type=float, default=500, help="alerts created per second")
+    parser.add_argument("--subscribers", type=int, default=20)
+    parser.add_argument("--queue-size", type=int, default=100, help="events buffered per subscriber")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's alerts out of the real data directory
+        os.chdir(tmp_dir)
+
+        service = AlertEngine(write_behind=True, event_bus=EventBus())
+        web_bus = EventBus(queue_size=args.queue_size)
+        web = AlertEngine(event_bus=web_bus)
+
+        created_at = {}
+        latencies = []
+        latencies_lock = threading.Lock()
+
+        def record(events):
+            now = time.perf_counter()
+            with latencies_lock:
+                latencies.extend(now - created_at[event["alert"]["id"]]
+                                 for event in events if event["type"] == "created")
+
+        subscriptions = [web_bus.consume(ALERT_TOPIC, record, name=f"client-{i}") for i in range(args.subscribers)]
+        stalled = web_bus.subscribe(ALERT_TOPIC, name="stalled-client")
+
+        stop = threading.Event()
+
+        def watch():
+            while not stop.is_set():
+                web.get_active_alerts()
+                time.sleep(ALERT_WATCH_INTERVAL)
+
+        watcher = threading.Thread(target=watch, daemon=True)
+        watcher.start()
+
+        for i in range(args.alerts):
+            alert = service.create_alert({"id": f"meme-{i}"}, {**COIN, "address": f"0x{i:040x}"}, ["pepe"])
+            created_at[alert["id"]] = time.perf_counter()
+            time.sleep(1 / args.rate)
+
+        deadline = time.monotonic() + 10
+        expected = args.alerts * args.subscribers
+        while len(latencies) < expected and time.monotonic() < deadline:
+            time.sleep(0.05)
+        stop.set()
+        for subscription in subscriptions:
+            subscription.close()
+
+        ms = [latency * 1000 for latency in latencies]
+        print(f"{args.alerts} alerts at {args.rate:.0f}/s to {args.subscribers} subscribers "
+              f"(watch interval {ALERT_WATCH_INTERVAL * 1000:.0f} ms):")
+        print(f"  delivered {len(ms)} of {expected}, p50 {percentile(ms, 0.5):.0f} ms, "
+              f"p99 {percentile(ms, 0.99):.0f} ms, max {max(ms):.0f} ms")
+        print(f"  stalled subscriber: {stalled.dropped} events dropped, resync flagged: {stalled.take_overflow()}")
+        print(f"  30s polling: mean delay ~15000 ms, {args.subscribers * 2} requests/min with no new alerts")
+
+        service.close()
+        web.close()
+        os.chdir(PROJECT_ROOT)
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Alert Writes Benchmark - Synchronous vs write-behind alert creation
+
+Creates alerts for distinct meme/coin pairs with an AlertEngine that
+commits every alert in its own transaction, and with one that queues them
+for group commits (write_behind), at each PRAGMA synchronous level. Reports
+alerts created per second on the calling thread and, for write-behind, how
+long the final flush took and how many commits the writes were grouped
+into. A second engine then checks every alert reached the store.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.alert_engine import AlertEngine
+from benchmarks.bench_alert_index import COIN
+
+
+def run(count, synchronous, write_behind):
+    """Return (alerts per second, flush ms, commits) for creating count alerts in a fresh store"""
+    engine = AlertEngine(write_behind=write_behind, synchronous=synchronous)
+
+    start = time.perf_counter()
+    for i in range(count):
+        engine.create_alert({"id": f"meme-{i}"}, {**COIN, "address": f"0x{i:040x}"}, ["pepe"])
+    created = time.perf_counter() - start
+
+    start = time.perf_counter()
+    assert engine.flush()
+    flushed = time.perf_counter() - start
+    commits = engine.writer.commits if write_behind else count
+    engine.close()
+
+    reader = AlertEngine()
+    assert len(reader.get_active_alerts()) == count
+    reader.close()
+    return count / created, flushed * 1000, commits
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--sync-count", type=int, default=2000, help="alerts created in synchronous mode")
+    parser.add_argument("--levels", nargs="+", default=["FULL", "NORMAL", "OFF"])
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'synchronous':>11}  {'mode':>12}  {'alerts':>7}  {'alerts/s':>9}  {'flush ms':>8}  {'commits':>7}")
+    for level in args.levels:
+        for mode, count in (("synchronous", args.sync_count), ("write-behind", args.count)):
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                # Keep the benchmark's alerts out of the real data directory
+                os.chdir(tmp_dir)
+                rate, flush_ms, commits = run(count, level, mode == "write-behind")
+                print(f"{level:>11}  {mode:>12}  {count:7d}  {rate:9.0f}  {flush_ms:8.1f}  {commits:7d}")
+                os.chdir(PROJECT_ROOT)
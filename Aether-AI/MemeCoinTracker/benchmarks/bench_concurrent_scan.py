@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Concurrent Scan Benchmark - Wall-clock of sequential vs concurrent source fetching
+
+Runs MemeScanner.scan_trending_memes against the local fake Reddit/Twitter
+server, so the comparison needs no network access or API keys.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.meme_scanner import MemeScanner
+from benchmarks.fake_social_server import FakeSocialServer, FakeRedditClient, FakeTwitterClient
+
+
+def time_scans(scanner, concurrent, rounds):
+    """Return the mean wall-clock seconds and new memes per scan"""
+    found = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        found += len(scanner.scan_trending_memes(concurrent=concurrent))
+    return (time.perf_counter() - start) / rounds, found / rounds
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.25, help="fake per-request latency in seconds")
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    server = FakeSocialServer(latency=args.latency).start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's meme store out of the real data directory
+        os.chdir(tmp_dir)
+        scanner = MemeScanner()
+        scanner.reddit = FakeRedditClient(server.base_url)
+        scanner.twitter = FakeTwitterClient(server.base_url)
+
+        sources = len(scanner.active_sources())
+        print(f"sources: {sources}, latency per source: {args.latency * 1000:.0f} ms")
+        for label, concurrent in (("sequential", False), ("concurrent", True)):
+            seconds, found = time_scans(scanner, concurrent, args.rounds)
+            print(f"{label:>10}: {seconds * 1000:8.1f} ms/scan, {found:.0f} new memes/scan")
+
+        os.chdir(PROJECT_ROOT)
+    server.stop()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Contract Matching Benchmark - Linear scan vs ContractMatchIndex lookups
+
+Builds synthetic contract registries, checks that the index returns exactly
+what the old contract-by-contract scan returned, and reports build time and
+per-call match latency for each registry size. The batch column is the cost
+per keyword set when all of them go through one find_matches_many call, the
+way the service matches a whole scan. A second table times the fuzzy match
+mode on misspelled and leet-speak keywords. Keywords shorter than three
+characters are left out of the default set: the index scans linearly for
+those, exactly like the old code.
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.match_index import ContractMatchIndex
+
+CONSONANTS = "bcdfghjklmnprstvwxz"
+VOWELS = "aeiouy"
+SUFFIXES = ["", " Inu", " Coin", " Token", " Classic", " 2.0", " AI"]
+KEYWORDS = ["doge", "pepe", "shiba", "moon", "rocket", "wojak", "cat", "frog", "elon",
+            "meme", "bonk", "floki", "grok", "trump", "banana", "hamster"]
+NEAR_MISSES = ["p3pe", "peepe", "sh1ba", "dogge", "fl0ki", "wojac", "b0nk", "hamstr", "r0cket", "bananna"]
+
+
+def synthetic_contracts(count, rng, meme_share=0.05):
+    """Random pronounceable token names, a meme_share of them built on a keyword"""
+    contracts = []
+    for i in range(count):
+        stem = "".join(rng.choice(CONSONANTS) + rng.choice(VOWELS) for _ in range(rng.randint(2, 4)))
+        if rng.random() < meme_share:
+            stem = rng.choice([rng.choice(KEYWORDS) + stem, stem + rng.choice(KEYWORDS)])
+        name = stem.capitalize() + rng.choice(SUFFIXES)
+        contracts.append({
+            "address": f"0x{i:040x}",
+            "name": name,
+            "symbol": stem[:rng.randint(3, 6)].upper(),
+            "blockchain": "ethereum"
+        })
+    return contracts
+
+
+def linear_find_matches(contracts, keywords):
+    """The original ContractMonitor.find_matches scan, kept as the reference"""
+    normalized_keywords = [kw.lower() for kw in keywords]
+    matches = []
+    for contract in contracts:
+        name_lower = contract['name'].lower()
+        symbol_lower = contract['symbol'].lower()
+        for keyword in normalized_keywords:
+            if keyword in name_lower or keyword in symbol_lower:
+                if keyword == name_lower or keyword == symbol_lower:
+                    score = 1.0
+                else:
+                    name_ratio = len(keyword) / len(name_lower) if name_lower else 0
+                    symbol_ratio = len(keyword) / len(symbol_lower) if symbol_lower else 0
+                    score = max(name_ratio, symbol_ratio) * 0.8
+                matches.append({
+                    **contract,
+                    'match_keyword': keyword,
+                    'match_score': score,
+                    'match_type': 'name' if keyword in name_lower else 'symbol'
+                })
+                break
+    matches.sort(key=lambda x: x['match_score'], reverse=True)
+    return matches
+
+
+def time_calls(fn, keyword_sets):
+    start = time.perf_counter()
+    for keywords in keyword_sets:
+        fn(keywords)
+    return (time.perf_counter() - start) / len(keyword_sets)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--calls", type=int, default=200, help="keyword sets (memes) timed per size")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    keyword_sets = [rng.sample(KEYWORDS, rng.randint(3, 8)) for _ in range(args.calls)]
+
+    fuzzy_rows = []
+    print(f"{'contracts':>10}  {'build s':>8}  {'linear ms':>10}  {'index ms':>9}  {'batch ms':>9}  {'speedup':>8}  {'matches':>8}")
+    for size in args.sizes:
+        contracts = synthetic_contracts(size, rng)
+
+        start = time.perf_counter()
+        index = ContractMatchIndex(contracts[size // 2:])
+        # Exercise incremental updates the way ContractMonitor prepends new contracts
+        index.add_contracts(contracts[:size // 2], prepend=True)
+        build = time.perf_counter() - start
+
+        for keywords in keyword_sets[:3]:
+            assert index.find_matches(keywords) == linear_find_matches(contracts, keywords), keywords
+
+        linear = time_calls(lambda kw: linear_find_matches(contracts, kw), keyword_sets[:max(1, args.calls // 40)])
+        indexed = time_calls(index.find_matches, keyword_sets)
+
+        start = time.perf_counter()
+        batched_matches = index.find_matches_many(keyword_sets)
+        batched = (time.perf_counter() - start) / len(keyword_sets)
+        assert batched_matches == [index.find_matches(kw) for kw in keyword_sets]
+        matches = sum(len(m) for m in batched_matches) / len(keyword_sets)
+
+        print(f"{size:>10}  {build:8.2f}  {linear * 1000:10.1f}  {indexed * 1000:9.2f}  {batched * 1000:9.2f}  "
+              f"{linear / batched:7.1f}x  {matches:8.0f}")
+
+        start = time.perf_counter()
+        index.fuzzy_lookup(NEAR_MISSES[0])  # builds the fuzzy index
+        fuzzy_build = time.perf_counter() - start
+        fuzzy = time_calls(index.fuzzy_lookup, NEAR_MISSES * 10)
+        fuzzy_matches = sum(len(index.fuzzy_lookup(kw)) for kw in NEAR_MISSES) / len(NEAR_MISSES)
+        fuzzy_rows.append((size, fuzzy_build, fuzzy, fuzzy_matches))
+
+    print(f"\n{'contracts':>10}  {'fuzzy build s':>13}  {'fuzzy ms':>9}  {'matches':>8}")
+    for size, fuzzy_build, fuzzy, fuzzy_matches in fuzzy_rows:
+        print(f"{size:>10}  {fuzzy_build:13.2f}  {fuzzy * 1000:9.3f}  {fuzzy_matches:8.0f}")
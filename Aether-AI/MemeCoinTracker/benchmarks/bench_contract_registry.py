@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Contract Registry Benchmark - eth_contracts.json vs the columnar ContractRegistry
+
+Writes the same synthetic contracts both ways and reports size on disk,
+open time and the Python heap each one holds once loaded (via tracemalloc,
+so the registry's memory-mapped string bytes do not count), plus the time
+to pick out the last day's contracts.
+"""
+
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from datetime import datetime, timedelta
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.contract_registry import ContractRegistry
+from benchmarks.bench_contract_matching import synthetic_contracts
+
+
+def disk_bytes(path):
+    path = Path(path)
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.iterdir())
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def traced_mb(fn):
+    """Python heap still held by fn's result, in megabytes"""
+    tracemalloc.start()
+    result = fn()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current / (1024 * 1024)
+
+
+def load_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    now = datetime.now().replace(microsecond=0)
+
+    print(f"{'contracts':>10}  {'format':>8}  {'disk MB':>8}  {'open ms':>9}  {'heap MB':>8}  {'last day ms':>11}")
+    for size in args.sizes:
+        contracts = synthetic_contracts(size, rng)
+        # Newest first, one contract every ten seconds
+        for i, contract in enumerate(contracts):
+            contract['created_at'] = (now - timedelta(seconds=10 * i)).isoformat()
+        day_ago = now - timedelta(days=1)
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            json_path = Path(tmp_dir) / "eth_contracts.json"
+            with open(json_path, 'w') as f:
+                json.dump({"contracts": contracts, "last_updated": now.isoformat()}, f, indent=2)
+
+            registry_dir = Path(tmp_dir) / "contracts"
+            registry = ContractRegistry(registry_dir)
+            registry.import_contracts(contracts)
+            registry.close()
+            del contracts
+
+            data, open_json = timed(lambda: load_json(json_path))
+            recent, recent_json = timed(
+                lambda: [c for c in data["contracts"] if c.get("created_at", "") >= day_ago.isoformat()]
+            )
+            del data
+            heap_json = traced_mb(lambda: load_json(json_path))
+
+            registry, open_registry = timed(lambda: ContractRegistry(registry_dir, readonly=True))
+            rows, recent_registry = timed(lambda: list(registry.iter_contracts(since=day_ago)))
+            assert len(rows) == len(recent), (len(rows), len(recent))
+            registry.close()
+            heap_registry = traced_mb(lambda: ContractRegistry(registry_dir, readonly=True))
+
+            for name, path, opened, heap, last_day in (
+                ("json", json_path, open_json, heap_json, recent_json),
+                ("registry", registry_dir, open_registry, heap_registry, recent_registry),
+            ):
+                print(f"{size:>10}  {name:>8}  {disk_bytes(path) / (1024 * 1024):8.1f}  {opened * 1000:9.1f}  "
+                      f"{heap:8.1f}  {last_day * 1000:11.1f}")
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Etherscan Sync Benchmark - Full-range polling vs block-watermark sync, and parallel backfill
+
+Runs ContractMonitor against the local fake Etherscan server. The "full"
+mode issues the single startblock=0 query the old update_ethereum_contracts
+made on every refresh; the "watermark" mode runs the incremental sync. The
+backfill section times backfill_ethereum_contracts over a historic range
+with one worker and with several.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.contract_monitor import ContractMonitor
+from benchmarks.fake_etherscan_server import FakeEtherscanServer
+
+
+def full_range_refresh(monitor):
+    """The old refresh: every transfer ever, newest first, then filter known addresses"""
+    data = monitor._etherscan_get({
+        'module': 'account', 'action': 'tokentx',
+        'startblock': 0, 'endblock': 999999999, 'sort': 'desc'
+    })
+    new_contracts = monitor._contracts_from_transfers(reversed(data['result']))
+    monitor._add_contracts(new_contracts, 'ethereum')
+    return len(new_contracts)
+
+
+def run_refreshes(server, mode, rounds):
+    """Return (requests, rows, new contracts, seconds) per refresh"""
+    monitor = ContractMonitor(etherscan_endpoint=server.base_url, etherscan_api_key="bench")
+
+    def refresh():
+        contracts_before = len(monitor.match_indexes["ethereum"])
+        if mode == "full":
+            server.advance_head()
+            full_range_refresh(monitor)
+        else:
+            monitor.update_ethereum_contracts()
+        return len(monitor.match_indexes["ethereum"]) - contracts_before
+
+    # Prime both modes so only steady-state refreshes are measured
+    refresh()
+    requests_before, rows_before = server.request_count, server.rows_served
+
+    found = 0
+    start = time.perf_counter()
+    for _ in range(rounds):
+        found += refresh()
+    elapsed = time.perf_counter() - start
+
+    return (
+        (server.request_count - requests_before) / rounds,
+        (server.rows_served - rows_before) / rounds,
+        found / rounds,
+        elapsed / rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--latency", type=float, default=0.1, help="fake per-request latency in seconds")
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--backfill-blocks", type=int, default=40000)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's contract registry out of the real data directory
+        os.chdir(tmp_dir)
+        Path("ballistic_service/data").mkdir(parents=True)
+
+        print(f"{'mode':>10}  {'requests':>8}  {'rows':>8}  {'new':>6}  {'ms/refresh':>10}")
+        for mode in ("full", "watermark"):
+            shutil.rmtree("ballistic_service/data/contracts", ignore_errors=True)
+            server = FakeEtherscanServer(latency=args.latency, head=20000, blocks_per_request=25).start()
+            requests, rows, found, seconds = run_refreshes(server, mode, args.rounds)
+            print(f"{mode:>10}  {requests:8.1f}  {rows:8.0f}  {found:6.1f}  {seconds * 1000:10.1f}")
+            server.stop()
+
+        server = FakeEtherscanServer(latency=args.latency, head=args.backfill_blocks).start()
+        print(f"\nbackfill of {args.backfill_blocks} blocks:")
+        for workers in (1, 8):
+            shutil.rmtree("ballistic_service/data/contracts", ignore_errors=True)
+            monitor = ContractMonitor(etherscan_endpoint=server.base_url, etherscan_api_key="bench")
+            start = time.perf_counter()
+            added = monitor.backfill_ethereum_contracts(0, args.backfill_blocks - 1, workers=workers)
+            print(f"{workers:>3} workers: {time.perf_counter() - start:6.2f}s, {added} contracts")
+        server.stop()
+
+        os.chdir(PROJECT_ROOT)
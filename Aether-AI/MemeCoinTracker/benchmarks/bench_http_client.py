@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+HTTP Client Benchmark - Bare requests.get vs the shared pooled HttpClient
+
+Sends the same eth_blockNumber calls to the local fake Etherscan server from
+a pool of threads, once with a bare requests.get per call (a new connection
+each time, no retries) and once through HttpClient. The server throttles
+every n-th request with a 429 and Retry-After, so the report shows how many
+calls failed, how many connections were opened and the latency histogram.
+"""
+
+import sys
+import time
+import logging
+import argparse
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from shared.http_client import HttpClient, LatencyHistogram
+from benchmarks.fake_etherscan_server import FakeEtherscanServer
+
+PARAMS = {"module": "proxy", "action": "eth_blockNumber", "apikey": "bench"}
+
+
+def run(server, call, calls, threads):
+    """Return (seconds, failed calls, client-side latency histogram)"""
+    histogram = LatencyHistogram()
+
+    def timed_call(_):
+        start = time.perf_counter()
+        try:
+            ok = call(server.base_url)
+        except requests.RequestException:
+            ok = False
+        histogram.record(time.perf_counter() - start)
+        return ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(timed_call, range(calls)))
+    return time.perf_counter() - start, results.count(False), histogram
+
+
+def bare_call(url):
+    response = requests.get(url, params=PARAMS, timeout=30)
+    return response.status_code == 200
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.005, help="fake per-request latency in seconds")
+    parser.add_argument("--throttle-every", type=int, default=50, help="answer every n-th request with a 429")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+
+    client = HttpClient(backoff_base=0.05, max_connections_per_host=8)
+
+    def pooled_call(url):
+        return client.get(url, params=PARAMS).status_code == 200
+
+    print(f"{'client':>8}  {'calls/s':>8}  {'failed':>6}  {'conns':>6}  {'429s':>5}  {'p50 ms':>7}  {'p95 ms':>7}  {'p99 ms':>7}")
+    for name, call in (("bare", bare_call), ("pooled", pooled_call)):
+        server = FakeEtherscanServer(latency=args.latency, throttle_every=args.throttle_every).start()
+        seconds, failed, histogram = run(server, call, args.calls, args.threads)
+        snapshot = histogram.snapshot()
+        print(f"{name:>8}  {args.calls / seconds:8.0f}  {failed:6d}  {server.connection_count:6d}  "
+              f"{server.throttled_count:5d}  {snapshot['p50_ms']:7}  {snapshot['p95_ms']:7}  {snapshot['p99_ms']:7}")
+        server.stop()
+
+    print(f"\nHttpClient stats: {client.stats()}")
+    client.close()
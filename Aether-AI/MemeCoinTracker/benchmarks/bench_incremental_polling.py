@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Incremental Polling Benchmark - API calls and items fetched per scan with and without cursors
+
+Runs MemeScanner against the local fake Reddit/Twitter server. The "full"
+mode clears the source cursors before every scan, which re-requests the
+newest page each time like the old hot/popular polling did. The fake server
+adds `arrivals` items on every request, backfill pages included, so at high
+arrival rates the cursor mode shows how much the old polling silently missed.
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.meme_scanner import MemeScanner
+from benchmarks.fake_social_server import FakeSocialServer, FakeRedditClient, FakeTwitterClient
+
+
+def run(arrivals, rounds, use_cursors):
+    """Return (requests, items fetched, new memes, cpu seconds) per scan"""
+    server = FakeSocialServer(latency=0, arrivals=arrivals).start()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's meme store out of the real data directory
+        os.chdir(tmp_dir)
+        scanner = MemeScanner()
+        scanner.reddit = FakeRedditClient(server.base_url)
+        scanner.twitter = FakeTwitterClient(server.base_url)
+
+        # Prime the cursors so both modes start from the same state
+        scanner.scan_trending_memes()
+        requests_before, items_before = server.request_count, server.items_served
+
+        new_memes = 0
+        cpu_start = time.process_time()
+        for _ in range(rounds):
+            if not use_cursors:
+                scanner.cursors.cursors = {}
+            new_memes += len(scanner.scan_trending_memes())
+        cpu = time.process_time() - cpu_start
+
+        os.chdir(PROJECT_ROOT)
+    server.stop()
+
+    return (
+        (server.request_count - requests_before) / rounds,
+        (server.items_served - items_before) / rounds,
+        new_memes / rounds,
+        cpu / rounds,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    print(f"{'arrivals':>8}  {'mode':>7}  {'requests':>8}  {'items':>7}  {'new':>6}  {'cpu ms':>7}")
+    for arrivals in (1, 5, 60):
+        for mode, use_cursors in (("full", False), ("cursor", True)):
+            requests, items, new, cpu = run(arrivals, args.rounds, use_cursors)
+            print(f"{arrivals:>8}  {mode:>7}  {requests:8.1f}  {items:7.1f}  {new:6.1f}  {cpu * 1000:7.2f}")
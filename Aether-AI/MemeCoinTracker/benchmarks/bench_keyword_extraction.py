@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Keyword Extraction Benchmark - Memes/sec for per-meme vs batched spaCy processing
+"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ballistic_service.scripts.meme_scanner import load_nlp, meme_text, keywords_from_doc
+
+BATCH_SIZES = [1, 32, 256]
+
+WORDS = [
+    "doge", "pepe", "moon", "rocket", "wojak", "chad", "frog", "cat", "token", "coin",
+    "Elon", "Musk", "Binance", "Coinbase", "hodl", "diamond", "hands", "lambo", "bull",
+    "bear", "market", "pump", "dump", "whale", "meme", "crypto", "#memecoin", "#doge",
+]
+
+
+def make_memes(count, seed=42):
+    """Generate synthetic memes shaped like the scanner's Reddit records"""
+    rng = random.Random(seed)
+    return [
+        {
+            "id": f"reddit-bench{i}",
+            "title": " ".join(rng.choice(WORDS) for _ in range(rng.randint(5, 12))),
+            "text": " ".join(rng.choice(WORDS) for _ in range(rng.randint(0, 30))),
+        }
+        for i in range(count)
+    ]
+
+
+def bench(nlp, memes, batch_size, n_process):
+    """Return memes/sec for extracting keywords at the given batch size"""
+    texts = [meme_text(meme) for meme in memes]
+
+    start = time.perf_counter()
+    if batch_size == 1:
+        for text in texts:
+            keywords_from_doc(nlp(text), text)
+    else:
+        for text, doc in zip(texts, nlp.pipe(texts, batch_size=batch_size, n_process=n_process)):
+            keywords_from_doc(doc, text)
+    elapsed = time.perf_counter() - start
+
+    return len(memes) / elapsed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--memes", type=int, default=2000, help="number of synthetic memes")
+    parser.add_argument("--n-process", type=int, default=1, help="worker processes for nlp.pipe")
+    args = parser.parse_args()
+
+    nlp = load_nlp()
+    memes = make_memes(args.memes)
+
+    # Warm up the pipeline so model loading does not skew the first run
+    list(nlp.pipe([meme_text(m) for m in memes[:50]]))
+
+    print(f"pipeline: {nlp.pipe_names}, memes: {args.memes}, n_process: {args.n_process}")
+    print(f"{'batch size':>10}  {'memes/sec':>10}")
+    for batch_size in BATCH_SIZES:
+        print(f"{batch_size:>10}  {bench(nlp, memes, batch_size, args.n_process):10.1f}")
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Pipeline Load Benchmark - End-to-end throughput, alert latency and memory under replayed feeds
+
+Replays a recorded (or freshly generated synthetic) Reddit/Twitter JSONL dump
+through BallisticService.run_once at a chosen speed and reports memes/sec,
+the delay from a meme becoming visible in the feed to its alert being
+created, and how much the process RSS grew. Contracts named after the
+synthetic coin words are seeded so that generated memes produce alerts.
+Like the live scanner, a source's first poll only takes its newest page, so
+items released before that are counted in the feed but never scanned.
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import resource
+import tempfile
+import statistics
+from pathlib import Path
+from datetime import datetime
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.app import BallisticService
+from ballistic_service.scripts.replay_source import ReplayFeed, generate_synthetic_feed, SYNTHETIC_COIN_WORDS
+
+
+def seed_contracts(path):
+    """Write an eth_contracts.json with one token per synthetic coin word"""
+    contracts = [
+        {
+            "address": f"0x{i:040x}",
+            "name": word,
+            "symbol": word.upper(),
+            "created_at": datetime.now().isoformat(),
+            "blockchain": "ethereum"
+        }
+        for i, word in enumerate(SYNTHETIC_COIN_WORDS, 1)
+    ]
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump({"contracts": contracts, "last_updated": datetime.now().isoformat()}, f)
+
+
+def max_rss_mb():
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * pct / 100))]
+
+
+def run(feed, interval):
+    """Drive the service until the feed is drained and report the results"""
+    service = BallisticService()
+    service.meme_scanner.use_replay_feed(feed)
+    rss_start = max_rss_mb()
+
+    memes = 0
+    passes = 0
+    start = time.perf_counter()
+    while True:
+        drained = feed.exhausted()
+        found, _ = service.run_once(poll_all=True)
+        memes += found
+        passes += 1
+        if drained and not found:
+            break
+        if interval:
+            time.sleep(interval)
+    elapsed = time.perf_counter() - start
+
+    latencies = []
+    for alert in service.alert_engine.active_alerts:
+        released_at = feed.release_times.get(alert["meme"]["id"])
+        if released_at is not None:
+            latencies.append(datetime.fromisoformat(alert["created_at"]).timestamp() - released_at)
+
+    return {
+        "items": len(feed),
+        "memes": memes,
+        "passes": passes,
+        "seconds": elapsed,
+        "alerts": len(latencies),
+        "latencies": latencies,
+        "rss_growth_mb": max_rss_mb() - rss_start,
+        "rss_peak_mb": max_rss_mb(),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--feed", help="JSONL dump to replay (default: generate a synthetic one)")
+    parser.add_argument("--rate", default="10x", help='replay speed: "1x", "10x", ... or "max"')
+    parser.add_argument("--interval", type=float, default=None,
+                        help="seconds between service passes (default: 1, or 0 at max speed)")
+    parser.add_argument("--duration", type=int, default=300, help="seconds of synthetic feed time")
+    parser.add_argument("--base-rate", type=float, default=2.0, help="synthetic items per second outside bursts")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    # ballistic_service.app configures DEBUG logging on import
+    logging.getLogger().setLevel(logging.ERROR)
+
+    feed_path = Path(args.feed).resolve() if args.feed else None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's stores and alerts out of the real data directory
+        os.chdir(tmp_dir)
+        seed_contracts(Path("ballistic_service/data/eth_contracts.json"))
+
+        if feed_path is None:
+            feed_path = Path(tmp_dir) / "synthetic_feed.jsonl"
+            generate_synthetic_feed(feed_path, duration=args.duration, base_rate=args.base_rate, seed=args.seed)
+
+        feed = ReplayFeed.from_jsonl(feed_path, rate=args.rate)
+        interval = args.interval if args.interval is not None else (0 if feed.rate is None else 1.0)
+        result = run(feed, interval)
+
+        os.chdir(PROJECT_ROOT)
+
+    latencies = result["latencies"]
+    print(f"replay rate:   {args.rate} ({result['items']} items in feed, {result['passes']} service passes)")
+    print(f"throughput:    {result['memes'] / result['seconds']:.1f} memes/sec "
+          f"({result['memes']} memes in {result['seconds']:.1f}s)")
+    print(f"alerts:        {result['alerts']}")
+    if latencies:
+        print(f"alert latency: p50 {percentile(latencies, 50) * 1000:.0f} ms, "
+              f"p95 {percentile(latencies, 95) * 1000:.0f} ms, "
+              f"max {max(latencies) * 1000:.0f} ms, mean {statistics.mean(latencies) * 1000:.0f} ms")
+    print(f"memory:        peak RSS {result['rss_peak_mb']:.1f} MB "
+          f"(+{result['rss_growth_mb']:.1f} MB during the run)")
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Seen Index Benchmark - Per-post deduplication cost against the stored meme count
+"""
+
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from ballistic_service.scripts.seen_index import SeenIndex
+
+STORE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+POSTS_PER_SCAN = 40  # 3 subreddits x 10 hot posts + 1 x 20 tweets, rounded
+LEGACY_MAX_SIZE = 100_000  # The linear scan is too slow to be worth timing beyond this
+
+
+def _make_memes(count):
+    return [{"id": f"reddit-{i:x}"} for i in range(count)]
+
+
+def bench_legacy(memes, post_ids):
+    """Time the original any()-based duplicate check"""
+    start = time.perf_counter()
+    for post_id in post_ids:
+        any(m["id"] == post_id for m in memes)
+    return (time.perf_counter() - start) / len(post_ids)
+
+
+def bench_index(index, post_ids):
+    """Time the SeenIndex duplicate check"""
+    start = time.perf_counter()
+    for _ in range(100):
+        for post_id in post_ids:
+            post_id in index
+    return (time.perf_counter() - start) / (len(post_ids) * 100)
+
+
+if __name__ == "__main__":
+    print(f"{'stored memes':>12}  {'legacy us/post':>15}  {'index us/post':>14}  {'load ms':>8}")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size in STORE_SIZES:
+            memes = _make_memes(size)
+            # Half of the posts are duplicates, half are new
+            post_ids = [f"reddit-{i:x}" for i in range(size - POSTS_PER_SCAN // 2, size + POSTS_PER_SCAN // 2)]
+
+            meme_ids = [m["id"] for m in memes]
+            index = SeenIndex(Path(tmp_dir) / f"bench-{size}.seen")
+            index.rebuild(meme_ids)
+
+            start = time.perf_counter()
+            index.load(meme_ids)
+            load_ms = (time.perf_counter() - start) * 1000
+
+            legacy = f"{bench_legacy(memes, post_ids) * 1e6:15.2f}" if size <= LEGACY_MAX_SIZE else f"{'skipped':>15}"
+            print(f"{size:>12}  {legacy}  {bench_index(index, post_ids) * 1e6:14.3f}  {load_ms:8.1f}")
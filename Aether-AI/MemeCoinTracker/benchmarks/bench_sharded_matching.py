@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Sharded Matching Benchmark - Ethereum match latency as the Solana shard grows
+
+Loads a fixed set of synthetic Ethereum contracts into ContractMonitor,
+then grows the Solana shard step by step. At each size it times one batch
+of meme keyword sets matched against Ethereum only, and against every
+chain with the shards matched one after another and on the worker pool.
+"""
+
+import os
+import sys
+import time
+import random
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.contract_monitor import ContractMonitor
+from benchmarks.bench_contract_matching import synthetic_contracts, KEYWORDS
+
+
+def keyword_batch(rng, memes, words_per_meme=4):
+    return [rng.sample(KEYWORDS, words_per_meme) for _ in range(memes)]
+
+
+def best_of(fn, repeat=3):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ethereum", type=int, default=200_000)
+    parser.add_argument("--solana", type=int, nargs="+", default=[0, 200_000, 1_000_000])
+    parser.add_argument("--memes", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    rng = random.Random(args.seed)
+    keyword_sets = keyword_batch(rng, args.memes)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's contract registry out of the real data directory
+        os.chdir(tmp_dir)
+        Path("ballistic_service/data").mkdir(parents=True)
+
+        monitor = ContractMonitor()
+        sequential_pool = ThreadPoolExecutor(max_workers=1)
+        parallel_pool = monitor._match_pool
+
+        ethereum = synthetic_contracts(args.ethereum, rng)
+        for i, contract in enumerate(ethereum):
+            contract['address'] = f"0x{i:040x}"
+        monitor._add_contracts(ethereum, 'ethereum')
+        del ethereum
+
+        print(f"{'solana':>9}  {'ethereum ms':>11}  {'all seq ms':>10}  {'all pool ms':>11}")
+        loaded = 0
+        for size in sorted(args.solana):
+            if size > loaded:
+                solana = synthetic_contracts(size - loaded, rng)
+                for i, contract in enumerate(solana, loaded):
+                    contract['address'] = f"sol{i}"
+                    contract['blockchain'] = 'solana'
+                monitor._add_contracts(solana, 'solana')
+                loaded = size
+                del solana
+
+            ethereum_only = best_of(lambda: monitor.find_matches_many(keyword_sets, chains=['ethereum']))
+            monitor._match_pool = sequential_pool
+            all_sequential = best_of(lambda: monitor.find_matches_many(keyword_sets))
+            monitor._match_pool = parallel_pool
+            all_parallel = best_of(lambda: monitor.find_matches_many(keyword_sets))
+            print(f"{size:>9}  {ethereum_only * 1000:11.1f}  {all_sequential * 1000:10.1f}  {all_parallel * 1000:11.1f}")
+
+        monitor.registry.close()
+        os.chdir(PROJECT_ROOT)
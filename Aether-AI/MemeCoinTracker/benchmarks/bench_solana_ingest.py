@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Solana Ingest Benchmark - Whole-response polling vs streaming PumpFun ingestion
+
+Runs ContractMonitor against the local fake PumpFun server. The "buffered"
+mode downloads the whole backlog as one JSON array and decodes it before
+adding anything; the "stream" mode runs ingest_solana_stream, which decodes
+the newline-delimited feed as it arrives and commits it in batches. Both
+report launches per second and the peak Python heap while ingesting. The
+live section streams from a feed producing launches at a fixed rate and
+checks ingestion keeps up.
+"""
+
+import os
+import sys
+import time
+import shutil
+import logging
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+
+# Add project root to path for imports
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(PROJECT_ROOT))
+from ballistic_service.scripts.contract_monitor import ContractMonitor
+from benchmarks.fake_pumpfun_server import FakePumpFunServer
+
+
+def buffered_ingest(monitor):
+    """Fetch every launch in one response, then add the new ones"""
+    events = monitor.http.get_json(f"{monitor.pumpfun_endpoint}/tokens/recent")
+    new_contracts = [
+        monitor._contract_from_launch(event) for event in events if event['mint'] not in monitor.registry
+    ]
+    monitor._add_contracts(new_contracts, 'solana')
+    return len(new_contracts)
+
+
+def stream_ingest(monitor):
+    return monitor.ingest_solana_stream()
+
+
+def run(server, ingest, traced=False):
+    """Return (launches added, seconds, peak heap MB) for one ingest into an empty registry"""
+    shutil.rmtree("ballistic_service/data/contracts", ignore_errors=True)
+    monitor = ContractMonitor(pumpfun_endpoint=server.base_url, pumpfun_api_key="bench")
+
+    if traced:
+        tracemalloc.start()
+    start = time.perf_counter()
+    added = ingest(monitor)
+    elapsed = time.perf_counter() - start
+    peak = 0
+    if traced:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    monitor.registry.close()
+    return added, elapsed, peak / (1024 * 1024)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[20_000, 100_000])
+    parser.add_argument("--rate", type=float, default=5000, help="launches per second in the live section")
+    parser.add_argument("--seconds", type=float, default=5.0, help="length of the live section")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # Keep the benchmark's contract registry out of the real data directory
+        os.chdir(tmp_dir)
+        Path("ballistic_service/data").mkdir(parents=True)
+
+        print(f"{'launches':>9}  {'mode':>8}  {'added':>7}  {'launches/s':>10}  {'peak heap MB':>12}")
+        for size in args.sizes:
+            server = FakePumpFunServer(backlog=size).start()
+            for mode, ingest in (("buffered", buffered_ingest), ("stream", stream_ingest)):
+                added, seconds, _ = run(server, ingest)
+                _, _, peak = run(server, ingest, traced=True)
+                print(f"{size:>9}  {mode:>8}  {added:7d}  {added / seconds:10.0f}  {peak:12.1f}")
+            server.stop()
+
+        shutil.rmtree("ballistic_service/data/contracts", ignore_errors=True)
+        server = FakePumpFunServer(backlog=0, launches_per_second=args.rate, close_at_head=False,
+                                   heartbeat=0.2).start()
+        monitor = ContractMonitor(pumpfun_endpoint=server.base_url, pumpfun_api_key="bench")
+        added = monitor.ingest_solana_stream(max_seconds=args.seconds)
+        produced = server.head()
+        print(f"\nlive feed at {args.rate:.0f} launches/s for {args.seconds:.0f}s: "
+              f"{added} of {produced} launches ingested ({added / args.seconds:.0f}/s)")
+        server.stop()
+
+        os.chdir(PROJECT_ROOT)
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""
+Fake Etherscan Server - Local Etherscan stand-in for offline contract sync benchmarks
+
+Serves `proxy/eth_blockNumber` and `account/tokentx` over plain HTTP with a
+configurable artificial latency. The chain is generated deterministically:
+every block carries `transfers_per_block` token transfers, and one in
+`new_token_every` transfers introduces a new token contract. The head
+advances by `blocks_per_request` on every eth_blockNumber call, and tokentx
+truncates at `max_results` rows like the real API. Connections are kept
+alive, and with `throttle_every` set every n-th request is answered with a
+429 and a Retry-After header.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Configure logging
+logger = logging.getLogger("fake_etherscan_server")
+
+GENESIS_TIMESTAMP = 1700000000
+TOKEN_WORDS = ["Doge", "Pepe", "Shiba", "Wojak", "Bonk", "Floki", "Frog", "Kitty", "Chad", "Turbo"]
+
+
+class _FakeEtherscanHandler(BaseHTTPRequestHandler):
+    """Request handler for the fake Etherscan API"""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; avoid delayed-ACK stalls on kept-alive connections
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count_connection()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        time.sleep(self.server.latency)
+        if self.server.count_request():
+            self.send_response(429)
+            self.send_header("Retry-After", str(self.server.retry_after))
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        if query.get("module") == "proxy" and query.get("action") == "eth_blockNumber":
+            body = {"jsonrpc": "2.0", "id": 83, "result": hex(self.server.advance_head())}
+        elif query.get("module") == "account" and query.get("action") == "tokentx":
+            body = self.server.token_transfers(
+                int(query.get("startblock", 0)), int(query.get("endblock", 99999999)),
+                query.get("sort", "asc")
+            )
+        else:
+            body = {"status": "0", "message": "NOTOK", "result": "Error! Unknown module or action"}
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakeEtherscanServer(ThreadingHTTPServer):
+    """Threaded HTTP server over a deterministic synthetic token-transfer chain"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.1, head=20000, blocks_per_request=0,
+                 transfers_per_block=3, new_token_every=10, max_results=10000, throttle_every=0, retry_after=0):
+        super().__init__((host, port), _FakeEtherscanHandler)
+        self.latency = latency
+        self.head = head
+        self.blocks_per_request = blocks_per_request
+        self.transfers_per_block = transfers_per_block
+        self.new_token_every = new_token_every
+        self.max_results = max_results
+        self.throttle_every = throttle_every
+        self.retry_after = retry_after
+        self._lock = threading.Lock()
+        self._thread = None
+        self.request_count = 0
+        self.connection_count = 0
+        self.throttled_count = 0
+        self.rows_served = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    def count_request(self):
+        """Count a request and return True if it should be throttled"""
+        with self._lock:
+            self.request_count += 1
+            throttled = bool(self.throttle_every) and self.request_count % self.throttle_every == 0
+            self.throttled_count += throttled
+            return throttled
+
+    def count_connection(self):
+        with self._lock:
+            self.connection_count += 1
+
+    def advance_head(self):
+        with self._lock:
+            self.head += self.blocks_per_request
+            return self.head
+
+    def _transfer(self, block, n):
+        """The n-th transfer of a block; its token is new if its global index says so"""
+        index = block * self.transfers_per_block + n
+        if index % self.new_token_every == 0:
+            token = index // self.new_token_every
+        else:
+            # Transfers of a token that already exists
+            token = (index * 7919 // self.new_token_every) % max(1, index // self.new_token_every)
+        word = TOKEN_WORDS[token % len(TOKEN_WORDS)]
+        return {
+            "blockNumber": str(block),
+            "timeStamp": str(GENESIS_TIMESTAMP + block * 12),
+            "hash": f"0x{index:064x}",
+            "contractAddress": f"0x{token:040x}",
+            "tokenName": f"{word} {token}",
+            "tokenSymbol": f"{word[:3].upper()}{token % 1000}",
+        }
+
+    def token_transfers(self, start_block, end_block, sort="asc"):
+        end_block = min(end_block, self.head)
+        blocks = range(max(0, start_block), end_block + 1)
+        if sort == "desc":
+            # Truncation keeps the first rows in the requested order
+            blocks = reversed(blocks)
+
+        rows = []
+        for block in blocks:
+            transfers = [self._transfer(block, n) for n in range(self.transfers_per_block)]
+            rows.extend(reversed(transfers) if sort == "desc" else transfers)
+            if len(rows) >= self.max_results:
+                rows = rows[:self.max_results]
+                break
+
+        with self._lock:
+            self.rows_served += len(rows)
+
+        if not rows:
+            return {"status": "0", "message": "No transactions found", "result": []}
+        return {"status": "1", "message": "OK", "result": rows}
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fake Etherscan server")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.1, help="seconds of delay per request")
+    parser.add_argument("--head", type=int, default=20000, help="initial chain head block")
+    parser.add_argument("--blocks-per-request", type=int, default=5, help="head advance per eth_blockNumber call")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    server = FakeEtherscanServer(port=args.port, latency=args.latency, head=args.head,
+                                 blocks_per_request=args.blocks_per_request)
+    print(f"Fake Etherscan server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
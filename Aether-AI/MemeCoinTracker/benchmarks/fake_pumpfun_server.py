@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fake PumpFun Server - Local PumpFun stand-in for offline Solana ingestion benchmarks
+
+Serves `tokens/stream` as newline-delimited JSON over a chunked HTTP/1.1
+response, one new-token event per line, and `tokens/recent` as a single JSON
+array for comparison. The launch feed is generated deterministically: launch
+n has a fixed mint, name and symbol, and every two launches share a
+created_timestamp (milliseconds) so resuming from an inclusive `since`
+repeats a few events, like the real feed. `backlog` launches exist when the
+server starts and `launches_per_second` more appear every second after
+that. A stream sends everything from `since` up to the head, then either
+ends (`close_at_head`) or keeps waiting for new launches, sending a blank
+heartbeat line every `heartbeat` seconds while idle.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from benchmarks.fake_etherscan_server import TOKEN_WORDS
+
+# Configure logging
+logger = logging.getLogger("fake_pumpfun_server")
+
+GENESIS_MS = 1700000000000
+BASE58_ALPHABET = "123456789ABCDEFGHJKLMNPQRSTUVWXYZabcdefghijkmnopqrstuvwxyz"
+# Launches written per chunk of the streamed response
+EVENTS_PER_CHUNK = 256
+
+
+def launch_index(since):
+    """Index of the first launch created at or after a millisecond timestamp"""
+    return max(0, (int(since) - GENESIS_MS) * 2)
+
+
+class _FakePumpFunHandler(BaseHTTPRequestHandler):
+    """Request handler for the fake PumpFun API"""
+
+    protocol_version = "HTTP/1.1"
+    # Chunks are small writes; avoid delayed-ACK stalls
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        start = launch_index(query["since"]) if "since" in query else 0
+
+        if url.path.endswith("/tokens/stream"):
+            self._stream(start)
+        elif url.path.endswith("/tokens/recent"):
+            head = self.server.head()
+            payload = json.dumps([self.server.launch(n) for n in range(start, head)]).encode("utf-8")
+            self.server.count_events(head - start)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+        else:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+    def _write_chunk(self, data):
+        self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+
+    def _stream(self, position):
+        self.send_response(200)
+        self.send_header("Content-Type", "application/x-ndjson")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        server = self.server
+        idle_since = time.monotonic()
+        try:
+            while not server.stopping.is_set():
+                head = server.head()
+                if position < head:
+                    end = min(head, position + EVENTS_PER_CHUNK)
+                    lines = [json.dumps(server.launch(n)) for n in range(position, end)]
+                    self._write_chunk(("\n".join(lines) + "\n").encode("utf-8"))
+                    server.count_events(end - position)
+                    position = end
+                    idle_since = time.monotonic()
+                elif server.close_at_head:
+                    break
+                else:
+                    if time.monotonic() - idle_since >= server.heartbeat:
+                        self._write_chunk(b"\n")
+                        idle_since = time.monotonic()
+                    time.sleep(0.01)
+            self.wfile.write(b"0\r\n\r\n")
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up mid-stream
+            self.close_connection = True
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakePumpFunServer(ThreadingHTTPServer):
+    """Threaded HTTP server over a deterministic synthetic token-launch feed"""
+
+    daemon_threads = True
+    request_queue_size = 128
+
+    def __init__(self, host="127.0.0.1", port=0, backlog=10000, launches_per_second=0,
+                 close_at_head=True, heartbeat=1.0):
+        super().__init__((host, port), _FakePumpFunHandler)
+        self.backlog = backlog
+        self.launches_per_second = launches_per_second
+        self.close_at_head = close_at_head
+        self.heartbeat = heartbeat
+        self.stopping = threading.Event()
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+        self.events_served = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def head(self):
+        """Number of launches that exist so far"""
+        return self.backlog + int((time.monotonic() - self._started) * self.launches_per_second)
+
+    def count_events(self, count):
+        with self._lock:
+            self.events_served += count
+
+    def launch(self, n):
+        """The n-th new-token event of the feed"""
+        digits = []
+        value = n
+        for _ in range(8):
+            value, digit = divmod(value, 58)
+            digits.append(BASE58_ALPHABET[digit])
+        word = TOKEN_WORDS[n % len(TOKEN_WORDS)]
+        return {
+            "mint": "".join(reversed(digits)).rjust(40, "1") + "pump",
+            "name": f"{word} {n}",
+            "symbol": f"{word[:3].upper()}{n % 1000}",
+            "created_timestamp": GENESIS_MS + n // 2,
+        }
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.stopping.set()
+        self.shutdown()
+        self.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fake PumpFun server")
+    parser.add_argument("--port", type=int, default=8767)
+    parser.add_argument("--backlog", type=int, default=10000, help="launches that exist at startup")
+    parser.add_argument("--rate", type=float, default=2000, help="new launches per second")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    server = FakePumpFunServer(port=args.port, backlog=args.backlog, launches_per_second=args.rate,
+                               close_at_head=False)
+    print(f"Fake PumpFun server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.stopping.set()
+        server.server_close()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Fake Social Server - Local Reddit/Twitter stand-in for offline scanner benchmarks
+
+Serves Reddit-style listings and Twitter-style search results over plain HTTP
+with a configurable artificial latency, plus minimal client objects that expose
+the same surface MemeScanner uses from praw and tweepy. Each source is a
+timeline that grows by a fixed number of items per request, and the listings
+honor Reddit's `before` and Twitter's `since_id`/`max_id` cursors.
+"""
+
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import itertools
+import urllib.request
+from pathlib import Path
+from datetime import datetime
+from types import SimpleNamespace
+from urllib.parse import urlparse, parse_qs, urlencode
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Configure logging
+logger = logging.getLogger("fake_social_server")
+
+
+class _FakeSocialHandler(BaseHTTPRequestHandler):
+    """Request handler for the fake Reddit and Twitter endpoints"""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        parts = url.path.strip("/").split("/")
+
+        time.sleep(self.server.latency)
+        self.server.count_request()
+
+        if len(parts) == 3 and parts[0] == "r" and parts[2] in ("hot.json", "new.json"):
+            body = self.server.reddit_listing(parts[1], int(query.get("limit", 10)), query.get("before"))
+        elif url.path == "/1.1/search/tweets.json":
+            body = self.server.twitter_search(
+                query.get("q", ""), int(query.get("count", 20)),
+                int(query.get("since_id", 0)), int(query.get("max_id", 0))
+            )
+        else:
+            self.send_error(404)
+            return
+
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakeSocialServer(ThreadingHTTPServer):
+    """Threaded HTTP server that grows per-source timelines on every request"""
+
+    daemon_threads = True
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.2, arrivals=5):
+        super().__init__((host, port), _FakeSocialHandler)
+        self.latency = latency
+        self.arrivals = arrivals
+        self._ids = itertools.count(1)
+        self._timelines = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self.request_count = 0
+        self.items_served = 0
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def count_request(self):
+        with self._lock:
+            self.request_count += 1
+
+    def _count_items(self, count):
+        with self._lock:
+            self.items_served += count
+
+    def _grow(self, key, make_item):
+        """Append this request's arrivals to a timeline (oldest first) and return it"""
+        with self._lock:
+            timeline = self._timelines.setdefault(key, [])
+            for _ in range(self.arrivals):
+                timeline.append(make_item(next(self._ids)))
+            return list(timeline)
+
+    def reddit_listing(self, subreddit, limit, before=None):
+        def make_post(n):
+            post_id = f"{n:x}"
+            return {
+                "id": post_id,
+                "name": f"t3_{post_id}",
+                "title": f"{subreddit} meme {post_id} doge to the moon",
+                "selftext": "",
+                "url": f"https://i.example.com/{post_id}.png",
+                "score": 100,
+                "num_comments": 10,
+                "created_utc": time.time(),
+            }
+
+        timeline = self._grow(("reddit", subreddit), make_post)
+        names = [post["name"] for post in timeline]
+        if before in names:
+            # The `limit` posts immediately newer than the anchor
+            newer = timeline[names.index(before) + 1:]
+            page = newer[:limit]
+        elif before:
+            page = []
+        else:
+            page = timeline[-limit:]
+
+        self._count_items(len(page))
+        children = [{"kind": "t3", "data": post} for post in reversed(page)]
+        return {"kind": "Listing", "data": {"children": children}}
+
+    def twitter_search(self, query, count, since_id=0, max_id=0):
+        def make_tweet(n):
+            return {
+                "id": n,
+                "text": f"{query} tweet {n} #memecoin",
+                "user": {"screen_name": "fake_user"},
+                "favorite_count": 5,
+                "retweet_count": 2,
+                "created_at": datetime.now().isoformat(),
+            }
+
+        timeline = self._grow(("twitter", query), make_tweet)
+        matching = [
+            tweet for tweet in reversed(timeline)
+            if tweet["id"] > since_id and (not max_id or tweet["id"] <= max_id)
+        ]
+        self._count_items(len(matching[:count]))
+        return {"statuses": matching[:count]}
+
+    def start(self):
+        """Serve requests on a background thread"""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def _get_json(url, timeout=30):
+    with urllib.request.urlopen(url, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+class FakeRedditClient:
+    """Minimal praw.Reddit stand-in backed by a FakeSocialServer"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def subreddit(self, name):
+        return _FakeSubreddit(self.base_url, name)
+
+
+class _FakeSubreddit:
+    def __init__(self, base_url, name):
+        self.base_url = base_url
+        self.display_name = name
+
+    def _listing(self, kind, limit, params=None):
+        query = urlencode({"limit": limit, **(params or {})})
+        data = _get_json(f"{self.base_url}/r/{self.display_name}/{kind}.json?{query}")
+        return [SimpleNamespace(**child["data"]) for child in data["data"]["children"]]
+
+    def hot(self, limit=10, params=None):
+        return self._listing("hot", limit, params)
+
+    def new(self, limit=10, params=None):
+        return self._listing("new", limit, params)
+
+
+class FakeTwitterClient:
+    """Minimal tweepy.API stand-in backed by a FakeSocialServer"""
+
+    def __init__(self, base_url):
+        self.base_url = base_url
+
+    def search_tweets(self, q, count=20, **params):
+        query = urlencode({"q": q, "count": count, **params})
+        data = _get_json(f"{self.base_url}/1.1/search/tweets.json?{query}")
+        return [
+            SimpleNamespace(
+                id=status["id"],
+                text=status["text"],
+                user=SimpleNamespace(**status["user"]),
+                favorite_count=status["favorite_count"],
+                retweet_count=status["retweet_count"],
+                created_at=datetime.fromisoformat(status["created_at"]),
+            )
+            for status in data["statuses"]
+        ]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the fake Reddit/Twitter server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds of delay per request")
+    parser.add_argument("--arrivals", type=int, default=5, help="new items per source per request")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG)
+    server = FakeSocialServer(port=args.port, latency=args.latency, arrivals=args.arrivals)
+    print(f"Fake social server listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -23,10 +23,14 @@ HOST = "0.0.0.0"
 
 # Database paths
 KEYWORD_DB_PATH = "ballistic_service/models/keyword_db.sqlite"
+MEME_STORE_DIR = "ballistic_service/data/memes"
+CONTRACT_REGISTRY_DIR = "ballistic_service/data/contracts"
+KEYWORD_CACHE_DB_PATH = "ballistic_service/models/keyword_cache.sqlite"  # empty = in-memory only
+ALERT_DB_PATH = "ballistic_service/data/alerts/alerts.sqlite"
 
 # Endpoints
-ETHERSCAN_API_ENDPOINT = "https://api.etherscan.io/api"
-PUMPFUN_API_ENDPOINT = "https://api.pumpfun.com/v1"  # Placeholder
+ETHERSCAN_API_ENDPOINT = os.getenv("ETHERSCAN_API_ENDPOINT", "https://api.etherscan.io/api")
+PUMPFUN_API_ENDPOINT = os.getenv("PUMPFUN_API_ENDPOINT", "https://api.pumpfun.com/v1")  # Placeholder
 RUGPULL_API_ENDPOINT = "https://api.rugpull.com/v1"  # Placeholder
 TOKEN_SNIFFER_API_ENDPOINT = "https://api.tokensniffer.com/v1"  # Placeholder
 
@@ -44,6 +48,62 @@ MEME_SOURCES = [
     {"platform": "twitter", "track": ["meme", "crypto", "memecoin"]}
 ]
 
+# Scanner settings
+SCAN_CONCURRENT = True  # fetch meme sources in parallel
+SCAN_MAX_WORKERS = 8  # upper bound on concurrent source fetches
+SCAN_SOURCE_TIMEOUT = 15  # seconds before a source is skipped for this scan
+SCAN_REQUEST_TIMEOUT = 3  # seconds per Reddit/Twitter request, so a source's pages fit in SCAN_SOURCE_TIMEOUT
+SCAN_PAGE_SIZE = 25  # items requested per listing/search page
+SCAN_MAX_BACKFILL_PAGES = 4  # pages fetched per poll when a source is bursting
+SCAN_REPLAY_FEED = os.getenv("SCAN_REPLAY_FEED", "")  # JSONL dump replayed instead of live APIs (empty = live)
+SCAN_REPLAY_RATE = os.getenv("SCAN_REPLAY_RATE", "1x")  # replay speed: "1x", "10x", ... or "max"
+
+# Polling scheduler settings
+POLL_RATE_LIMITS = {"reddit": (100, 60), "twitter": (180, 900)}  # (requests, per seconds) per platform
+POLL_MIN_INTERVAL = 15  # seconds; never poll a source more often than this
+POLL_MAX_INTERVAL = 900  # seconds; poll even a quiet source at least this often
+POLL_TARGET_NEW_ITEMS = 10  # new items a source should have accumulated per poll
+POLL_VELOCITY_ALPHA = 0.3  # EWMA weight of the latest new-items-per-second sample
+
+# NLP settings
+NLP_BATCH_SIZE = 64  # texts per nlp.pipe batch
+NLP_N_PROCESS = 1  # worker processes for nlp.pipe (1 = in-process)
+KEYWORD_CACHE_SIZE = 10000  # in-memory LRU entries for extracted keywords
+
+# HTTP client settings
+HTTP_CONNECT_TIMEOUT = 5  # seconds to establish a connection
+HTTP_READ_TIMEOUT = 30  # seconds to wait for a response unless a caller sets its own
+HTTP_MAX_RETRIES = 3  # retries after a connection error, timeout, 429 or 5xx
+HTTP_BACKOFF_BASE = 0.5  # seconds; retry n waits up to base * 2^(n-1)
+HTTP_BACKOFF_MAX = 30  # cap in seconds on any retry wait, including Retry-After
+HTTP_MAX_CONNECTIONS_PER_HOST = 8  # pooled connections and concurrent requests per host
+
+# Contract settings
+CONTRACT_REFRESH_TTL = 300  # seconds before the background refresher re-fetches contracts
+CONTRACT_FUZZY_MATCHING = False  # also match near-miss names and tickers ("p3pe", "peepe" for "pepe")
+CONTRACT_MATCH_WORKERS = 4  # threads matching chain shards in parallel
+ETHERSCAN_REQUEST_TIMEOUT = 30  # seconds per Etherscan request
+ETHERSCAN_BLOCK_CHUNK = 2000  # blocks requested per tokentx query
+ETHERSCAN_MAX_RESULTS = 10000  # rows Etherscan returns before truncating a query
+ETHERSCAN_MAX_CHUNKS_PER_SYNC = 10  # block chunks fetched per refresh before yielding
+ETHERSCAN_INITIAL_LOOKBACK_BLOCKS = 7200  # ~24h of blocks synced when there is no watermark
+ETHERSCAN_BACKFILL_WORKERS = 4  # parallel requests when backfilling historic blocks
+PUMPFUN_STREAM_BATCH = 500  # new-token events read before the registry is flushed
+PUMPFUN_STREAM_FLUSH_INTERVAL = 1.0  # seconds a partial batch may wait before it is flushed
+PUMPFUN_STREAM_CHUNK_BYTES = 64 * 1024  # bytes read from the stream at a time
+PUMPFUN_STREAM_READ_TIMEOUT = 30  # seconds without data before the stream is reconnected
+PUMPFUN_STREAM_RECONNECT_MAX = 60  # cap in seconds on the follower's reconnect backoff
+
 # Alert settings
 ALERT_CHECK_INTERVAL = 60  # seconds
 ALERT_THRESHOLD_SCORE = 0.7  # minimum confidence score for alerts
+ALERT_SUPPRESSION_WINDOW = 6 * 3600  # seconds a meme/coin pair is alerted at most once
+ALERT_WRITE_BEHIND = True  # Ballistic service queues alert writes and commits them in groups
+ALERT_FLUSH_INTERVAL_MS = 200  # longest a queued alert write waits before it is committed
+ALERT_FLUSH_MAX_RECORDS = 1000  # queued alert writes that trigger an immediate commit
+ALERT_WRITE_QUEUE_MAX = 50000  # queued alert writes before creating alerts blocks
+ALERT_DB_SYNCHRONOUS = os.getenv("ALERT_DB_SYNCHRONOUS", "NORMAL")  # OFF, NORMAL or FULL (fsync every commit)
+ALERT_WATCH_INTERVAL = 0.1  # seconds between web app checks for alerts committed by the Ballistic service
+ALERT_STREAM_HEARTBEAT = 15  # seconds between keep-alive comments on idle alert streams
+TRENDING_MEMES_WINDOW = 3600  # seconds of memes scanned by the Ballistic service that /api/memes/recent returns
+EVENT_QUEUE_SIZE = 1000  # events buffered per event bus subscriber before the oldest are dropped
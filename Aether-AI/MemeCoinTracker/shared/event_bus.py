@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Event Bus - In-process publish/subscribe with bounded subscriber queues
+
+Publishers never block: every subscription has its own bounded queue, and
+when a slow subscriber's queue is full the oldest event is dropped to make
+room. A subscription that lost events is flagged as overflowed, so the
+consumer knows to resynchronize from the source of truth (e.g. re-read the
+alert store) instead of trusting the events it still has.
+"""
+
+import sys
+import queue
+import logging
+import threading
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config import EVENT_QUEUE_SIZE
+
+# Configure logging
+logger = logging.getLogger("event_bus")
+
+# Topic the AlertEngine publishes alert changes on
+ALERT_TOPIC = "alerts"
+
+
+class Subscription:
+    """One subscriber's bounded queue of events from a topic"""
+
+    def __init__(self, bus, topic, maxsize, name):
+        self.bus = bus
+        self.topic = topic
+        self.name = name or topic
+        self._queue = queue.Queue(maxsize)
+        self._lock = threading.Lock()
+        self.delivered = 0
+        self.dropped = 0
+        self.overflowed = False
+        self.closed = False
+
+    def _offer(self, event):
+        with self._lock:
+            while True:
+                try:
+                    self._queue.put_nowait(event)
+                    break
+                except queue.Full:
+                    try:
+                        self._queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self.dropped += 1
+                    self.overflowed = True
+            self.delivered += 1
+
+    def get(self, timeout=None):
+        """Next event, or None if none arrived within timeout seconds"""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def get_batch(self, max_events, timeout=None):
+        """Wait up to timeout for one event, then take up to max_events without waiting"""
+        event = self.get(timeout)
+        if event is None:
+            return []
+        events = [event]
+        while len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def take_overflow(self):
+        """True once after events were dropped since the last call"""
+        with self._lock:
+            overflowed, self.overflowed = self.overflowed, False
+            return overflowed
+
+    def close(self):
+        self.bus.unsubscribe(self)
+
+    def stats(self):
+        return {
+            "name": self.name,
+            "queued": self._queue.qsize(),
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+        }
+
+
+class EventBus:
+    """Topic-based fan-out of events to bounded subscriber queues"""
+
+    def __init__(self, queue_size=EVENT_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self.published = {}
+
+    def subscribe(self, topic, maxsize=None, name=None):
+        """Start receiving events published on a topic from now on"""
+        subscription = Subscription(self, topic, maxsize or self.queue_size, name)
+        with self._lock:
+            # Copy on write, so publish can iterate without holding the lock
+            self._subscriptions[topic] = self._subscriptions.get(topic, ()) + (subscription,)
+        logger.debug(f"Subscribed {subscription.name} to {topic}")
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscription.closed = True
+            remaining = tuple(s for s in self._subscriptions.get(subscription.topic, ()) if s is not subscription)
+            self._subscriptions[subscription.topic] = remaining
+
+    def publish(self, topic, event):
+        """Hand an event to every subscriber of the topic without blocking"""
+        subscriptions = self._subscriptions.get(topic, ())
+        for subscription in subscriptions:
+            subscription._offer(event)
+        self.published[topic] = self.published.get(topic, 0) + 1
+        return len(subscriptions)
+
+    def consume(self, topic, handler, name=None, max_batch=100, maxsize=None):
+        """Call handler with batches of events from a topic on a background thread
+
+        Exceptions from the handler are logged and the thread keeps going.
+        Returns the subscription; closing it stops the thread.
+        """
+        subscription = self.subscribe(topic, maxsize=maxsize, name=name)
+
+        def run():
+            while not subscription.closed:
+                events = subscription.get_batch(max_batch, timeout=1.0)
+                if not events:
+                    continue
+                try:
+                    handler(events)
+                except Exception as e:
+                    logger.error(f"Error in {subscription.name} handling {len(events)} events: {str(e)}")
+
+        threading.Thread(target=run, name=f"{subscription.name}-consumer", daemon=True).start()
+        return subscription
+
+    def stats(self):
+        with self._lock:
+            subscriptions = {topic: [s.stats() for s in subs] for topic, subs in self._subscriptions.items()}
+        return {"published": dict(self.published), "subscriptions": subscriptions}
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+
+    bus = EventBus(queue_size=3)
+    slow = bus.subscribe("alerts", name="slow")
+    for i in range(5):
+        bus.publish("alerts", {"type": "created", "alert": {"id": f"a{i}"}})
+
+    print(f"Overflowed: {slow.take_overflow()}")
+    print(f"Queued: {[event['alert']['id'] for event in slow.get_batch(10)]}")
+    print(bus.stats())
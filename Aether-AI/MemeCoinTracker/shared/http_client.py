@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""
+HTTP Client - Shared, pooled and retrying client for outbound API calls
+
+Every host gets its own keep-alive session with a bounded connection pool
+and a semaphore capping concurrent requests to it. Requests always carry a
+(connect, read) timeout. Connection errors, timeouts, 429 and 5xx responses
+are retried with capped exponential backoff and full jitter; when the
+server sends Retry-After, that wait is used instead. Each host keeps a
+latency histogram and request counters for status endpoints.
+"""
+
+import sys
+import time
+import random
+import logging
+import threading
+from collections import deque
+from pathlib import Path
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from config import (
+    HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_MAX_RETRIES, HTTP_BACKOFF_BASE,
+    HTTP_BACKOFF_MAX, HTTP_MAX_CONNECTIONS_PER_HOST
+)
+
+# Configure logging
+logger = logging.getLogger("http_client")
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+def parse_retry_after(value, now=None):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - (time.time() if now is None else now))
+
+
+class LatencyHistogram:
+    """Fixed-bucket request latency histogram"""
+
+    def __init__(self, bounds_ms=LATENCY_BUCKETS_MS):
+        self.bounds_ms = bounds_ms
+        # One extra bucket for anything slower than the last bound
+        self.counts = [0] * (len(bounds_ms) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, seconds):
+        ms = seconds * 1000
+        bucket = 0
+        while bucket < len(self.bounds_ms) and ms > self.bounds_ms[bucket]:
+            bucket += 1
+        self.counts[bucket] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def percentile(self, pct):
+        """Upper bound of the bucket holding the pct-th percentile, in milliseconds"""
+        if not self.count:
+            return None
+        rank = self.count * pct / 100
+        seen = 0
+        for bound, count in zip(self.bounds_ms, self.counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return self.max_ms
+
+    def snapshot(self):
+        buckets = {f"le_{bound}ms": count for bound, count in zip(self.bounds_ms, self.counts)}
+        buckets["inf"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": round(self.max_ms, 1),
+            "buckets": buckets
+        }
+
+
+class _FairSlots:
+    """Counting semaphore that hands free slots to waiters in arrival order
+
+    threading.Semaphore wakes an arbitrary waiter, which lets some callers
+    starve for seconds when more threads than slots share a host.
+    """
+
+    def __init__(self, slots):
+        self._lock = threading.Lock()
+        self._free = slots
+        self._waiters = deque()
+
+    def __enter__(self):
+        with self._lock:
+            if self._free and not self._waiters:
+                self._free -= 1
+                return self
+            turn = threading.Event()
+            self._waiters.append(turn)
+        turn.wait()
+        return self
+
+    def __exit__(self, *exc_info):
+        with self._lock:
+            if self._waiters:
+                # Hand the slot straight to the longest waiter
+                self._waiters.popleft().set()
+            else:
+                self._free += 1
+
+
+class _HostPool:
+    """Session, concurrency limit and statistics for one host"""
+
+    def __init__(self, max_connections):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.slots = _FairSlots(max_connections)
+
+        self.lock = threading.Lock()
+        self.latency = LatencyHistogram()
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.errors = 0
+
+    def stats(self):
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "retries": self.retries,
+                "throttled": self.throttled,
+                "errors": self.errors,
+                "latency": self.latency.snapshot()
+            }
+
+
+class HttpClient:
+    """Pooled HTTP client with per-host concurrency limits, retries and latency histograms"""
+
+    def __init__(self, connect_timeout=HTTP_CONNECT_TIMEOUT, read_timeout=HTTP_READ_TIMEOUT,
+                 max_retries=HTTP_MAX_RETRIES, backoff_base=HTTP_BACKOFF_BASE,
+                 backoff_max=HTTP_BACKOFF_MAX, max_connections_per_host=HTTP_MAX_CONNECTIONS_PER_HOST,
+                 sleep=time.sleep):
+        """Initialize the client; sessions are created per host on first use"""
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_connections_per_host = max_connections_per_host
+        self._sleep = sleep
+
+        self._hosts = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url):
+        host = urlsplit(url).netloc
+        pool = self._hosts.get(host)
+        if pool is None:
+            with self._lock:
+                pool = self._hosts.get(host)
+                if pool is None:
+                    pool = self._hosts[host] = _HostPool(self.max_connections_per_host)
+        return host, pool
+
+    def _backoff(self, attempt, retry_after=None):
+        """Seconds to wait before retry number attempt (1-based)"""
+        if retry_after is not None:
+            # The server knows when it will take requests again
+            return min(retry_after, self.backoff_max)
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1)))
+
+    def request(self, method, url, timeout=None, **kwargs):
+        """Send a request, retrying transient failures, and return the final response
+
+        timeout may be a read timeout in seconds or a (connect, read) pair.
+        A response that is still 429 or 5xx after the last retry is
+        returned as is; a connection error or timeout on the last attempt
+        is raised.
+        """
+        if timeout is None:
+            timeout = self.timeout
+        elif not isinstance(timeout, tuple):
+            timeout = (self.timeout[0], timeout)
+
+        host, pool = self._host(url)
+        attempt = 0
+        while True:
+            try:
+                with pool.slots:
+                    # Latency covers the request itself, not the wait for a slot
+                    start = time.perf_counter()
+                    response = pool.session.request(method, url, timeout=timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                with pool.lock:
+                    pool.requests += 1
+                    pool.errors += 1
+                    pool.latency.record(time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise
+                attempt += 1
+                wait = self._backoff(attempt)
+                logger.warning(f"{method} {host} failed ({str(e)}); retry {attempt} in {wait:.2f}s")
+            else:
+                with pool.lock:
+                    pool.requests += 1
+                    pool.latency.record(time.perf_counter() - start)
+                    if response.status_code == 429:
+                        pool.throttled += 1
+                if response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    return response
+                attempt += 1
+                wait = self._backoff(attempt, parse_retry_after(response.headers.get("Retry-After")))
+                response.close()
+                logger.warning(f"{method} {host} returned {response.status_code}; retry {attempt} in {wait:.2f}s")
+
+            with pool.lock:
+                pool.retries += 1
+            self._sleep(wait)
+
+    def get(self, url, params=None, **kwargs):
+        return self.request("GET", url, params=params, **kwargs)
+
+    def get_json(self, url, params=None, **kwargs):
+        """GET a URL and return its decoded JSON, raising for HTTP error statuses"""
+        response = self.get(url, params=params, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    def stats(self):
+        """Report request counts and latency histograms per host"""
+        with self._lock:
+            hosts = dict(self._hosts)
+        return {host: pool.stats() for host, pool in hosts.items()}
+
+    def close(self):
+        with self._lock:
+            for pool in self._hosts.values():
+                pool.session.close()
+            self._hosts = {}
+
+
+# For testing
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.DEBUG)
+    client = HttpClient()
+
+    try:
+        data = client.get_json("https://api.etherscan.io/api", params={"module": "proxy", "action": "eth_blockNumber"})
+        print(f"Response: {data}")
+    except requests.RequestException as e:
+        print(f"Request failed: {str(e)}")
+    print(f"Stats: {client.stats()}")
+    client.close()
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Resource Registry - Process-wide, lazily constructed shared resources
+
+Heavy objects such as the spaCy pipeline, the Reddit/Twitter API clients and
+the VADER analyzer are built once per process on first use and then handed
+to every component that asks for them.
+"""
+
+import sys
+import time
+import logging
+import threading
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+# Configure logging
+logger = logging.getLogger("resources")
+
+class ResourceRegistry:
+    """Registry of named resource factories whose results are built once"""
+    
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._factories = {}
+        self._instances = {}
+        self._load_times = {}
+        # Re-entrant so a factory may itself request other resources
+        self._lock = threading.RLock()
+    
+    def register(self, name, factory):
+        """Register a zero-argument factory for a named resource"""
+        with self._lock:
+            self._factories[name] = factory
+    
+    def get(self, name):
+        """Return the named resource, constructing it on first use"""
+        if name in self._instances:
+            return self._instances[name]
+        
+        with self._lock:
+            if name in self._instances:
+                return self._instances[name]
+            
+            if name not in self._factories:
+                raise KeyError(f"Unknown resource: {name}")
+            
+            start = time.perf_counter()
+            instance = self._factories[name]()
+            elapsed = time.perf_counter() - start
+            
+            self._instances[name] = instance
+            self._load_times[name] = elapsed
+            logger.info(f"Loaded resource {name} in {elapsed:.3f}s")
+            
+            return instance
+    
+    def is_loaded(self, name):
+        """Check whether a resource has already been constructed"""
+        return name in self._instances
+    
+    def stats(self):
+        """Report which resources are loaded and how long each took to build"""
+        return {
+            name: {
+                "loaded": name in self._instances,
+                "load_seconds": self._load_times.get(name)
+            }
+            for name in self._factories
+        }
+
+
+def _load_spacy_nlp():
+    from ballistic_service.scripts.meme_scanner import load_nlp
+    return load_nlp()
+
+
+def _create_replay_feed():
+    from config import SCAN_REPLAY_FEED, SCAN_REPLAY_RATE
+    from ballistic_service.scripts.replay_source import ReplayFeed
+    return ReplayFeed.from_jsonl(SCAN_REPLAY_FEED, rate=SCAN_REPLAY_RATE)
+
+
+def _create_reddit_client():
+    from config import SCAN_REPLAY_FEED
+    if SCAN_REPLAY_FEED:
+        from ballistic_service.scripts.replay_source import ReplayRedditClient
+        return ReplayRedditClient(registry.get("replay_feed"))
+    
+    from ballistic_service.scripts.meme_scanner import create_reddit_client
+    return create_reddit_client()
+
+
+def _create_twitter_client():
+    from config import SCAN_REPLAY_FEED
+    if SCAN_REPLAY_FEED:
+        from ballistic_service.scripts.replay_source import ReplayTwitterClient
+        return ReplayTwitterClient(registry.get("replay_feed"))
+    
+    from ballistic_service.scripts.meme_scanner import create_twitter_client
+    return create_twitter_client()
+
+
+def _create_keyword_cache():
+    from config import KEYWORD_CACHE_SIZE, KEYWORD_CACHE_DB_PATH
+    from ballistic_service.scripts.keyword_cache import KeywordCache, nlp_model_version
+    return KeywordCache(
+        max_entries=KEYWORD_CACHE_SIZE,
+        model_version=nlp_model_version(registry.get("spacy_nlp")),
+        db_path=KEYWORD_CACHE_DB_PATH or None
+    )
+
+
+def _create_http_client():
+    from shared.http_client import HttpClient
+    return HttpClient()
+
+
+def _create_alert_bus():
+    from shared.event_bus import EventBus
+    return EventBus()
+
+
+def _create_meme_scanner():
+    from ballistic_service.scripts.meme_scanner import MemeScanner
+    return MemeScanner()
+
+
+def _create_sentiment_analyzer():
+    from analysis.sentiment.vader_custom import VaderSentimentAnalyzer
+    return VaderSentimentAnalyzer()
+
+
+def _create_meme_analytics():
+    from trendforger.scripts.meme_analytics import MemeAnalytics
+    return MemeAnalytics()
+
+
+registry = ResourceRegistry()
+registry.register("spacy_nlp", _load_spacy_nlp)
+registry.register("replay_feed", _create_replay_feed)
+registry.register("reddit_client", _create_reddit_client)
+registry.register("twitter_client", _create_twitter_client)
+registry.register("keyword_cache", _create_keyword_cache)
+registry.register("http_client", _create_http_client)
+registry.register("alert_bus", _create_alert_bus)
+registry.register("meme_scanner", _create_meme_scanner)
+registry.register("sentiment_analyzer", _create_sentiment_analyzer)
+registry.register("meme_analytics", _create_meme_analytics)
+
+
+def get_resource(name):
+    """Return a shared resource from the process-wide registry"""
+    return registry.get(name)
+
+
+def get_loaded_resource(name):
+    """Return a shared resource only if it has already been loaded, else None"""
+    return registry.get(name) if registry.is_loaded(name) else None
+
+
+def resource_stats():
+    """Report load status and load time of every registered resource"""
+    return registry.stats()
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup for the MemeCoinTracker modules
+"""
+
+import sys
+from pathlib import Path
+
+# Add project root to path for imports
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,106 @@
+"""
+Tests for AlertEngine cursor paging and alert enrichment
+"""
+
+import random
+
+import pytest
+
+from ballistic_service.scripts.alert_engine import AlertEngine
+from ballistic_service.scripts.alert_store import AlertStore
+from shared.event_bus import EventBus, ALERT_TOPIC
+
+
+def make_alerts(count, seed=1):
+    rng = random.Random(seed)
+    return [{"id": f"id{i:04d}", "created_at": f"2026-01-01T00:00:{rng.randrange(60):02d}",
+             "status": rng.choice(["triggered", "triggered", "dismissed"]), "hits": 1,
+             "coin": {"address": f"0x{i}", "blockchain": rng.choice(["ethereum", "solana"])},
+             "meme": {"id": f"m{i}"}} for i in range(count)]
+
+
+def newest_first(alerts):
+    return [a["id"] for a in sorted(alerts, key=lambda a: (a["created_at"], a["id"]), reverse=True)]
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch):
+    """Run in an empty directory, so relative data paths stay out of the real data directory"""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def engine(workdir):
+    engine = AlertEngine(str(workdir / "alerts.db"), event_bus=EventBus())
+    yield engine
+    engine.close()
+
+
+@pytest.fixture
+def writer_store(workdir):
+    """A second connection to the engine's database, writing like another process"""
+    store = AlertStore(str(workdir / "alerts.db"))
+    yield store
+    store.close()
+
+
+def all_pages(engine, limit, **filters):
+    ids, cursor = [], None
+    while True:
+        page, cursor, total = engine.page_alerts(after=cursor, limit=limit, **filters)
+        ids += [a["id"] for a in page]
+        if cursor is None:
+            return ids, total
+
+
+@pytest.mark.parametrize("status", ["triggered", "dismissed", None])
+@pytest.mark.parametrize("chain", [None, "ethereum", "solana"])
+def test_page_alerts_cursor_continuity(engine, writer_store, status, chain):
+    alerts = make_alerts(300)
+    writer_store.put_many(alerts)
+    expected = newest_first([a for a in alerts if (status is None or a["status"] == status)
+                             and (chain is None or a["coin"]["blockchain"] == chain)])
+
+    ids, total = all_pages(engine, 37, status=status, chain=chain)
+    assert ids == expected
+    assert total == len(expected)
+
+
+def test_cursor_survives_newer_alerts(engine, writer_store):
+    alerts = make_alerts(50)
+    writer_store.put_many(alerts)
+    first, cursor, _ = engine.page_alerts(limit=10)
+
+    writer_store.put({"id": "newest", "created_at": "2026-02-01T00:00:00", "status": "triggered",
+                      "coin": {}, "meme": {}})
+    second, _, _ = engine.page_alerts(after=cursor, limit=10)
+
+    expected = newest_first([a for a in alerts if a["status"] == "triggered"])
+    assert [a["id"] for a in first + second] == expected[:20]
+
+
+def test_malformed_cursor(engine):
+    with pytest.raises(ValueError):
+        engine.page_alerts(after="garbage!!")
+
+
+def test_enriched_fields_are_stored_and_published(engine):
+    events = engine.events.subscribe(ALERT_TOPIC)
+    engine.add_enricher(lambda alert: {"optimization": {"score": alert["match"]["score"]}})
+    coin = {"name": "Pepe", "symbol": "PEPE", "address": "0x1", "blockchain": "ethereum", "match_score": 0.9}
+
+    alert = engine.create_alert({"id": "m1"}, coin, ["pepe"])
+    assert alert["optimization"] == {"score": 0.9}
+    assert engine.store.get(alert["id"])["optimization"] == {"score": 0.9}
+    event = events.get(timeout=1)
+    assert event["type"] == "created" and event["alert"]["optimization"] == {"score": 0.9}
+
+    # A repeat of the pair is only a hit on the first alert and is not enriched again
+    engine.add_enricher(lambda alert: 1 / 0)
+    assert engine.create_alert({"id": "m1"}, coin, ["pepe"]) is None
+    assert engine.get_alert(alert["id"])["hits"] == 2
+
+    # A failing enricher is skipped
+    other = engine.create_alert({"id": "m2"}, coin, ["pepe"])
+    assert other["optimization"] == {"score": 0.9}
@@ -0,0 +1,56 @@
+"""
+Tests for the AlertWriteBehind group commits
+"""
+
+import random
+
+import pytest
+
+from ballistic_service.scripts.alert_store import AlertStore, AlertWriteBehind, put_op, status_op, hit_op
+
+
+def make_alerts(count, seed=1):
+    rng = random.Random(seed)
+    return [{"id": f"id{i:04d}", "created_at": f"2026-01-01T00:00:{rng.randrange(60):02d}",
+             "status": rng.choice(["triggered", "triggered", "dismissed"]), "hits": 1,
+             "coin": {"address": f"0x{i}", "blockchain": rng.choice(["ethereum", "solana"])},
+             "meme": {"id": f"m{i}"}} for i in range(count)]
+
+
+def test_write_behind_commits_in_order():
+    store = AlertStore(":memory:")
+    writer = AlertWriteBehind(store, flush_interval_ms=60000)
+    alert = dict(make_alerts(1)[0], status="triggered")
+
+    numbers = [writer.submit(put_op(alert)), writer.submit(status_op(alert["id"], "dismissed")),
+               writer.submit(hit_op(alert["id"])), writer.submit(status_op(alert["id"], "triggered"))]
+    assert numbers == [1, 2, 3, 4]
+    assert writer.pending == 4 and store.get(alert["id"]) is None
+
+    assert writer.flush()
+    stored = store.get(alert["id"])
+    assert stored["status"] == "triggered" and stored["hits"] == 2
+    committed, written = writer.take_commits()
+    assert committed == 4 and writer.pending == 0
+    seqs = [seq for _, _, seq in written]
+    assert seqs == sorted(seqs) and len(seqs) == 4
+    assert [alert["status"] for _, alert, _ in written] == ["triggered", "dismissed", "dismissed", "triggered"]
+    assert writer.take_commits() == (4, [])
+    writer.close()
+    store.close()
+
+
+def test_write_behind_close_commits_queued_ops():
+    store = AlertStore(":memory:")
+    writer = AlertWriteBehind(store, flush_interval_ms=60000)
+    alerts = make_alerts(5)
+    for alert in alerts:
+        writer.submit(put_op(alert))
+
+    assert writer.close()
+    assert [store.get(a["id"])["id"] for a in alerts] == [a["id"] for a in alerts]
+    assert writer.committed == 5 and writer.commits == 1
+    with pytest.raises(RuntimeError):
+        writer.submit(put_op(alerts[0]))
+    store.close()
+
@@ -0,0 +1,71 @@
+"""
+Tests for ContractRegistry and ShardedContractRegistry persistence
+"""
+
+import pytest
+
+from ballistic_service.scripts.contract_registry import ContractRegistry, ShardedContractRegistry
+
+
+def contracts(prefix, count, chain="ethereum"):
+    return [{"address": f"{prefix}{i}", "name": f"Token {prefix}{i}", "symbol": "PEPE", "blockchain": chain,
+             "created_at": "2024-01-01T00:00:00"} for i in range(count)]
+
+
+def test_flush_and_reopen(tmp_path):
+    registry = ContractRegistry(tmp_path)
+    registry.append(contracts("a", 3))
+    registry.append(contracts("p", 2, chain="solana"), prepend=True)
+    registry.last_block = 19000000
+    registry.set_cursor("pumpfun", 42)
+    registry.flush()
+    expected = list(registry.iter_contracts())
+    registry.close()
+
+    reopened = ContractRegistry(tmp_path, readonly=True)
+    assert list(reopened.iter_contracts()) == expected
+    assert [c["address"] for c in expected] == ["p0", "p1", "a0", "a1", "a2"]
+    assert reopened.last_block == 19000000
+    assert reopened.cursor("pumpfun") == 42
+    assert "a1" in reopened and "zz" not in reopened
+    reopened.close()
+
+
+def test_unflushed_rows_are_not_visible(tmp_path):
+    registry = ContractRegistry(tmp_path)
+    registry.append(contracts("a", 2))
+    registry.flush()
+    registry.append(contracts("b", 2))
+
+    reader = ContractRegistry(tmp_path, readonly=True)
+    assert len(reader) == 2
+    registry.flush()
+    assert reader.reload() == [2, 3]
+    assert reader.reload() == []
+    assert [c["address"] for c in reader.iter_contracts()] == ["a0", "a1", "b0", "b1"]
+    reader.close()
+    registry.close()
+
+
+def test_single_writer(tmp_path):
+    registry = ContractRegistry(tmp_path)
+    with pytest.raises(ValueError):
+        ContractRegistry(tmp_path)
+    registry.close()
+    ContractRegistry(tmp_path).close()
+
+
+def test_sharded_reload_picks_up_new_chains(tmp_path):
+    writer = ShardedContractRegistry(tmp_path)
+    reader = ShardedContractRegistry(tmp_path, readonly=True)
+    assert len(reader) == 0
+
+    writer.shard("ethereum").append(contracts("e", 2))
+    writer.shard("base").append(contracts("b", 1, chain="base"))
+    writer.flush()
+
+    assert reader.reload() == {"base": [0], "ethereum": [0, 1]}
+    assert sorted(reader.chains) == ["base", "ethereum", "solana"]
+    assert [c["address"] for c in reader.iter_contracts(chains=["ethereum"])] == ["e0", "e1"]
+    reader.close()
+    writer.close()
@@ -0,0 +1,66 @@
+"""
+Tests for ContractMatchIndex fuzzy lookups
+"""
+
+import random
+
+from ballistic_service.scripts.match_index import (
+    _FuzzyIndex, _padded_trigrams, edit_distance, fold_leet,
+    FUZZY_MIN_SIMILARITY, FUZZY_MAX_EDITS
+)
+
+
+def jaccard(a, b):
+    a, b = _padded_trigrams(a), _padded_trigrams(b)
+    return len(a & b) / len(a | b)
+
+
+def random_words(rng, count):
+    stems = ["pepe", "doge", "shib", "bonk", "wojak", "floki"]
+    words = []
+    for _ in range(count):
+        word = list(rng.choice(stems))
+        for _ in range(rng.randint(0, 2)):
+            position = rng.randrange(len(word) + 1)
+            if rng.random() < 0.5 and position < len(word):
+                word[position] = rng.choice("abcdefghijklmnopqrstuvwxyz0134")
+            else:
+                word.insert(position, rng.choice("abcdefghijklmnopqrstuvwxyz"))
+        words.append("".join(word))
+    return words
+
+
+def test_similar_words_match_brute_force():
+    rng = random.Random(7)
+    words = random_words(rng, 400)
+    index = _FuzzyIndex()
+    for contract_id, word in enumerate(words):
+        index.add(contract_id, word, "zz")
+
+    for query in ["pepe", "doge", "sh1b", "wojack", "flok1", "bonkk"]:
+        query = fold_leet(query)
+        found = {index.words[word_id] for word_id, _ in
+                 index.similar_words(query, FUZZY_MIN_SIMILARITY, len(index.words), FUZZY_MAX_EDITS)}
+        expected = {word for word in index.words
+                    if abs(len(word) - len(query)) <= FUZZY_MAX_EDITS and jaccard(query, word) >= FUZZY_MIN_SIMILARITY}
+        assert found == expected, query
+
+        near_misses = {word for word in found if edit_distance(query, word, FUZZY_MAX_EDITS) is not None}
+        assert near_misses == {word for word in expected if edit_distance(query, word, FUZZY_MAX_EDITS) is not None}
+
+
+def test_capped_candidates_keep_the_closest_words():
+    index = _FuzzyIndex()
+    # Many older words share one trigram with the query; the near miss is added last
+    for contract_id in range(300):
+        index.add(contract_id, f"pe{contract_id:04d}xx", "zz")
+    index.add(300, "pepa", "zz")
+
+    found = [index.words[word_id] for word_id, _ in index.similar_words("pepe", FUZZY_MIN_SIMILARITY, 5, FUZZY_MAX_EDITS)]
+    assert "pepa" in found
+
+
+def test_edit_distance_bounds():
+    assert edit_distance("pepe", "p3pe", 2) == 1
+    assert edit_distance("pepe", "peepe", 2) == 1
+    assert edit_distance("pepe", "doge", 1) is None
@@ -0,0 +1,63 @@
+"""
+Tests for MemeStore appends, deltas, tombstones, compaction and retention
+"""
+
+from datetime import datetime, timedelta
+
+from ballistic_service.scripts.meme_store import MemeStore, iter_segment_memes
+
+NOW = datetime(2024, 5, 1, 12, 30)
+
+
+def meme(meme_id, timestamp=NOW, **fields):
+    return {"id": meme_id, "title": f"meme {meme_id}", "timestamp": timestamp.isoformat(), **fields}
+
+
+def test_append_update_delete_round_trip(tmp_path):
+    store = MemeStore(tmp_path)
+    store.append(meme("a", processed=False))
+    store.append(meme("b"))
+    store.update("a", processed=True, keywords=["pepe"])
+    assert store.delete(["b", "missing"]) == 1
+    assert not store.update("missing", processed=True)
+    store.close()
+
+    reopened = MemeStore(tmp_path)
+    assert "b" not in reopened
+    assert reopened.get("a") == meme("a", processed=True, keywords=["pepe"])
+    assert list(iter_segment_memes(tmp_path)) == [reopened.get("a")]
+    reopened.close()
+
+
+def test_compact_keeps_live_memes_and_drops_old_segments(tmp_path):
+    store = MemeStore(tmp_path, segment_max_bytes=256, compact_min_records=10)
+    for i in range(10):
+        store.append(meme(f"m{i}"))
+    for i in range(10):
+        store.update(f"m{i}", hits=i)
+    store.delete([f"m{i}" for i in range(5)])
+    expected = {f"m{i}": store.get(f"m{i}") for i in range(5, 10)}
+    partition_dir = tmp_path / NOW.strftime("%Y-%m-%dT%H")
+    segments_before = set(partition_dir.iterdir())
+
+    assert store.maybe_compact()
+    assert not segments_before & set(partition_dir.iterdir())
+    assert {meme_id: store.get(meme_id) for meme_id in expected} == expected
+    store.close()
+
+    reopened = MemeStore(tmp_path)
+    assert sorted(reopened.ids()) == sorted(expected)
+    assert {m["id"]: m for m in iter_segment_memes(tmp_path)} == expected
+    reopened.close()
+
+
+def test_drop_partitions_before_and_range_reads(tmp_path):
+    store = MemeStore(tmp_path)
+    store.append(meme("old", NOW - timedelta(days=8)))
+    store.append(meme("new"))
+
+    assert [m["id"] for m in store.iter_memes(since=NOW - timedelta(hours=1))] == ["new"]
+    assert store.drop_partitions_before(NOW - timedelta(days=7)) == 1
+    assert store.ids() == ["new"]
+    store.close()
+    assert [m["id"] for m in iter_segment_memes(tmp_path)] == ["new"]
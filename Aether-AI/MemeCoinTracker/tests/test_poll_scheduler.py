@@ -0,0 +1,56 @@
+"""
+Tests for the PollScheduler's adaptive intervals and failure backoff
+"""
+
+from ballistic_service.scripts.poll_scheduler import PollScheduler
+from config import POLL_MIN_INTERVAL, POLL_MAX_INTERVAL
+
+SOURCE = {"platform": "reddit", "subreddit": "memes"}
+
+
+def make_scheduler(sources=(SOURCE,)):
+    now = [0.0]
+    return PollScheduler(list(sources), clock=lambda: now[0]), now
+
+
+def test_failed_polls_back_off_exponentially():
+    scheduler, now = make_scheduler()
+    delays = []
+    for _ in range(8):
+        assert scheduler.due_sources() == [SOURCE]
+        scheduler.record_failure(SOURCE)
+        assert scheduler.due_sources() == []
+        delays.append(scheduler.next_wakeup())
+        now[0] += delays[-1]
+
+    assert delays[:3] == [POLL_MIN_INTERVAL, POLL_MIN_INTERVAL * 2, POLL_MIN_INTERVAL * 4]
+    assert max(delays) == POLL_MAX_INTERVAL
+
+
+def test_successful_poll_resets_backoff():
+    scheduler, now = make_scheduler()
+    for _ in range(3):
+        scheduler.due_sources()
+        scheduler.record_failure(SOURCE)
+        now[0] += scheduler.next_wakeup()
+
+    scheduler.due_sources()
+    scheduler.record_poll(SOURCE, 5)
+    assert scheduler.stats()["sources"]["reddit:memes"]["failures"] == 0
+    now[0] += scheduler.next_wakeup()
+
+    scheduler.due_sources()
+    scheduler.record_failure(SOURCE)
+    assert scheduler.next_wakeup() == POLL_MIN_INTERVAL
+
+
+def test_quiet_sources_are_polled_less_often():
+    busy = {"platform": "reddit", "subreddit": "busy"}
+    scheduler, now = make_scheduler([SOURCE, busy])
+    for _ in range(10):
+        for source in scheduler.due_sources():
+            scheduler.record_poll(source, 30 if source is busy else 0)
+        now[0] += scheduler.next_wakeup()
+
+    intervals = {key: source["interval"] for key, source in scheduler.stats()["sources"].items()}
+    assert intervals["reddit:busy"] < intervals["reddit:memes"]
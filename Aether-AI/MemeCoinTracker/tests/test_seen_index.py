@@ -0,0 +1,67 @@
+"""
+Tests for the SeenIndex used to deduplicate scanned memes
+"""
+
+from datetime import datetime
+
+from ballistic_service.scripts.meme_store import MemeStore
+from ballistic_service.scripts.seen_index import SeenIndex
+
+
+def store_memes(directory, meme_ids):
+    store = MemeStore(directory)
+    for meme_id in meme_ids:
+        store.append({"id": meme_id, "title": meme_id, "timestamp": datetime(2024, 5, 1).isoformat()})
+    return store
+
+
+def test_seen_id_is_skipped_after_restart(tmp_path):
+    store = store_memes(tmp_path / "memes", ["reddit-a", "twitter-1"])
+    index_path = tmp_path / "raw_memes.seen"
+
+    # No companion file yet, so the first load rebuilds it from the store
+    index = SeenIndex(index_path)
+    index.load(store.ids())
+    assert sorted(index_path.read_text().split()) == ["reddit-a", "twitter-1"]
+
+    assert index.add("reddit-b")
+    store.append({"id": "reddit-b", "title": "reddit-b", "timestamp": datetime(2024, 5, 1).isoformat()})
+    index.flush()
+    store.close()
+
+    # A restarted scanner loads the companion without rebuilding and skips every stored id
+    store = MemeStore(tmp_path / "memes")
+    restarted = SeenIndex(index_path)
+    restarted.load(store.ids())
+    assert len(restarted) == 3
+    for meme_id in ["reddit-a", "twitter-1", "reddit-b"]:
+        assert meme_id in restarted
+        assert not restarted.add(meme_id)
+    assert "reddit-c" not in restarted
+    store.close()
+
+
+def test_stale_companion_is_rebuilt(tmp_path):
+    index_path = tmp_path / "raw_memes.seen"
+    index_path.write_text("reddit-a\nreddit-gone\n")
+
+    index = SeenIndex(index_path)
+    index.load(["reddit-a", "reddit-b", "reddit-c"])
+    assert "reddit-b" in index and "reddit-gone" not in index
+
+    reloaded = SeenIndex(index_path)
+    reloaded.load()
+    assert sorted(reloaded._ids) == ["reddit-a", "reddit-b", "reddit-c"]
+
+
+def test_flush_appends_only_new_ids(tmp_path):
+    index = SeenIndex(tmp_path / "raw_memes.seen")
+    index.load([])
+    index.add("reddit-a")
+    assert not index.add("reddit-a")
+    index.flush()
+    index.flush()
+    index.add("reddit-b")
+    index.flush()
+
+    assert index.index_path.read_text() == "reddit-a\nreddit-b\n"
@@ -0,0 +1,34 @@
+"""
+Tests for the persisted per-source polling watermarks
+"""
+
+from datetime import datetime, timedelta
+
+from ballistic_service.scripts.source_cursors import SourceCursors
+
+SOURCE = {"platform": "reddit", "subreddit": "memes"}
+
+
+def test_cursors_round_trip(tmp_path):
+    cursors = SourceCursors(tmp_path / "cursors.json")
+    assert cursors.get(SOURCE) is None
+    cursors.advance(SOURCE, "t3_abc")
+    cursors.advance(SOURCE, None)
+    cursors.save()
+
+    assert SourceCursors(tmp_path / "cursors.json").get(SOURCE) == "t3_abc"
+
+
+def test_unchanged_cursor_still_goes_stale(tmp_path):
+    cursors = SourceCursors(tmp_path / "cursors.json", max_age_hours=6)
+    cursors.advance(SOURCE, "t3_abc")
+    stamped = (datetime.now() - timedelta(hours=7)).isoformat()
+    cursors.cursors["reddit:memes"]["updated_at"] = stamped
+
+    # Empty polls hand the same watermark back
+    cursors.advance(SOURCE, "t3_abc")
+    assert cursors.cursors["reddit:memes"]["updated_at"] == stamped
+    assert cursors.get(SOURCE) is None
+
+    cursors.advance(SOURCE, "t3_def")
+    assert cursors.get(SOURCE) == "t3_def"
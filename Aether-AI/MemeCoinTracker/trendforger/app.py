@@ -22,7 +22,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from trendforger.scripts.tokenizer import Tokenizer
 from trendforger.scripts.royalty_tracker import RoyaltyTracker
-from trendforger.scripts.meme_analytics import MemeAnalytics
+from shared.resources import get_resource
 from config import HOST, BACKEND_PORT, INFLUENCERS
 
 # Configure logging
@@ -118,7 +118,7 @@ class ConnectionManager:
 manager = ConnectionManager()
 tokenizer = Tokenizer()
 royalty_tracker = RoyaltyTracker()
-meme_analytics = MemeAnalytics()
+meme_analytics = get_resource("meme_analytics")
 
 # In-memory storage for MVP
 tweets_db = []
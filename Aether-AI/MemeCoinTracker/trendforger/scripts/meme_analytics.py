@@ -14,7 +14,7 @@ import random
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent.parent))
-from analysis.sentiment.vader_custom import VaderSentimentAnalyzer
+from shared.resources import get_resource
 
 # Configure logging
 logger = logging.getLogger("meme_analytics")
@@ -25,7 +25,7 @@ class MemeAnalytics:
     def __init__(self):
         """Initialize the MemeAnalytics"""
         # Initialize sentiment analyzer
-        self.sentiment_analyzer = VaderSentimentAnalyzer()
+        self.sentiment_analyzer = get_resource("sentiment_analyzer")
         
         logger.info("MemeAnalytics initialized")
     
@@ -8,28 +8,29 @@ import sys
 import json
 import logging
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import threading
 import time
 
-from flask import Flask, render_template, jsonify, request, abort, session, redirect, url_for
+from flask import (
+    Flask, Response, render_template, jsonify, request, abort, session, redirect, url_for, stream_with_context
+)
 
 # Add project root to path for imports
 sys.path.append(str(Path(__file__).resolve().parent.parent))
 
 from config import (
-    WEB_PORT, HOST, BACKEND_PORT, ALERT_CHECK_INTERVAL,
-    ETHERSCAN_API_KEY, PUMPFUN_API_KEY
+    WEB_PORT, HOST, BACKEND_PORT, ALERT_WATCH_INTERVAL, ALERT_STREAM_HEARTBEAT, TRENDING_MEMES_WINDOW,
+    ETHERSCAN_API_KEY, PUMPFUN_API_KEY, CONTRACT_FUZZY_MATCHING
 )
 
 # Import service components for direct integration
-from ballistic_service.scripts.meme_scanner import MemeScanner
 from ballistic_service.scripts.contract_monitor import ContractMonitor
 from ballistic_service.scripts.alert_engine import AlertEngine
 from ballistic_service.scripts.anti_scam import AntiScamAnalyzer
-from trendforger.scripts.meme_analytics import MemeAnalytics
 from analysis.cross_service.meme_coin_correlator import MemeCoinCorrelator
-from analysis.cross_service.alert_optimizer import AlertOptimizer
+from shared.resources import get_resource, get_loaded_resource, resource_stats
+from shared.event_bus import ALERT_TOPIC
 
 # Configure logging
 logging.basicConfig(
@@ -45,38 +46,45 @@ app = Flask(__name__, template_folder=str(template_dir), static_folder=str(stati
 app.secret_key = os.environ.get("SESSION_SECRET", "aether_ai_development_key")
 
 # Initialize components
-meme_scanner = MemeScanner()
-contract_monitor = ContractMonitor()
+# (the MemeScanner and its spaCy model are shared and loaded on first scan)
+# (the Ballistic service writes the contract registry; this process only reads it)
+contract_monitor = ContractMonitor(readonly=True)
 alert_engine = AlertEngine()
 anti_scam = AntiScamAnalyzer()
-meme_analytics = MemeAnalytics()
+meme_analytics = get_resource("meme_analytics")
 correlator = MemeCoinCorrelator()
-optimizer = AlertOptimizer()
+
+# Alert changes are pushed to browsers and the correlator through the event bus
+# (alerts are optimized by the Ballistic service as it creates them, and stored with the result)
+alert_bus = get_resource("alert_bus")
+correlator.subscribe_alerts(alert_bus)
 
 # In-memory storage for active alert cache
 active_alerts_cache = []
 last_alert_update = datetime.now()
 
-# Background task to update alerts periodically
+# Background task to pick up alerts the Ballistic service commits
 def update_alerts_background():
-    """Background task to update alerts periodically"""
+    """Background task that syncs the alert index, publishing each change on the event bus"""
     global active_alerts_cache, last_alert_update
     
     logger.info("Starting background alert updater")
     
     while True:
         try:
-            # Get latest alerts
+            # One PRAGMA unless the store changed; only changed alerts are read
             try:
+                generation = alert_engine.generation
                 alerts = alert_engine.get_active_alerts()
                 active_alerts_cache = alerts
                 last_alert_update = datetime.now()
-                logger.debug(f"Updated alerts: {len(alerts)} active alerts")
+                if alert_engine.generation != generation:
+                    logger.debug(f"Updated alerts: {len(alerts)} active alerts")
             except Exception as e:
                 logger.error(f"Error updating alerts: {str(e)}")
             
             # Sleep for the interval
-            time.sleep(ALERT_CHECK_INTERVAL)
+            time.sleep(ALERT_WATCH_INTERVAL)
             
         except Exception as e:
             logger.error(f"Error in alert update loop: {str(e)}")
@@ -107,6 +115,8 @@ def trendforger():
 @app.route('/api/status')
 def api_status():
     """API status endpoint"""
+    keyword_cache = get_loaded_resource("keyword_cache")
+    http_client = get_loaded_resource("http_client")
     return jsonify({
         "status": "online",
         "timestamp": datetime.now().isoformat(),
@@ -118,13 +128,29 @@ def api_status():
         "api_keys": {
             "etherscan": bool(ETHERSCAN_API_KEY),
             "pumpfun": bool(PUMPFUN_API_KEY)
-        }
+        },
+        "resources": resource_stats(),
+        "keyword_cache": keyword_cache.stats() if keyword_cache else None,
+        "contracts": contract_monitor.stats(),
+        "events": alert_bus.stats(),
+        "http": http_client.stats() if http_client else None
     })
 
 @app.route('/api/alerts')
 def api_alerts():
-    """Get current active alerts"""
-    global active_alerts_cache
+    """Get a page of alerts, newest first
+    
+    Query parameters: status (default "triggered", or "all"), chain, limit
+    and after, the next_cursor returned with the previous page. The
+    optimization of each alert is computed by the Ballistic service when
+    the alert is created and stored with it, so it is never computed here.
+    """
+    status = request.args.get('status', default='triggered')
+    valid_statuses = ["triggered", "pending", "dismissed", "resolved", "all"]
+    if status not in valid_statuses:
+        return jsonify({"error": f"Invalid status. Must be one of: {', '.join(valid_statuses)}"}), 400
+    chain = request.args.get('chain') or None
+    after = request.args.get('after') or None
     
     limit = request.args.get('limit', default=10, type=int)
     
@@ -134,55 +160,62 @@ def api_alerts():
     elif limit > 100:
         limit = 100
     
-    # Get alerts with optimization data
-    alerts = active_alerts_cache[:limit]
-    
-    # Add optimization data if not present
-    for alert in alerts:
-        if "optimization" not in alert:
-            try:
-                optimization = optimizer.optimize_alert(alert)
-                alert["optimization"] = optimization
-            except Exception as e:
-                logger.error(f"Error optimizing alert: {str(e)}")
-                alert["optimization"] = {"error": str(e)}
+    try:
+        alerts, next_cursor, total = alert_engine.page_alerts(
+            status=None if status == "all" else status, chain=chain, after=after, limit=limit
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     
     return jsonify({
         "alerts": alerts,
         "count": len(alerts),
-        "total": len(active_alerts_cache),
-        "updated_at": last_alert_update.isoformat()
+        "total": total,
+        "next_cursor": next_cursor,
+        "generation": alert_engine.generation,
+        "updated_at": last_alert_update.isoformat(),
+        "filters": {
+            "status": status,
+            "chain": chain,
+            "limit": limit
+        }
     })
 
-@app.route('/api/alerts/<alert_id>')
-def api_alert_detail(alert_id):
-    """Get details for a specific alert"""
-    global active_alerts_cache
+@app.route('/api/alerts/stream')
+def api_alerts_stream():
+    """Server-sent events for alerts becoming active, changing or leaving the active set
     
-    # Search for the alert in the cache
-    for alert in active_alerts_cache:
-        if alert.get("id") == alert_id:
-            return jsonify(alert)
+    Each event is named after its type ("created", "updated" or "removed")
+    and carries the alert as JSON. A "resync" event means this client fell
+    behind and missed events, so it should reload /api/alerts.
+    """
+    subscription = alert_bus.subscribe(ALERT_TOPIC, name="sse")
     
-    # If not found in cache, try to load from file
-    alert_path = Path(f"ballistic_service/data/alerts/triggered/{alert_id}.json")
-    if alert_path.exists():
+    def stream():
         try:
-            with open(alert_path, 'r') as f:
-                alert_data = json.load(f)
-                return jsonify(alert_data)
-        except Exception as e:
-            logger.error(f"Error loading alert {alert_id}: {str(e)}")
+            yield f"retry: 5000\nevent: hello\ndata: {json.dumps({'generation': alert_engine.generation})}\n\n"
+            while True:
+                event = subscription.get(timeout=ALERT_STREAM_HEARTBEAT)
+                if subscription.take_overflow():
+                    yield "event: resync\ndata: {}\n\n"
+                if event is None:
+                    # Keeps proxies from closing an idle stream; also notices clients that left
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+        finally:
+            subscription.close()
     
-    # Try pending directory if not in triggered
-    alert_path = Path(f"ballistic_service/data/alerts/pending/{alert_id}.json")
-    if alert_path.exists():
-        try:
-            with open(alert_path, 'r') as f:
-                alert_data = json.load(f)
-                return jsonify(alert_data)
-        except Exception as e:
-            logger.error(f"Error loading alert {alert_id}: {str(e)}")
+    return Response(stream_with_context(stream()), mimetype="text/event-stream",
+                    headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.route('/api/alerts/<alert_id>')
+def api_alert_detail(alert_id):
+    """Get details for a specific alert"""
+    # Active alerts come from the engine's index, any other status from the alert store
+    alert = alert_engine.get_alert(alert_id)
+    if alert is not None:
+        return jsonify(alert)
     
     # Alert not found
     return jsonify({"error": "Alert not found"}), 404
@@ -204,13 +237,9 @@ def api_update_alert_status(alert_id):
     result = alert_engine.update_alert_status(alert_id, new_status)
     
     if result:
-        # Update the cache
+        # The engine's index already reflects the change
         global active_alerts_cache
-        for i, alert in enumerate(active_alerts_cache):
-            if alert.get("id") == alert_id:
-                active_alerts_cache[i]["status"] = new_status
-                active_alerts_cache[i]["updated_at"] = datetime.now().isoformat()
-                break
+        active_alerts_cache = alert_engine.active_alerts
         
         return jsonify({"success": True, "status": new_status})
     else:
@@ -234,10 +263,15 @@ def api_analyze_content():
         # Predict virality
         viral_score = meme_analytics.predict_virality(content)
         
-        # Find potential coin matches
+        # Find potential coin matches, optionally on some chains only
+        chains = request.json.get('chains')
+        if isinstance(chains, str):
+            chains = [chains]
         matches = []
         if keywords:
-            matches = contract_monitor.find_matches(keywords)
+            matches = contract_monitor.find_matches(
+                keywords, fuzzy=bool(request.json.get('fuzzy', CONTRACT_FUZZY_MATCHING)), chains=chains
+            )
             
             # Add safety analysis to matches
             for match in matches:
@@ -301,49 +335,51 @@ def api_correlations():
         }
     })
 
-@app.route('/api/scan/trending')
-def api_scan_trending():
-    """Trigger a scan for trending memes"""
+@app.route('/api/memes/recent')
+def api_recent_memes():
+    """List the memes the Ballistic service scanned in the last TRENDING_MEMES_WINDOW seconds
+    
+    Scanning and keyword extraction run in the Ballistic service on its own
+    poll schedule, which stores each meme with its keywords; this only
+    reads the meme store and never starts a scan.
+    """
     try:
-        # Scan for trending memes
-        memes = meme_scanner.scan_trending_memes()
-        
-        # Process each meme for keywords
-        processed_memes = []
-        for meme in memes:
-            keywords = meme_scanner.extract_keywords(meme)
-            meme["keywords"] = keywords
-            processed_memes.append(meme)
+        since = datetime.now() - timedelta(seconds=TRENDING_MEMES_WINDOW)
+        memes = list(correlator.iter_meme_data(since=since))
+        memes.sort(key=lambda meme: meme.get("timestamp", ""), reverse=True)
         
         return jsonify({
             "success": True,
-            "memes": processed_memes,
-            "count": len(processed_memes),
-            "scanned_at": datetime.now().isoformat()
+            "memes": memes,
+            "count": len(memes),
+            "since": since.isoformat()
         })
     
     except Exception as e:
-        logger.error(f"Error scanning trending memes: {str(e)}")
-        return jsonify({"error": f"Scan failed: {str(e)}"}), 500
+        logger.error(f"Error listing recent memes: {str(e)}")
+        return jsonify({"error": f"Listing recent memes failed: {str(e)}"}), 500
 
-@app.route('/api/scan/contracts')
-def api_scan_contracts():
-    """Trigger a scan for new contracts"""
+@app.route('/api/contracts/reload', methods=['POST'])
+def api_reload_contracts():
+    """Pick up contracts the Ballistic service committed to the registry since the last reload
+    
+    Fetching contracts from Etherscan and PumpFun is the Ballistic
+    service's job (it owns the registry); this only re-reads the registry
+    and never starts a fetch. Returns the number of new contracts per chain.
+    """
     try:
-        # Update blockchain contracts
-        ethereum_updated = contract_monitor.update_ethereum_contracts()
-        solana_updated = contract_monitor.update_solana_contracts()
+        added = contract_monitor.reload()
         
         return jsonify({
             "success": True,
-            "ethereum_updated": ethereum_updated,
-            "solana_updated": solana_updated,
-            "scanned_at": datetime.now().isoformat()
+            "new_contracts": added,
+            "total_contracts": contract_monitor.stats()["contracts"],
+            "reloaded_at": datetime.now().isoformat()
         })
     
     except Exception as e:
-        logger.error(f"Error scanning contracts: {str(e)}")
-        return jsonify({"error": f"Scan failed: {str(e)}"}), 500
+        logger.error(f"Error reloading contracts: {str(e)}")
+        return jsonify({"error": f"Reload failed: {str(e)}"}), 500
 
 # Error handlers
 @app.errorhandler(404)
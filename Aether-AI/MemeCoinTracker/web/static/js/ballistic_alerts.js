@@ -5,11 +5,12 @@
 
 document.addEventListener('DOMContentLoaded', function() {
     // Configuration
-    const alertRefreshInterval = 30000; // 30 seconds
+    const alertRefreshInterval = 30000; // 30 seconds, only without EventSource
     const maxAlerts = 20;
     let alertData = [];
     let activeFilter = 'all';
-    let websocketConnected = false;
+    let alertTotal = 0;
+    let streamConnected = false;
     
     // Elements
     const alertContainer = document.getElementById('alert-container');
@@ -20,60 +21,74 @@ document.addEventListener('DOMContentLoaded', function() {
     const analysisForm = document.getElementById('analysis-form');
     const analysisInput = document.getElementById('analysis-input');
     const analysisResults = document.getElementById('analysis-results');
-    const scanTrendingBtn = document.getElementById('scan-trending');
+    const recentMemesBtn = document.getElementById('recent-memes');
     
-    // Set up WebSocket connection
-    function setupWebSocket() {
-        const protocol = window.location.protocol === "https:" ? "wss:" : "ws:";
-        const wsUrl = `${protocol}//${window.location.host}/ws`;
-        const socket = new WebSocket(wsUrl);
-        
-        socket.onopen = function(e) {
-            console.log("WebSocket connection established");
-            websocketConnected = true;
+    // Subscribe to pushed alert changes
+    function setupEventStream() {
+        const source = new EventSource('/api/alerts/stream');
+        
+        source.onopen = function() {
+            console.log("Alert stream connected");
+            streamConnected = true;
             updateStatusIndicator();
+            
+            // Catch up on anything missed while (re)connecting
+            fetchAlerts();
         };
         
-        socket.onmessage = function(event) {
-            try {
-                const data = JSON.parse(event.data);
-                
-                if (data.type === 'new_alert') {
-                    // Add new alert and refresh display
-                    alertData.unshift(data.alert);
-                    if (alertData.length > maxAlerts) {
-                        alertData.pop();
-                    }
+        function handleAlertEvent(handler) {
+            return function(event) {
+                try {
+                    handler(JSON.parse(event.data).alert);
                     renderAlerts();
-                    showNotification('New Meme Coin Alert', `${data.alert.coin.name} (${data.alert.coin.symbol}) matched with ${data.alert.meme.platform} content`);
+                    updateAlertCounter(alertTotal);
+                } catch (e) {
+                    console.error("Error processing alert event:", e);
                 }
-            } catch (e) {
-                console.error("Error processing WebSocket message:", e);
-            }
-        };
-        
-        socket.onclose = function(event) {
-            console.log("WebSocket connection closed");
-            websocketConnected = false;
-            updateStatusIndicator();
-            
-            // Try to reconnect after a delay
-            setTimeout(setupWebSocket, 5000);
-        };
+            };
+        }
         
-        socket.onerror = function(error) {
-            console.error("WebSocket error:", error);
-            websocketConnected = false;
+        source.addEventListener('created', handleAlertEvent(alert => {
+            // Add new alert and refresh display
+            alertData = alertData.filter(a => a.id !== alert.id);
+            alertData.unshift(alert);
+            if (alertData.length > maxAlerts) {
+                alertData.pop();
+            }
+            alertTotal += 1;
+            showNotification('New Meme Coin Alert', `${alert.coin.name} (${alert.coin.symbol}) matched with ${alert.meme.platform} content`);
+        }));
+        
+        source.addEventListener('updated', handleAlertEvent(alert => {
+            alertData = alertData.map(a => a.id === alert.id ? alert : a);
+        }));
+        
+        source.addEventListener('removed', handleAlertEvent(alert => {
+            alertData = alertData.filter(a => a.id !== alert.id);
+            alertTotal = Math.max(0, alertTotal - 1);
+        }));
+        
+        // The server dropped events for this client; reload the list
+        source.addEventListener('resync', fetchAlerts);
+        
+        source.onerror = function() {
+            // EventSource reconnects by itself
+            console.log("Alert stream disconnected");
+            streamConnected = false;
             updateStatusIndicator();
         };
     }
     
-    // Try to establish WebSocket connection
-    setupWebSocket();
+    // Receive alerts as they happen where supported, otherwise poll
+    if (window.EventSource) {
+        setupEventStream();
+    } else {
+        setInterval(fetchAlerts, alertRefreshInterval);
+    }
     
     // Update status indicator
     function updateStatusIndicator() {
-        if (websocketConnected) {
+        if (streamConnected) {
             alertStatusIndicator.textContent = 'Connected';
             alertStatusIndicator.className = 'status-indicator connected';
         } else {
@@ -84,10 +99,11 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Fetch alerts from API
     function fetchAlerts() {
-        fetch('/api/alerts')
+        fetch(`/api/alerts?limit=${maxAlerts}`)
             .then(response => response.json())
             .then(data => {
                 alertData = data.alerts;
+                alertTotal = data.total;
                 renderAlerts();
                 updateAlertCounter(data.total);
             })
@@ -118,14 +134,14 @@ document.addEventListener('DOMContentLoaded', function() {
                 <div class="alert-empty">
                     <h3>No Alerts Found</h3>
                     <p>No meme-to-coin alerts have been detected yet.</p>
-                    <button id="scan-now-empty" class="btn primary">Scan Now</button>
+                    <button id="recent-memes-empty" class="btn primary">Show Recent Memes</button>
                 </div>
             `;
             
-            // Attach event listener to the scan now button
-            const scanNowBtn = document.getElementById('scan-now-empty');
-            if (scanNowBtn) {
-                scanNowBtn.addEventListener('click', scanTrending);
+            // Attach event listener to the recent memes button
+            const recentBtn = document.getElementById('recent-memes-empty');
+            if (recentBtn) {
+                recentBtn.addEventListener('click', showRecentMemes);
             }
             return;
         }
@@ -563,36 +579,36 @@ document.addEventListener('DOMContentLoaded', function() {
         });
     }
     
-    // Scan for trending memes
-    function scanTrending() {
+    // List the memes the Ballistic service scanned recently (it scans on its own schedule)
+    function showRecentMemes() {
         // Show loading state
-        const scanBtn = document.getElementById('scan-trending');
-        if (scanBtn) {
-            scanBtn.disabled = true;
-            scanBtn.innerHTML = '<span class="spinner-small"></span> Scanning...';
+        const recentBtn = document.getElementById('recent-memes');
+        if (recentBtn) {
+            recentBtn.disabled = true;
+            recentBtn.innerHTML = '<span class="spinner-small"></span> Loading...';
         }
         
-        fetch('/api/scan/trending')
+        fetch('/api/memes/recent')
             .then(response => response.json())
             .then(data => {
                 if (data.error) {
                     throw new Error(data.error);
                 }
                 
-                showNotification('Scan Complete', `Found ${data.count} trending memes`);
+                showNotification('Recent Memes', `${data.count} memes scanned since ${new Date(data.since).toLocaleTimeString()}`);
                 
-                // Refresh alerts after scan
+                // Refresh alerts too
                 fetchAlerts();
             })
             .catch(error => {
-                console.error('Error scanning trending memes:', error);
-                showNotification('Scan Failed', error.message || 'Failed to scan trending memes', 'error');
+                console.error('Error loading recent memes:', error);
+                showNotification('Loading Failed', error.message || 'Failed to load recent memes', 'error');
             })
             .finally(() => {
                 // Reset button state
-                if (scanBtn) {
-                    scanBtn.disabled = false;
-                    scanBtn.innerHTML = 'Scan Trending Memes';
+                if (recentBtn) {
+                    recentBtn.disabled = false;
+                    recentBtn.innerHTML = 'Show Recent Memes';
                 }
             });
     }
@@ -874,8 +890,8 @@ document.addEventListener('DOMContentLoaded', function() {
         alertRefreshBtn.addEventListener('click', fetchAlerts);
     }
     
-    if (scanTrendingBtn) {
-        scanTrendingBtn.addEventListener('click', scanTrending);
+    if (recentMemesBtn) {
+        recentMemesBtn.addEventListener('click', showRecentMemes);
     }
     
     if (analysisForm) {
@@ -896,7 +912,4 @@ document.addEventListener('DOMContentLoaded', function() {
     
     // Initial data load
     fetchAlerts();
-    
-    // Set up interval to refresh alerts
-    setInterval(fetchAlerts, alertRefreshInterval);
 });